@@ -1,10 +1,118 @@
 # allocation/allocator.py
+import logging
 
-def allocate_students_to_rooms(subject_rolls, room_caps, buffer=0, mode="dense", logger=None):
+import numpy as np
+
+from allocation.kernels import allocation_from_runs, dense_runs, spread_runs
+from input.roll_index import SubjectRolls
+
+
+def apply_buffer(room_caps, buffer=0):
+    """
+    Room capacities after keeping `buffer` seats free (never below 1).
+    """
+    return {room: max(cap - buffer, 1) for room, cap in room_caps.items()}
+
+
+def usable_seats(free_seats, mode="dense"):
+    """
+    How many of a room's free seats one subject may take under `mode`.
+    """
+    if mode == "dense":
+        return free_seats
+
+    elif mode == "sparse":
+        return max(free_seats // 2, 1)
+
+    elif mode == "mixed":
+        return max(int(0.70 * free_seats), 1)
+
+    else:
+        raise ValueError("Invalid mode")
+
+
+def room_take(free_seats, wanted, mode="dense"):
+    """
+    How many of `wanted` students of one subject the greedy fill seats in a
+    room with `free_seats` free. `mode` caps each take at usable_seats, but
+    the subject takes again until the room is full or everyone is seated,
+    so in every mode the room ends up holding min(free_seats, wanted).
+    """
+    usable_seats(1, mode)  # reject an invalid mode
+    return max(min(free_seats, wanted), 0)
+
+
+def _greedy_runs(sizes, rooms_sorted, mode):
+    """
+    The greedy fill under a sparse or mixed mode, as (subjects, rooms,
+    counts) runs: each subject takes room_take() of every room in turn
+    until the subject is seated.
+    """
+    free = [cap for _, cap in rooms_sorted]
+    subjects, rooms, counts = [], [], []
+
+    # Rooms only ever fill up, so every room before room_index is full for
+    # all later subjects too; the scan resumes instead of restarting.
+    room_index = 0
+
+    for s, total in enumerate(sizes):
+        offset = 0
+        while offset < total and room_index < len(free):
+            if free[room_index] <= 0:
+                room_index += 1
+                continue
+
+            count = room_take(free[room_index], total - offset, mode)
+            subjects.append(s)
+            rooms.append(room_index)
+            counts.append(count)
+            free[room_index] -= count
+            offset += count
+
+    return subjects, rooms, counts
+
+
+def build_allocation(subject_rolls, rooms, runs):
+    """
+    Allocation from (subjects, rooms, counts) runs, as positions in
+    subject_rolls and rooms; each subject's runs take its rolls in order.
+
+    With SubjectRolls the allocation is assembled from the interned roll
+    ids and shares the RollIndex's roll table; other subject_rolls are
+    laid end to end as the roll table, each roll's id its position there.
+    """
+    subjects = list(subject_rolls)
+    if isinstance(subject_rolls, SubjectRolls):
+        return allocation_from_runs(subjects, [subject_rolls.ids[s] for s in subjects], rooms,
+                                    runs, subject_rolls.index.rolls)
+
+    roll_table = tuple(roll for subject in subjects for roll in subject_rolls[subject])
+    ends = np.cumsum([0] + [len(subject_rolls[subject]) for subject in subjects]).tolist()
+    id_arrays = [np.arange(start, end, dtype=np.int32) for start, end in zip(ends, ends[1:])]
+    return allocation_from_runs(subjects, id_arrays, rooms, runs, roll_table)
+
+
+def _spread(runs, subjects, rooms):
+    # The same rooms, each as full as before, holding every subject in
+    # proportion instead of one or two subjects each
+    run_subjects, run_rooms, counts = (np.asarray(a, dtype=np.int64) for a in runs)
+    placed = np.bincount(run_subjects, weights=counts, minlength=subjects).astype(np.int64)
+    totals = np.bincount(run_rooms, weights=counts, minlength=rooms).astype(np.int64)
+    return spread_runs(placed, totals.tolist())
+
+
+def allocate_students_to_rooms(subject_rolls, room_caps, buffer=0, mode="dense", logger=None,
+                               mix=True):
     """
     RETURNS (allocations, seats_left)
 
-    allocations format (for excel_writer):
+    Rooms fill largest first, subject after subject, as far as `mode`
+    allows. With mix (the default) each room then takes every subject in
+    proportion rather than a run of one subject, keeping how full each
+    room is and who gets a seat: with no subject holding more than half a
+    room, the seating grid can keep every subject apart.
+
+    allocations is an Allocation (allocation/model.py), reading as:
     {
         "CS249": {
             "6101": [...],
@@ -24,15 +132,14 @@ def allocate_students_to_rooms(subject_rolls, room_caps, buffer=0, mode="dense",
     """
 
     # ---------------- APPLY BUFFER ----------------
-    adjusted_caps = {}
-    for room, cap in room_caps.items():
-        adjusted = max(cap - buffer, 1)
-        adjusted_caps[room] = adjusted
+    adjusted_caps = apply_buffer(room_caps, buffer)
 
-    if logger:
-        logger.info("Room capacities (after buffer):")
+    debug = logger is not None and logger.isEnabledFor(logging.DEBUG)
+
+    if debug:
+        logger.debug("Room capacities (after buffer):")
         for r, c in adjusted_caps.items():
-            logger.info(f"{r}: {c}")
+            logger.debug(f"{r}: {c}")
 
     # Master seats left
     seats_left = {room: cap for room, cap in adjusted_caps.items()}
@@ -40,62 +147,45 @@ def allocate_students_to_rooms(subject_rolls, room_caps, buffer=0, mode="dense",
     # Sort rooms largest → smallest
     rooms_sorted = sorted(adjusted_caps.items(), key=lambda x: -x[1])
 
-    # This is the final output structure
-    final_allocations = {}  # subject -> room -> list rolls
-
-    # ---------------- ALLOCATE SUBJECT BY SUBJECT ----------------
-    for subject, rolls in subject_rolls.items():
-
-        if logger:
-            logger.info(f"Allocating subject {subject} ({len(rolls)} students)")
-
-        remaining = list(rolls)          # students still to place
-        final_allocations[subject] = {}  # create subject entry
-
-        room_index = 0
-
-        while remaining and room_index < len(rooms_sorted):
-            room_name, room_capacity = rooms_sorted[room_index]
-
-            free_seats = seats_left[room_name]
-
-            if free_seats <= 0:
-                room_index += 1
-                continue
-
-            # capacity per mode
-            if mode == "dense":
-                use_cap = free_seats
-
-            elif mode == "sparse":
-                use_cap = max(free_seats // 2, 1)
-
-            elif mode == "mixed":
-                use_cap = max(int(0.70 * free_seats), 1)
-
-            else:
-                raise ValueError("Invalid mode")
-
-            assign_count = min(use_cap, len(remaining))
-            assigned = remaining[:assign_count]
-
-            # Record into subject → room → rolls
-            if room_name not in final_allocations[subject]:
-                final_allocations[subject][room_name] = []
-
-            final_allocations[subject][room_name].extend(assigned)
+    usable_seats(1, mode)  # reject an invalid mode up front
+    sizes = [len(rolls) for rolls in subject_rolls.values()]
+
+    # ---------------- PLAN (subject, room, count) RUNS ----------------
+    if mode == "dense":
+        # Subjects pour into the rooms one after another: one
+        # cumsum/searchsorted pass instead of a walk room by room
+        runs = dense_runs(sizes, [cap for _, cap in rooms_sorted])
+    else:
+        runs = _greedy_runs(sizes, rooms_sorted, mode)
+    if mix:
+        runs = _spread(runs, len(sizes), len(rooms_sorted))
+    runs = tuple(np.asarray(a, dtype=np.int64) for a in runs)
+
+    # ---------------- SEATS LEFT, ROOM BY ROOM ----------------
+    run_subjects, run_rooms, counts = runs
+    taken = np.bincount(run_rooms, weights=counts, minlength=len(rooms_sorted)).astype(np.int64)
+    for (room_name, _), n in zip(rooms_sorted, taken.tolist()):
+        seats_left[room_name] -= n
+
+    # ---------------- LOG, SUBJECT BY SUBJECT ----------------
+    if logger:
+        assigned = np.bincount(run_subjects, weights=counts, minlength=len(sizes)).astype(np.int64)
+        # Runs come subject by subject; subject s owns runs bounds[s]:bounds[s + 1]
+        bounds = np.searchsorted(run_subjects, np.arange(len(sizes) + 1)).tolist()
 
-            # Update remaining
-            remaining = remaining[assign_count:]
+        for s, subject in enumerate(subject_rolls):
+            logger.info(f"Allocating subject {subject} ({sizes[s]} students)")
 
-            # Update seats_left
-            seats_left[room_name] -= assign_count
+            if debug:
+                for run in range(bounds[s], bounds[s + 1]):
+                    room_name = rooms_sorted[run_rooms[run]][0]
+                    logger.debug(f"Room {room_name}: assigned {counts[run]} students of {subject}")
 
-            if logger:
-                logger.info(f"Room {room_name}: assigned {assign_count} students of {subject}")
+            if assigned[s] < sizes[s]:
+                logger.error(f"⚠ Not enough rooms for subject {subject}! {sizes[s] - assigned[s]} unassigned students.")
 
-        if remaining and logger:
-            logger.error(f"⚠ Not enough rooms for subject {subject}! {len(remaining)} unassigned students.")
+    # This is the final output structure: subject -> room -> rolls
+    final_allocations = build_allocation(subject_rolls, [room for room, _ in rooms_sorted], runs)
 
     # Done
     return final_allocations, seats_left
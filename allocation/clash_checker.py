@@ -1,27 +1,193 @@
+from collections import namedtuple
+
+import numpy as np
+
+from allocation.kernels import first_clash, same_day_pairs
+from input.roll_index import SubjectRolls
+
+
 def check_clashes(subjects, subject_rolls):
     """
     Checks if any roll number appears in more than one subject on the same day.
     subjects: list of subject codes
     subject_rolls: dict { subject_code: [rolls] }
+
+    Returns the first clashing pair in subject order (the same pair the
+    pairwise set intersections found) in one pass over the rolls.
+    SubjectRolls are checked on their roll ids, with NumPy.
+    """
+    if isinstance(subject_rolls, SubjectRolls):
+        index = subject_rolls.index
+        found = first_clash([subject_rolls.ids.get(subj, index.course(subj)) for subj in subjects])
+        if found is None:
+            return None
+        i, j, shared = found
+        return {
+            "subject1": subjects[i],
+            "subject2": subjects[j],
+            "roll_numbers": index.decode(shared)
+        }
+
+    # roll -> position of the first subject that lists it
+    first_seen = {}
+    # (i, j) -> rolls shared by subjects i and j, i being their first subject
+    shared = {}
+
+    for j, subj in enumerate(subjects):
+        for roll in subject_rolls.get(subj, []):
+            i = first_seen.setdefault(roll, j)
+            if i != j:
+                shared.setdefault((i, j), set()).add(roll)
+
+    if not shared:
+        return None  # No clashes
+
+    # The smallest pair's rolls all have it as their first subject, so the
+    # set gathered above is its full intersection
+    i, j = min(shared)
+    return {
+        "subject1": subjects[i],
+        "subject2": subjects[j],
+        "roll_numbers": list(shared[(i, j)])
+    }
+
+
+# One finding for one student: two exams that collide or sit too close.
+#   kind: "clash"         both exams in the same session
+#         "back_to_back"  consecutive sessions of the same day
+#         "same_day"      same day, with a session in between
+Clash = namedtuple(
+    "Clash",
+    ["kind", "roll", "date", "session", "subject", "other_date", "other_session", "other_subject"]
+)
+
+CLASH_KINDS = ("clash", "back_to_back", "same_day")
+
+
+class ClashEngine:
+    """
+    Every clash in the timetable from one inverted index.
+
+    timetable: [(date, session, [subjects])] in exam order
+    course_rolls: { subject: [rolls] }
+    roll_index: the RollIndex of course_rolls, if there is one; the pairs
+                are then found on roll ids with NumPy, not indexed
+
+    index maps roll -> [(slot, subject)] in timetable order, where slot is
+    the position of the session in the timetable; slots[slot] gives its
+    (date, session). Slots rather than names are kept because the same
+    day name can come round twice in a timetable.
+    """
+
+    def __init__(self, timetable, course_rolls, roll_index=None):
+        self.slots = [(date, session) for date, session, _ in timetable]
+
+        # Consecutive sessions with the same date form one day
+        self.day_of = []
+        day = -1
+        previous = object()
+        for date, _ in self.slots:
+            if date != previous:
+                day += 1
+                previous = date
+            self.day_of.append(day)
+
+        self.exams = [(slot, subject) for slot, (_, _, subjects) in enumerate(timetable)
+                      for subject in subjects]
+        self.roll_index = roll_index
+
+        self.index = {}
+        if roll_index is None:
+            for slot, subject in self.exams:
+                for roll in course_rolls.get(subject, ()):
+                    self.index.setdefault(roll, []).append((slot, subject))
+
+    def _kind(self, slot, other_slot):
+        if slot == other_slot:
+            return "clash"
+        if other_slot - slot == 1:
+            return "back_to_back"
+        return "same_day"
+
+    def find(self):
+        """
+        [Clash] for every student, every pair of exams, sorted by kind,
+        then timetable position, then roll.
+        """
+        if self.roll_index is not None:
+            return self._find_ids()
+
+        day_of = self.day_of
+        found = []
+
+        for roll, exams in self.index.items():
+            if len(exams) < 2:
+                continue
+
+            for a in range(len(exams)):
+                slot, subject = exams[a]
+                for b in range(a + 1, len(exams)):
+                    other_slot, other_subject = exams[b]
+                    # Exams are in slot order: past this day nothing is close
+                    if day_of[other_slot] != day_of[slot]:
+                        break
+                    if subject != other_subject:
+                        kind = self._kind(slot, other_slot)
+                        found.append((kind, slot, other_slot, roll, subject, other_subject))
+
+        rank = {kind: i for i, kind in enumerate(CLASH_KINDS)}
+        found.sort(key=lambda f: (rank[f[0]], f[1], f[2], f[3], f[4], f[5]))
+
+        return [
+            Clash(kind, roll, *self.slots[slot], subject, *self.slots[other_slot], other_subject)
+            for kind, slot, other_slot, roll, subject, other_subject in found
+        ]
+
+    def _find_ids(self):
+        # find() on roll ids: same pairs, same order
+        if not self.exams:
+            return []
+
+        index = self.roll_index
+        rolls, first, second = same_day_pairs(
+            [index.course(subject) for _, subject in self.exams],
+            [self.day_of[slot] for slot, _ in self.exams]
+        )
+
+        # Subject codes rank like their names, roll ids like their rolls
+        names, subject_of = np.unique([subject for _, subject in self.exams], return_inverse=True)
+        slot_of = np.array([slot for slot, _ in self.exams], dtype=np.int64)
+
+        subject, other_subject = subject_of[first], subject_of[second]
+        keep = subject != other_subject
+        rolls, subject, other_subject = rolls[keep], subject[keep], other_subject[keep]
+        slot, other_slot = slot_of[first[keep]], slot_of[second[keep]]
+
+        # Ranks of CLASH_KINDS
+        kind = np.where(slot == other_slot, 0, np.where(other_slot - slot == 1, 1, 2))
+        order = np.lexsort((other_subject, subject, rolls, other_slot, slot, kind))
+
+        names = names.tolist()
+        columns = (a[order].tolist() for a in (kind, rolls, slot, subject, other_slot, other_subject))
+        return [
+            Clash(CLASH_KINDS[k], index.rolls[roll], *self.slots[s], names[subj],
+                  *self.slots[other], names[other_subj])
+            for k, roll, s, subj, other, other_subj in zip(*columns)
+        ]
+
+
+def find_all_clashes(timetable, course_rolls, roll_index=None):
+    engine = ClashEngine(timetable, course_rolls, roll_index)
+    return engine.find()
+
+
+def summarize_clashes(clashes):
+    """
+    { kind: (findings, distinct students) } for the kinds that occur.
     """
-    
-    # Convert each list of rolls into a set
-    subject_sets = {subj: set(rolls) for subj, rolls in subject_rolls.items()}
-
-    # Check pairwise intersections
-    for i in range(len(subjects)):
-        for j in range(i + 1, len(subjects)):
-            s1 = subjects[i]
-            s2 = subjects[j]
-
-            intersection = subject_sets[s1].intersection(subject_sets[s2])
-
-            if intersection:
-                # Return first detected clash
-                return {
-                    "subject1": s1,
-                    "subject2": s2,
-                    "roll_numbers": list(intersection)
-                }
-
-    return None  # No clashes
+    summary = {}
+    for kind in CLASH_KINDS:
+        rows = [c for c in clashes if c.kind == kind]
+        if rows:
+            summary[kind] = (len(rows), len({c.roll for c in rows}))
+    return summary
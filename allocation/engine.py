@@ -0,0 +1,26 @@
+# allocation/engine.py
+"""
+Registry of allocation strategies selectable with --allocator.
+
+Every strategy has the signature of allocate_students_to_rooms and
+returns (allocations, seats_left).
+"""
+
+from allocation.allocator import allocate_students_to_rooms
+from allocation.packing import allocate_ffd, allocate_optimal
+
+
+ALLOCATORS = {
+    "greedy": allocate_students_to_rooms,
+    "ffd": allocate_ffd,
+    "optimal": allocate_optimal,
+}
+
+
+def get_allocator(name):
+    try:
+        return ALLOCATORS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown allocator '{name}'. Choose from: {', '.join(ALLOCATORS)}"
+        ) from None
@@ -0,0 +1,97 @@
+# allocation/incremental.py
+"""
+Re-allocation that disturbs the previous run as little as possible.
+
+Used by --incremental when a session's enrolments or rooms changed since
+the last run. Students still enrolled stay in their rooms; withdrawn
+students and closed rooms free their seats; newcomers fill the subject's
+own rooms first and then the emptiest other rooms, taking as much of each
+room as the full allocator would (room_take). Only rooms whose roster
+actually changed are reported, so only their seating and PDFs are redone.
+"""
+
+from allocation.allocator import apply_buffer, room_take
+
+
+def reallocate(previous, subject_rolls, room_caps, buffer=0, mode="dense", logger=None):
+    """
+    previous: allocations of the last run, an Allocation or
+              { subject: { room: [rolls] } }
+
+    RETURNS (allocations, seats_left, changed_rooms), or None when the kept
+    students and newcomers do not fit and a full allocation is needed.
+    changed_rooms holds every room whose roster differs from `previous`.
+    """
+    caps = apply_buffer(room_caps, buffer)
+    seats_left = dict(caps)
+    allocations = {}
+    changed = set()
+
+    # Rooms of subjects no longer sitting this session lose those students
+    for subject, room_data in previous.items():
+        if subject not in subject_rolls:
+            changed.update(room_data)
+
+    # ---------------- KEEP STUDENTS WHERE THEY WERE ----------------
+    for subject, rolls in subject_rolls.items():
+        enrolled = set(rolls)
+        subject_rooms = allocations[subject] = {}
+
+        for room, old_rolls in previous.get(subject, {}).items():
+            if room not in caps:
+                changed.add(room)
+                continue
+
+            keep = [r for r in old_rolls if r in enrolled]
+            # A room that shrank keeps whoever still fits
+            keep = keep[:max(seats_left[room], 0)]
+
+            if len(keep) != len(old_rolls):
+                changed.add(room)
+            if keep:
+                subject_rooms[room] = keep
+                seats_left[room] -= len(keep)
+
+    # ---------------- SEAT NEWCOMERS ----------------
+    for subject, rolls in subject_rolls.items():
+        subject_rooms = allocations[subject]
+        seated = {r for room_rolls in subject_rooms.values() for r in room_rolls}
+        pending = [r for r in rolls if r not in seated]
+        if not pending:
+            continue
+
+        # The subject's own rooms first, then the emptiest others
+        others = sorted(
+            (room for room in caps if room not in subject_rooms),
+            key=lambda room: -seats_left[room]
+        )
+        offset = 0
+        grown = []
+        for room in list(subject_rooms) + others:
+            if offset == len(pending):
+                break
+
+            take = room_take(seats_left[room], len(pending) - offset, mode)
+            if take <= 0:
+                continue
+
+            subject_rooms.setdefault(room, []).extend(pending[offset:offset + take])
+            seats_left[room] -= take
+            offset += take
+            changed.add(room)
+            grown.append(room)
+
+        if offset < len(pending):
+            if logger:
+                logger.warning(
+                    f"{len(pending) - offset} new students of {subject} do not fit "
+                    f"around the previous seating"
+                )
+            return None
+
+        # Keep each room's list in the subject's roll order
+        position = {r: i for i, r in enumerate(rolls)}
+        for room in grown:
+            subject_rooms[room].sort(key=position.__getitem__)
+
+    return allocations, seats_left, changed
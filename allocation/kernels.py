@@ -0,0 +1,205 @@
+# allocation/kernels.py
+"""
+NumPy kernels over interned roll ids (input/roll_index.py).
+
+    first_clash         the first pair of subjects sharing a student
+    same_day_pairs      every pair of exams a student sits on one day
+    dense_runs          the greedy dense fill, as (subject, room) runs
+    spread_runs         every subject spread over the rooms in proportion
+    allocation_from_runs
+                        an Allocation straight from the id arrays
+
+Each works on whole arrays, so the Python-level work is per subject or
+room, not per student.
+"""
+
+from array import array
+
+import numpy as np
+
+from allocation.model import Allocation
+
+
+def _as_array(typecode, values, dtype):
+    return array(typecode, np.asarray(values, dtype=dtype).tobytes())
+
+
+def first_clash(id_arrays):
+    """
+    id_arrays: the roll ids of each subject, in subject order.
+
+    RETURNS (i, j, shared ids) for the first pair of subjects i < j with
+    a student in common, the pair check_clashes reports, or None.
+    """
+    n = len(id_arrays)
+    flat = np.concatenate(id_arrays) if n else np.zeros(0, dtype=np.int32)
+    if not flat.size:
+        return None
+
+    # The usual case: no roll is listed twice at all
+    if np.bincount(flat).max() < 2:
+        return None
+
+    # One entry per (roll, subject), ordered by roll, then subject
+    owners = np.repeat(np.arange(n), [len(ids) for ids in id_arrays])
+    pairs = np.unique(flat.astype(np.int64) * n + owners)
+    rolls, owners = pairs // n, pairs % n
+
+    starts = np.r_[True, rolls[1:] != rolls[:-1]]
+    if starts.all():
+        return None  # repeats within one subject only
+
+    # Each roll's first subject pairs with its others
+    first = owners[starts][np.cumsum(starts) - 1]
+    i, j = divmod(int((first[~starts] * n + owners[~starts]).min()), n)
+
+    # Every roll both share has i as its first subject, or (k, i) with
+    # k < i would have come first
+    return i, j, np.intersect1d(id_arrays[i], id_arrays[j])
+
+
+def same_day_pairs(id_arrays, days):
+    """
+    id_arrays[e]: the roll ids of exam e, exams in timetable order;
+    days[e]: its day, never decreasing along the exams.
+
+    RETURNS (rolls, first, second) arrays: every roll and pair of exams
+    first < second it sits on one day. A roll listed twice for an exam
+    pairs twice, as in a scan of the listings.
+    """
+    sizes = [len(ids) for ids in id_arrays]
+    if not sum(sizes):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    rolls = np.concatenate(id_arrays).astype(np.int64)
+    exams = np.repeat(np.arange(len(id_arrays)), sizes)
+    order = np.lexsort((exams, rolls))
+    rolls, exams = rolls[order], exams[order]
+    day = np.asarray(days, dtype=np.int64)[exams]
+
+    # A roll's exams of one day are neighbours now: pair each listing with
+    # the next k-th one for k = 1, 2, ... while any pair is left
+    first, second = [], []
+    k = 1
+    while k < len(rolls):
+        same = np.flatnonzero((rolls[k:] == rolls[:-k]) & (day[k:] == day[:-k]))
+        if not same.size:
+            break
+        first.append(same)
+        second.append(same + k)
+        k += 1
+
+    if not first:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    first, second = np.concatenate(first), np.concatenate(second)
+    return rolls[first], exams[first], exams[second]
+
+
+def dense_runs(sizes, caps):
+    """
+    The dense greedy fill: the students of every subject, in subject
+    order, poured into the rooms in order (caps: their free seats).
+
+    RETURNS (subjects, rooms, counts), one entry per (subject, room) run
+    in allocation order, as positions in sizes and caps. Students past
+    the last seat are left out.
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    caps = np.asarray(caps, dtype=np.int64)
+    empty = np.zeros(0, dtype=np.int64)
+    if not sizes.size or not caps.size:
+        return empty, empty, empty
+
+    subject_ends = np.cumsum(sizes)
+    room_ends = np.cumsum(caps)
+    placed = min(subject_ends[-1], room_ends[-1])
+
+    # A run starts wherever a subject or a room starts
+    starts = np.union1d(np.r_[0, subject_ends[:-1]], np.r_[0, room_ends[:-1]])
+    starts = starts[starts < placed]
+    counts = np.diff(np.r_[starts, placed])
+
+    subjects = np.searchsorted(subject_ends, starts, side="right")
+    rooms = np.searchsorted(room_ends, starts, side="right")
+    return subjects, rooms, counts
+
+
+def spread_runs(sizes, totals):
+    """
+    Seats sizes[s] students of each subject in rooms holding totals[r]
+    students each (both summing to the same number), every room taking
+    each subject in proportion to the students still to seat. Room by
+    room, the shares are rounded by largest remainder, ties going to the
+    earlier subject, so rooms keep their totals and subjects their sizes.
+
+    RETURNS (subjects, rooms, counts) runs in subject order, each
+    subject's rooms in order.
+    """
+    left = np.array(sizes, dtype=np.int64)
+    counts = np.zeros((len(left), len(totals)), dtype=np.int64)
+
+    remaining = int(left.sum())
+    for r, total in enumerate(totals):
+        if not total or not remaining:
+            continue
+        share, rest = np.divmod(left * total, remaining)
+        # The remainders add up to a whole number of students
+        short = total - int(share.sum())
+        if short:
+            share[np.argsort(-rest, kind="stable")[:short]] += 1
+        counts[:, r] = share
+        left -= share
+        remaining -= total
+
+    subjects, rooms = np.nonzero(counts)
+    return subjects, rooms, counts[subjects, rooms]
+
+
+def allocation_from_runs(subjects, id_arrays, rooms, runs, roll_table):
+    """
+    Allocation of subjects (names, with their roll ids in id_arrays) to
+    rooms (names), from (subject, room, count) runs as positions in those
+    lists, in subject order. Each subject's runs take its rolls in order,
+    from the first. roll_table is the RollIndex's rolls, shared, not
+    copied.
+    """
+    run_subjects, run_rooms, counts = (np.asarray(a, dtype=np.int64) for a in runs)
+
+    # Runs come subject by subject and each takes up where the last one
+    # stopped, so the runs' rolls are every subject's first `placed` ids
+    placed = np.bincount(run_subjects, weights=counts, minlength=len(subjects)).astype(np.int64)
+    pieces = [ids[:n] for ids, n in zip(id_arrays, placed.tolist()) if n]
+    roll_ids = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.int32)
+
+    # Runs of the same subject and room form one group (sparse modes take
+    # several bites of a room); groups in order of first appearance
+    pair = run_subjects * max(len(rooms), 1) + run_rooms
+    _, first, group_of_run = np.unique(pair, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[np.argsort(first)] = np.arange(len(first))
+    group_of_run = rank[group_of_run]
+    first = np.sort(first)
+
+    group_counts = np.bincount(group_of_run, weights=counts, minlength=len(first)).astype(np.int64)
+    group_subjects, group_rooms = run_subjects[first], run_rooms[first]
+    roll_ids = roll_ids[np.argsort(np.repeat(group_of_run, counts), kind="stable")]
+
+    # Room ids in order of first use
+    used, first_use = np.unique(group_rooms, return_index=True)
+    used = used[np.argsort(first_use)]
+    local = np.zeros(len(rooms), dtype=np.int64)
+    local[used] = np.arange(len(used))
+    group_rooms = local[group_rooms]
+
+    return Allocation(
+        tuple(subjects), tuple(rooms[r] for r in used.tolist()), roll_table,
+        _as_array("H", np.repeat(group_subjects, group_counts), np.uint16),
+        _as_array("H", np.repeat(group_rooms, group_counts), np.uint16),
+        _as_array("i", roll_ids, np.int32),
+        _as_array("H", group_rooms, np.uint16),
+        _as_array("i", np.r_[0, np.cumsum(group_counts)], np.int32),
+        _as_array("i", np.r_[0, np.cumsum(np.bincount(group_subjects, minlength=len(subjects)))],
+                  np.int32),
+    )
@@ -0,0 +1,417 @@
+# allocation/model.py
+"""
+Compact allocation of one session.
+
+Allocations used to travel as { subject: { room: [rolls] } }, with a
+separate seat map { room: [(subject, roll, seat)] } and per-writer copies
+of both, each holding its own list slot or tuple per student. Allocation
+keeps one entry per seated student in flat parallel arrays instead:
+
+    subject_ids[i], room_ids[i], roll_ids[i]   who sits where
+    seat_ids[i]                                 their seat, once seated
+
+Ids index the subjects, rooms, roll_table and seat_labels tuples. Entries
+are stored subject by subject, each (subject, room) run contiguous, and
+two offset tables index them:
+
+    group_rooms / group_offsets / subject_groups
+        the (subject, room) runs: subject s owns groups
+        subject_groups[s]:subject_groups[s + 1], group g covers entries
+        group_offsets[g]:group_offsets[g + 1]
+    room_order / room_offsets
+        entry numbers room by room, in seat order once seated
+
+An Allocation reads like the nested dict (allocation[subject][room] is a
+sequence of roll strings) and seat_map() like the old seat map. Both are
+views over the arrays; nothing is copied per student.
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+
+def _offsets(counts):
+    offsets = array("i", [0])
+    total = 0
+    for n in counts:
+        total += n
+        offsets.append(total)
+    return offsets
+
+
+class Allocation(Mapping):
+    """
+    Who sits where in one session. Build one with AllocationBuilder or
+    Allocation.from_nested; assign_seats adds the seats.
+
+    Subject, room and seat ids are unsigned shorts, so a session holds at
+    most 65,536 subjects, rooms and distinct seat labels.
+    """
+
+    __slots__ = (
+        "subjects", "rooms", "roll_table",
+        "subject_ids", "room_ids", "roll_ids",
+        "group_rooms", "group_offsets", "subject_groups",
+        "room_order", "room_offsets",
+        "seat_ids", "seat_labels",
+    )
+
+    def __init__(self, subjects, rooms, roll_table, subject_ids, room_ids, roll_ids,
+                 group_rooms, group_offsets, subject_groups):
+        self.subjects = subjects
+        self.rooms = rooms
+        self.roll_table = roll_table
+        self.subject_ids = subject_ids
+        self.room_ids = room_ids
+        self.roll_ids = roll_ids
+        self.group_rooms = group_rooms
+        self.group_offsets = group_offsets
+        self.subject_groups = subject_groups
+        self.seat_ids = None
+        self.seat_labels = ()
+
+        # Entries by room, keeping subject order within each room
+        by_room = np.frombuffer(room_ids, dtype=np.uint16)
+        self.room_offsets = _offsets(np.bincount(by_room, minlength=len(rooms)).tolist())
+        self.room_order = array("i", np.argsort(by_room, kind="stable").astype(np.int32).tobytes())
+
+    @classmethod
+    def from_nested(cls, allocations):
+        """
+        Allocation holding { subject: { room: [rolls] } }, in its order.
+        """
+        builder = AllocationBuilder()
+        for subject, room_data in allocations.items():
+            builder.add_subject(subject)
+            for room, rolls in room_data.items():
+                builder.add(subject, room, rolls)
+        return builder.build()
+
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in self.__slots__}
+
+        # A roll table shared with the whole workbook (RollIndex) is
+        # pickled as just the rolls this session seats
+        if len(self.roll_table) > len(self.roll_ids):
+            used, local = np.unique(np.frombuffer(self.roll_ids, dtype=np.int32),
+                                    return_inverse=True)
+            state["roll_table"] = tuple(self.roll_table[i] for i in used.tolist())
+            state["roll_ids"] = array("i", local.astype(np.int32).tobytes())
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def to_nested(self):
+        """
+        A plain { subject: { room: [rolls] } } copy.
+        """
+        return {
+            subject: {room: list(rolls) for room, rolls in room_data.items()}
+            for subject, room_data in self.items()
+        }
+
+    # ---------------- Mapping: subject -> { room: rolls } ----------------
+
+    def __getitem__(self, subject):
+        try:
+            subject_id = self.subjects.index(subject)
+        except ValueError:
+            raise KeyError(subject) from None
+        return SubjectView(self, subject_id)
+
+    def __iter__(self):
+        return iter(self.subjects)
+
+    def __len__(self):
+        return len(self.subjects)
+
+    def items(self):
+        return [(subject, SubjectView(self, s)) for s, subject in enumerate(self.subjects)]
+
+    def values(self):
+        return [SubjectView(self, s) for s in range(len(self.subjects))]
+
+    def __repr__(self):
+        return (f"<Allocation: {len(self.subjects)} subjects, {len(self.rooms)} rooms, "
+                f"{self.size} students>")
+
+    # ---------------- Students and seats ----------------
+
+    @property
+    def size(self):
+        """
+        Number of seated students.
+        """
+        return len(self.roll_ids)
+
+    @property
+    def seated(self):
+        return self.seat_ids is not None
+
+    def all_rolls(self):
+        """
+        Every allocated roll, subject by subject.
+        """
+        return map(self.roll_table.__getitem__, self.roll_ids)
+
+    def set_seating(self, room_order, seat_ids, seat_labels):
+        """
+        Stores the seats: room_order lists each room's entries in seat
+        order (same room_offsets as before), seat_ids[entry] indexes
+        seat_labels.
+        """
+        if len(room_order) != len(self.roll_ids) or len(seat_ids) != len(self.roll_ids):
+            raise ValueError("Seating must cover every allocated student")
+        self.room_order = room_order
+        self.seat_ids = seat_ids
+        self.seat_labels = seat_labels
+
+    def room(self, room):
+        """
+        (subject, roll, seat) of everyone in room, in seat order once
+        seated. seat is "" before that.
+        """
+        try:
+            room_id = self.rooms.index(room)
+        except ValueError:
+            raise KeyError(room) from None
+        return RoomView(self, self.room_offsets[room_id], self.room_offsets[room_id + 1])
+
+    def seat_map(self):
+        """
+        { room: [(subject, roll, seat)] } as a view, rooms in order of
+        first use.
+        """
+        return SeatMap(self)
+
+
+class AllocationBuilder:
+    """
+    Collects (subject, room, rolls) runs and packs them into an
+    Allocation: subjects in first-seen order, each subject's rooms in
+    first-seen order, runs for the same subject and room joined.
+    """
+
+    __slots__ = ("_subjects", "_roll_index", "_roll_table")
+
+    def __init__(self):
+        self._subjects = {}      # subject -> { room: array of roll ids }
+        self._roll_index = {}    # roll -> roll id
+        self._roll_table = []
+
+    def add_subject(self, subject):
+        """
+        Registers subject even if it gets no room.
+        """
+        self._subjects.setdefault(subject, {})
+
+    def add(self, subject, room, rolls):
+        room_data = self._subjects.setdefault(subject, {})
+        ids = room_data.get(room)
+        if ids is None:
+            ids = room_data[room] = array("i")
+
+        index, table = self._roll_index, self._roll_table
+        for roll in rolls:
+            roll_id = index.get(roll)
+            if roll_id is None:
+                roll_id = index[roll] = len(table)
+                table.append(roll)
+            ids.append(roll_id)
+
+    def build(self):
+        room_index = {}
+        subject_ids, room_ids, roll_ids = array("H"), array("H"), array("i")
+        group_rooms = array("H")
+        group_sizes, subject_sizes = [], []
+
+        for subject_id, room_data in enumerate(self._subjects.values()):
+            for room, ids in room_data.items():
+                room_id = room_index.setdefault(room, len(room_index))
+                subject_ids.extend(array("H", [subject_id]) * len(ids))
+                room_ids.extend(array("H", [room_id]) * len(ids))
+                roll_ids.extend(ids)
+                group_rooms.append(room_id)
+                group_sizes.append(len(ids))
+            subject_sizes.append(len(room_data))
+
+        return Allocation(
+            tuple(self._subjects), tuple(room_index), tuple(self._roll_table),
+            subject_ids, room_ids, roll_ids,
+            group_rooms, _offsets(group_sizes), _offsets(subject_sizes)
+        )
+
+
+# ---------------------------------------------------------------
+# VIEWS
+# ---------------------------------------------------------------
+class _EntryRange(Sequence):
+    """
+    Positions [start, stop) of one of an Allocation's arrays. Slices are
+    views too; pickling stores a plain list, so a view sent to a worker
+    process does not drag the whole allocation along.
+    """
+
+    __slots__ = ("_allocation", "_start", "_stop")
+
+    def __init__(self, allocation, start, stop):
+        self._allocation = allocation
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return type(self)(self._allocation, self._start + start,
+                              self._start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._entry(self._start + index)
+
+    def __iter__(self):
+        return map(self._entry, range(self._start, self._stop))
+
+    def __eq__(self, other):
+        if isinstance(other, (_EntryRange, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+class RollsView(_EntryRange):
+    """
+    The roll strings of one subject in one room.
+    """
+
+    __slots__ = ()
+
+    def _entry(self, entry):
+        allocation = self._allocation
+        return allocation.roll_table[allocation.roll_ids[entry]]
+
+    def __iter__(self):
+        return map(self._allocation.roll_table.__getitem__, self.ids())
+
+    def ids(self):
+        """
+        The roll ids, as a memoryview of the allocation's array.
+        """
+        return memoryview(self._allocation.roll_ids)[self._start:self._stop]
+
+    def seats(self):
+        """
+        Seat label of each roll, "" before seating.
+        """
+        allocation = self._allocation
+        if not allocation.seated:
+            return [""] * len(self)
+        labels = allocation.seat_labels
+        return [labels[s] for s in allocation.seat_ids[self._start:self._stop]]
+
+
+class RoomView(_EntryRange):
+    """
+    (subject, roll, seat) of everyone in one room.
+    """
+
+    __slots__ = ()
+
+    def _entry(self, position):
+        allocation = self._allocation
+        entry = allocation.room_order[position]
+        seat = ""
+        if allocation.seat_ids is not None:
+            seat = allocation.seat_labels[allocation.seat_ids[entry]]
+        return (allocation.subjects[allocation.subject_ids[entry]],
+                allocation.roll_table[allocation.roll_ids[entry]],
+                seat)
+
+
+class SubjectView(Mapping):
+    """
+    { room: rolls } of one subject.
+    """
+
+    __slots__ = ("_allocation", "_subject_id")
+
+    def __init__(self, allocation, subject_id):
+        self._allocation = allocation
+        self._subject_id = subject_id
+
+    def _groups(self):
+        groups = self._allocation.subject_groups
+        return range(groups[self._subject_id], groups[self._subject_id + 1])
+
+    def _rolls(self, group):
+        offsets = self._allocation.group_offsets
+        return RollsView(self._allocation, offsets[group], offsets[group + 1])
+
+    def __getitem__(self, room):
+        allocation = self._allocation
+        for group in self._groups():
+            if allocation.rooms[allocation.group_rooms[group]] == room:
+                return self._rolls(group)
+        raise KeyError(room)
+
+    def __iter__(self):
+        rooms, group_rooms = self._allocation.rooms, self._allocation.group_rooms
+        return (rooms[group_rooms[g]] for g in self._groups())
+
+    def __len__(self):
+        return len(self._groups())
+
+    def items(self):
+        rooms, group_rooms = self._allocation.rooms, self._allocation.group_rooms
+        return [(rooms[group_rooms[g]], self._rolls(g)) for g in self._groups()]
+
+    def values(self):
+        return [self._rolls(g) for g in self._groups()]
+
+
+class SeatMap(Mapping):
+    """
+    { room: [(subject, roll, seat)] } view of a seated Allocation, the
+    shape the PDF generators and run state read.
+    """
+
+    __slots__ = ("allocation",)
+
+    def __init__(self, allocation):
+        self.allocation = allocation
+
+    def _view(self, room_id):
+        offsets = self.allocation.room_offsets
+        return RoomView(self.allocation, offsets[room_id], offsets[room_id + 1])
+
+    def __getitem__(self, room):
+        return self.allocation.room(room)
+
+    def __iter__(self):
+        return iter(self.allocation.rooms)
+
+    def __len__(self):
+        return len(self.allocation.rooms)
+
+    def items(self):
+        return [(room, self._view(r)) for r, room in enumerate(self.allocation.rooms)]
+
+    def values(self):
+        return [self._view(r) for r in range(len(self.allocation.rooms))]
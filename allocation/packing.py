@@ -0,0 +1,349 @@
+# allocation/packing.py
+"""
+Room-minimizing allocators.
+
+Both strategies return the same (allocations, seats_left) shape as
+allocator.allocate_students_to_rooms, but try to open as few rooms as
+possible and to keep each subject in as few rooms as possible:
+
+    ffd      first-fit-decreasing with best-fit placement of whole subjects
+    optimal  branch-and-bound over the same moves, seeded with the better of
+             the greedy and ffd plans;
+             exact on small sessions, falls back to the best plan found
+             when the search budget runs out
+
+Opening the largest rooms first already uses the fewest rooms on most
+sessions, so in practice optimal trims subject/room pairs rather than
+rooms, and mostly in sparse mode where ffd splits subjects more.
+
+A plan is {subject: [(room, count), ...]}; rolls are sliced from each
+subject's sorted list in plan order. Rooms holding one or two subjects
+cannot always keep them apart on the seating grid; the greedy allocator
+mixes subjects across rooms instead.
+"""
+
+from allocation.allocator import (
+    allocate_students_to_rooms, apply_buffer, build_allocation, usable_seats,
+)
+
+
+# Nodes explored by the optimal search before settling for the best plan so far;
+# past a few thousand the search rarely finds fewer pairs and costs far more
+DEFAULT_NODE_LIMIT = 5_000
+
+
+def _subjects_by_size(subject_rolls):
+    # Largest first; ties keep timetable order so results are deterministic
+    order = {subj: i for i, subj in enumerate(subject_rolls)}
+    return sorted(subject_rolls, key=lambda s: (-len(subject_rolls[s]), order[s]))
+
+
+def _best_fit(rooms, seats_left, need, mode):
+    """
+    The room whose usable seats cover `need` with the least slack.
+    """
+    best, best_slack = None, None
+    for room in rooms:
+        if seats_left[room] <= 0:
+            continue
+        slack = usable_seats(seats_left[room], mode) - need
+        if slack >= 0 and (best_slack is None or slack < best_slack):
+            best, best_slack = room, slack
+    return best
+
+
+def _ffd_plan(subject_rolls, adjusted_caps, mode):
+    seats_left = dict(adjusted_caps)
+    closed = sorted(adjusted_caps, key=lambda r: -adjusted_caps[r])
+    opened = []
+    plan = {}
+    unplaced = {}
+
+    # Open the fewest (largest) rooms whose seats cover everyone up front;
+    # more are opened only if placement runs short.
+    total = sum(len(rolls) for rolls in subject_rolls.values())
+    while closed and sum(seats_left[r] for r in opened) < total:
+        opened.append(closed.pop(0))
+
+    for subject in _subjects_by_size(subject_rolls):
+        remaining = len(subject_rolls[subject])
+        plan[subject] = []
+
+        while remaining:
+            # Whole remainder into the open room it fits most tightly
+            room = _best_fit(opened, seats_left, remaining, mode)
+            if room is not None:
+                take = remaining
+            else:
+                # Too big for any open room: keep filling the room this
+                # subject already started, else the roomiest open one,
+                # opening the next largest room once the open ones are full
+                spare = [r for r in opened if seats_left[r] > 0]
+                if not spare and closed:
+                    opened.append(closed.pop(0))
+                    spare = opened[-1:]
+                if not spare:
+                    break
+                if plan[subject] and seats_left[plan[subject][-1][0]] > 0:
+                    room = plan[subject][-1][0]
+                else:
+                    room = max(spare, key=lambda r: usable_seats(seats_left[r], mode))
+                take = min(usable_seats(seats_left[room], mode), remaining)
+
+            plan[subject].append((room, take))
+            seats_left[room] -= take
+            remaining -= take
+
+        if remaining:
+            unplaced[subject] = remaining
+
+    return plan, unplaced
+
+
+def _plan_cost(plan):
+    # (rooms opened, distinct subject/room pairs)
+    rooms = {room for placements in plan.values() for room, _ in placements}
+    fragments = sum(len({room for room, _ in placements}) for placements in plan.values())
+    return len(rooms), fragments
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class _PlanSearch:
+    """
+    Depth-first branch-and-bound minimizing (rooms opened, subject fragments).
+
+    Rooms with equal free seats are interchangeable, so only one room per
+    distinct free-seat count is tried at each step.
+    """
+
+    def __init__(self, sizes, adjusted_caps, mode, incumbent, node_limit):
+        self.subjects = [subj for subj, _ in sizes]
+        self.sizes = [n for _, n in sizes]
+        self.mode = mode
+        self.node_limit = node_limit
+        self.nodes = 0
+
+        self.free = dict(adjusted_caps)
+        self.closed = sorted(adjusted_caps, key=lambda r: -adjusted_caps[r])
+        self.opened = []
+        self.placements = []  # (subject index, room, count)
+        self.pairs = {}       # (subject index, room) -> placements
+
+        self.best_plan = incumbent
+        self.best_cost = _plan_cost(incumbent)
+
+        # suffix[i] = students in subjects i..end
+        self.suffix = [0] * (len(self.sizes) + 1)
+        for i in range(len(self.sizes) - 1, -1, -1):
+            self.suffix[i] = self.suffix[i + 1] + self.sizes[i]
+
+    def run(self):
+        if not self.sizes:
+            return self.best_plan, True
+
+        # Already at the lower bound: every subject in one room and no
+        # fewer rooms possible, so there is nothing to search for
+        if self.best_cost <= (self._extra_rooms_needed(self.suffix[0]), len(self.sizes)):
+            return self.best_plan, True
+
+        try:
+            self._search(0, self.sizes[0], 0)
+            return self.best_plan, True
+        except _BudgetExceeded:
+            return self.best_plan, False
+
+    def _extra_rooms_needed(self, students):
+        # Lower bound: cover what open rooms cannot hold with the largest
+        # closed rooms, counting raw free seats (usable never exceeds them)
+        overflow = students - sum(self.free[r] for r in self.opened)
+        rooms = 0
+        for room in self.closed:
+            if overflow <= 0:
+                break
+            overflow -= self.free[room]
+            rooms += 1
+        return rooms if overflow <= 0 else None
+
+    def _search(self, i, remaining, fragments):
+        self.nodes += 1
+        if self.nodes > self.node_limit:
+            raise _BudgetExceeded()
+
+        if remaining == 0:
+            i += 1
+            if i == len(self.sizes):
+                cost = (len(self.opened), fragments)
+                if cost < self.best_cost:
+                    self.best_cost = cost
+                    self._record()
+                return
+            remaining = self.sizes[i]
+
+        extra = self._extra_rooms_needed(remaining + self.suffix[i + 1])
+        if extra is None:
+            return
+        # Each later subject adds a pair; so does this one unless it has
+        # already started and can continue in one of its rooms
+        later_subjects = len(self.sizes) - i - 1
+        started = remaining < self.sizes[i]
+        bound = (len(self.opened) + extra, fragments + (not started) + later_subjects)
+        if bound >= self.best_cost:
+            return
+
+        for room, whole in self._moves(remaining):
+            take = remaining if whole else usable_seats(self.free[room], self.mode)
+            opening = room not in self.opened
+            new_pair = (i, room) not in self.pairs
+
+            if opening:
+                self.closed.remove(room)
+                self.opened.append(room)
+            self.free[room] -= take
+            self.placements.append((i, room, take))
+            self.pairs[(i, room)] = self.pairs.get((i, room), 0) + 1
+
+            self._search(i, remaining - take, fragments + new_pair)
+
+            self.pairs[(i, room)] -= 1
+            if not self.pairs[(i, room)]:
+                del self.pairs[(i, room)]
+            self.placements.pop()
+            self.free[room] += take
+            if opening:
+                self.opened.pop()
+                self._reopen(room)
+
+    def _moves(self, remaining):
+        """
+        Candidate (room, whole) moves, most promising first: whole subject
+        into an open room, into a new room, then partial fills.
+        """
+        whole_open, whole_new, part_open, part_new = [], [], [], []
+        seen_open, seen_new = set(), set()
+
+        for room in self.opened:
+            free = self.free[room]
+            if free <= 0 or free in seen_open:
+                continue
+            seen_open.add(free)
+            usable = usable_seats(free, self.mode)
+            (whole_open if usable >= remaining else part_open).append((usable, room))
+
+        for room in self.closed:
+            free = self.free[room]
+            if free in seen_new:
+                continue
+            seen_new.add(free)
+            usable = usable_seats(free, self.mode)
+            (whole_new if usable >= remaining else part_new).append((usable, room))
+
+        moves = [(room, True) for _, room in sorted(whole_open, key=lambda m: m[0])]
+        moves += [(room, True) for _, room in sorted(whole_new, key=lambda m: m[0])]
+        moves += [(room, False) for _, room in sorted(part_open, key=lambda m: -m[0])]
+        moves += [(room, False) for _, room in sorted(part_new, key=lambda m: -m[0])]
+        return moves
+
+    def _reopen(self, room):
+        # Keep closed rooms ordered largest first
+        cap = self.free[room]
+        for pos, other in enumerate(self.closed):
+            if self.free[other] < cap:
+                self.closed.insert(pos, room)
+                return
+        self.closed.append(room)
+
+    def _record(self):
+        plan = {subj: [] for subj in self.subjects}
+        for i, room, take in self.placements:
+            plan[self.subjects[i]].append((room, take))
+        self.best_plan = plan
+
+
+def _build(subject_rolls, adjusted_caps, plan):
+    seats_left = dict(adjusted_caps)
+    rooms = list(adjusted_caps)
+    position = {room: r for r, room in enumerate(rooms)}
+
+    # The plan as runs, keeping the caller's subject order in the output
+    runs = ([], [], [])
+    for s, subject in enumerate(subject_rolls):
+        for room, count in plan.get(subject, []):
+            runs[0].append(s)
+            runs[1].append(position[room])
+            runs[2].append(count)
+            seats_left[room] -= count
+
+    return build_allocation(subject_rolls, rooms, runs), seats_left
+
+
+def _log_plan(logger, name, plan, unplaced):
+    if not logger:
+        return
+    rooms, fragments = _plan_cost(plan)
+    logger.info(f"{name} allocator: {rooms} rooms opened, {fragments} subject/room pairs")
+    for subject, count in unplaced.items():
+        logger.error(f"⚠ Not enough rooms for subject {subject}! {count} unassigned students.")
+
+
+def allocate_ffd(subject_rolls, room_caps, buffer=0, mode="dense", logger=None):
+    """
+    First-fit-decreasing allocation. RETURNS (allocations, seats_left)
+    in the same format as allocate_students_to_rooms.
+    """
+    usable_seats(1, mode)  # reject an invalid mode up front
+
+    adjusted_caps = apply_buffer(room_caps, buffer)
+    plan, unplaced = _ffd_plan(subject_rolls, adjusted_caps, mode)
+
+    _log_plan(logger, "FFD", plan, unplaced)
+    return _build(subject_rolls, adjusted_caps, plan)
+
+
+def allocate_optimal(subject_rolls, room_caps, buffer=0, mode="dense", logger=None,
+                     node_limit=DEFAULT_NODE_LIMIT):
+    """
+    Minimum-rooms allocation by branch-and-bound, seeded with the better
+    of the greedy and ffd plans.
+    RETURNS (allocations, seats_left) in the same format as
+    allocate_students_to_rooms.
+    """
+    usable_seats(1, mode)  # reject an invalid mode up front
+
+    adjusted_caps = apply_buffer(room_caps, buffer)
+    plan, unplaced = _ffd_plan(subject_rolls, adjusted_caps, mode)
+
+    # Start from whichever heuristic plan is better, so the result is
+    # never worse than greedy or ffd (unmixed: a subject split over every
+    # room is what this search avoids)
+    greedy_allocations, _ = allocate_students_to_rooms(subject_rolls, room_caps, buffer, mode,
+                                                       mix=False)
+    greedy_plan = {
+        subject: [(room, len(rolls)) for room, rolls in room_data.items()]
+        for subject, room_data in greedy_allocations.items()
+    }
+    greedy_placed = sum(n for placements in greedy_plan.values() for _, n in placements)
+    if greedy_placed == sum(len(r) for r in subject_rolls.values()) and (
+            unplaced or _plan_cost(greedy_plan) < _plan_cost(plan)):
+        plan, unplaced = greedy_plan, {}
+
+    # Not everyone fits: nothing to optimize, keep the heuristic placement
+    if not unplaced:
+        sizes = [
+            (s, len(subject_rolls[s]))
+            for s in _subjects_by_size(subject_rolls)
+            if subject_rolls[s]
+        ]
+        search = _PlanSearch(sizes, adjusted_caps, mode, plan, node_limit)
+        plan, exact = search.run()
+
+        if logger and not exact:
+            logger.info(
+                f"Optimal allocator: search budget of {node_limit} nodes reached, "
+                f"using best plan found"
+            )
+
+    _log_plan(logger, "Optimal", plan, unplaced)
+    return _build(subject_rolls, adjusted_caps, plan)
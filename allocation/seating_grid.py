@@ -0,0 +1,202 @@
+# allocation/seating_grid.py
+"""
+Seat-level placement inside each room.
+
+Every room is a grid of rows × columns (from the Rows/Columns columns of
+in_room_capacity, or derived from the capacity). Seats are coloured like a
+chessboard; two seats that are next to each other (left/right or
+front/back) always have different colours.
+
+The placer lays subjects, largest first, over all "black" seats and then
+all "white" seats. A subject therefore never sits next to itself, except
+for the one subject that straddles the black/white boundary, whose two
+halves end up at opposite ends of the room. Rooms at most half full use
+only black seats and have no neighbours at all. Placement is linear in
+the number of seats.
+
+That only works while no subject holds more than half of a room's seats,
+which the greedy allocator ensures by mixing subjects across the rooms it
+fills (allocate_students_to_rooms(mix=True)).
+"""
+
+import math
+from array import array
+
+from allocation.model import Allocation
+
+
+# Columns used when the sheet gives no layout for a room
+DEFAULT_COLUMNS = 6
+
+
+class RoomLayout:
+    """
+    A room's seat grid. Only the first `capacity` seats in row-major order
+    exist, so the last row may be partial.
+    """
+
+    __slots__ = ("room", "rows", "columns", "capacity")
+
+    def __init__(self, room, rows, columns, capacity=None):
+        self.room = room
+        self.rows = rows
+        self.columns = columns
+        self.capacity = rows * columns if capacity is None else min(capacity, rows * columns)
+
+    @classmethod
+    def for_capacity(cls, room, capacity, columns=DEFAULT_COLUMNS):
+        columns = max(min(columns, capacity), 1)
+        return cls(room, math.ceil(max(capacity, 1) / columns), columns, capacity)
+
+    def seats(self):
+        """
+        (row, column) of every seat, 0-based, in row-major order.
+        """
+        for i in range(self.capacity):
+            yield divmod(i, self.columns)
+
+
+def seat_label(row, col):
+    return f"R{row + 1}C{col + 1}"
+
+
+def build_room_layouts(room_caps, room_layouts=None):
+    """
+    RoomLayout for every room: explicit (rows, columns) where the sheet has
+    them, otherwise a DEFAULT_COLUMNS-wide grid holding the capacity.
+    """
+    room_layouts = room_layouts or {}
+    layouts = {}
+    for room, cap in room_caps.items():
+        if room in room_layouts:
+            rows, columns = room_layouts[room]
+            layouts[room] = RoomLayout(room, rows, columns)
+        else:
+            layouts[room] = RoomLayout.for_capacity(room, cap)
+    return layouts
+
+
+def place_room(entries, layout):
+    """
+    entries: [(subject, roll)] seated in one room.
+    RETURNS ([(subject, roll, row, col)] in seat order, conflicts) where
+    conflicts counts adjacent seat pairs holding the same subject.
+    """
+    # Grow the grid rather than drop students if the layout is too small
+    if len(entries) > layout.capacity:
+        rows = math.ceil(len(entries) / layout.columns)
+        layout = RoomLayout(layout.room, rows, layout.columns, len(entries))
+
+    black, white = [], []
+    for row, col in layout.seats():
+        (black if (row + col) % 2 == 0 else white).append((row, col))
+    order = black + white
+
+    # Group rolls by subject, keeping each subject's roll order
+    by_subject = {}
+    for subject, roll in entries:
+        by_subject.setdefault(subject, []).append(roll)
+    subjects = sorted(by_subject, key=lambda s: -len(by_subject[s]))
+
+    # slots[row * columns + col] = (subject, roll)
+    columns = layout.columns
+    slots = [None] * layout.capacity
+    seat = iter(order)
+    for subject in subjects:
+        for roll in by_subject[subject]:
+            row, col = next(seat)
+            slots[row * columns + col] = (subject, roll)
+
+    placed = []
+    conflicts = 0
+    for i, entry in enumerate(slots):
+        if entry is None:
+            continue
+        row, col = divmod(i, columns)
+        placed.append((entry[0], entry[1], row, col))
+
+        right = slots[i + 1] if col + 1 < columns and i + 1 < len(slots) else None
+        below = slots[i + columns] if i + columns < len(slots) else None
+        if right is not None and right[0] == entry[0]:
+            conflicts += 1
+        if below is not None and below[0] == entry[0]:
+            conflicts += 1
+
+    return placed, conflicts
+
+
+def _kept_order(allocation, entries, kept):
+    """
+    The entries of a room in the order of its kept seating, as
+    [(entry, seat_label)], or None when the rosters differ.
+    """
+    roll_table, roll_ids = allocation.roll_table, allocation.roll_ids
+    by_roll = {roll_table[roll_ids[entry]]: entry for _, entry in entries}
+    placed = [(by_roll.get(roll), seat) for _, roll, seat in kept]
+    if len(placed) != len(entries) or any(entry is None for entry, _ in placed):
+        return None
+    return placed
+
+
+def assign_seats(allocations, layouts, logger=None, keep=None):
+    """
+    allocations: Allocation (or { subject: { room: [rolls] } })
+    layouts: { room: RoomLayout }
+    keep: { room: [(subject, roll, seat_label)] } seating reused as is for
+          rooms whose roster did not change
+
+    The seats are stored in the Allocation (a nested dict is converted
+    first).
+
+    RETURNS seat_map, a view over the allocation reading as:
+    {
+        "6101": [(subject, roll, seat_label), ...],   # in seat order
+        ...
+    }
+    """
+    if not isinstance(allocations, Allocation):
+        allocations = Allocation.from_nested(allocations)
+
+    subject_ids, offsets = allocations.subject_ids, allocations.room_offsets
+    room_order = array("i", allocations.room_order)
+    seat_ids = array("H", bytes(2 * allocations.size))
+    labels = {}  # seat label -> id
+
+    keep = keep or {}
+    crowded = {}
+    for room_id, room in enumerate(allocations.rooms):
+        start, stop = offsets[room_id], offsets[room_id + 1]
+        # (subject id, entry) in allocation order; place_room only
+        # compares subjects
+        entries = [(subject_ids[e], e) for e in sorted(room_order[start:stop])]
+
+        placed = _kept_order(allocations, entries, keep[room]) if room in keep else None
+        conflicts = 0
+        if placed is None:
+            layout = layouts.get(room) or RoomLayout.for_capacity(room, len(entries))
+            grid, conflicts = place_room(entries, layout)
+            placed = [(entry, seat_label(row, col)) for _, entry, row, col in grid]
+
+        for position, (entry, label) in enumerate(placed, start):
+            room_order[position] = entry
+            seat_ids[entry] = labels.setdefault(label, len(labels))
+
+        if conflicts:
+            crowded[room] = conflicts
+            if logger:
+                logger.debug(
+                    f"Room {room}: {conflicts} pairs of same-subject neighbours "
+                    f"in the {layout.rows}×{layout.columns} grid"
+                )
+
+    # Unavoidable when one subject holds more than half of a room's seats,
+    # as rooms kept together by the packing allocators or --incremental can
+    if crowded and logger:
+        logger.warning(
+            f"{len(crowded)} of {len(allocations.rooms)} rooms seat same-subject neighbours "
+            f"({sum(crowded.values())} adjacent pairs): a subject holds about half of "
+            f"their seats or more"
+        )
+
+    allocations.set_seating(room_order, seat_ids, tuple(labels))
+    return allocations.seat_map()
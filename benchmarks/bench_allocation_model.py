@@ -0,0 +1,137 @@
+"""
+Memory of the compact Allocation against the nested dicts it replaced.
+
+Allocates and seats a synthetic timetable, 100,000 students by default,
+and keeps every session's allocations and seat map, as run_pipeline's
+result and the run state do. The nested variant rebuilds the old shapes
+the way the pipeline used to: { subject: { room: [rolls] } } and a seat
+map { room: [(subject, roll, seat)] }.
+
+Reports the heap retained by the kept sessions (tracemalloc; the roll
+strings themselves exist before either variant runs and are not
+counted), the peak while the overall Excel rows are generated, the
+pickled size (run state, worker results) and the time to allocate and
+seat.
+
+    python -m benchmarks.bench_allocation_model --students 100000 --sessions 20
+"""
+
+import argparse
+import gc
+import pickle
+import random
+import time
+import tracemalloc
+
+from allocation.allocator import allocate_students_to_rooms
+from allocation.seating_grid import assign_seats, build_room_layouts, place_room, seat_label
+from output.excel_writer import _overall_rows
+
+
+def make_timetable(students, sessions, rooms, seats, rng):
+    """
+    [subject_rolls] per session, students spread over the sessions, and
+    room capacities holding any one session.
+    """
+    per_session = students // sessions
+    timetable = []
+    for n in range(sessions):
+        subject_rolls = {}
+        left, s = per_session, 0
+        while left:
+            size = min(rng.randint(20, 400), left)
+            subject_rolls[f"C{n:02d}{s:03d}"] = [f"24{n:02d}{s:03d}X{i:04d}" for i in range(size)]
+            left -= size
+            s += 1
+        timetable.append(subject_rolls)
+
+    room_caps = {f"R{r:03d}": seats for r in range(rooms)}
+    return timetable, room_caps
+
+
+def nested_session(subject_rolls, room_caps, layouts):
+    # The old pipeline: nested allocations, then per-student seat tuples
+    allocation, _ = allocate_students_to_rooms(subject_rolls, room_caps)
+    allocations = allocation.to_nested()
+    del allocation
+
+    room_entries = {}
+    for subject, room_data in allocations.items():
+        for room, rolls in room_data.items():
+            room_entries.setdefault(room, []).extend((subject, r) for r in rolls)
+
+    seat_map = {}
+    for room, entries in room_entries.items():
+        placed, _ = place_room(entries, layouts[room])
+        seat_map[room] = [(subject, roll, seat_label(row, col)) for subject, roll, row, col in placed]
+    return allocations, seat_map
+
+
+def compact_session(subject_rolls, room_caps, layouts):
+    allocation, _ = allocate_students_to_rooms(subject_rolls, room_caps)
+    seat_map = assign_seats(allocation, layouts)
+    return allocation, seat_map
+
+
+def run(build, timetable, room_caps, layouts):
+    return [build(subject_rolls, room_caps, layouts) for subject_rolls in timetable]
+
+
+def measure(build, timetable, room_caps, layouts):
+    start = time.perf_counter()
+    run(build, timetable, room_caps, layouts)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = run(build, timetable, room_caps, layouts)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    for allocations, seat_map in kept:
+        for _ in _overall_rows("Day", "morning", allocations, seat_map):
+            pass
+    rows_peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    pickled = len(pickle.dumps(kept, protocol=4))
+    return {"retained": retained, "rows_peak": rows_peak, "pickled": pickled, "seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocation model memory benchmark")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--seats", type=int, default=60, help="Seats per room")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    timetable, room_caps = make_timetable(args.students, args.sessions, args.rooms, args.seats,
+                                          random.Random(args.seed))
+    layouts = build_room_layouts(room_caps)
+    students = sum(len(r) for subject_rolls in timetable for r in subject_rolls.values())
+
+    results = {
+        "nested dicts": measure(nested_session, timetable, room_caps, layouts),
+        "Allocation": measure(compact_session, timetable, room_caps, layouts),
+    }
+
+    print(f"{students} students over {args.sessions} sessions, {args.rooms} rooms")
+    print(f"{'':<24}" + "".join(f"{name:>15}" for name in results))
+    for key, label, scale in [("retained", "retained (MiB)", 2**20),
+                              ("rows_peak", "Excel rows peak (MiB)", 2**20),
+                              ("pickled", "pickled (MiB)", 2**20),
+                              ("seconds", "allocate + seat (s)", 1)]:
+        print(f"{label:<24}" + "".join(f"{r[key] / scale:>15.2f}" for r in results.values()))
+
+    old, new = results["nested dicts"], results["Allocation"]
+    print(f"Allocation keeps {1 - new['retained'] / old['retained']:.0%} less and pickles "
+          f"{1 - new['pickled'] / old['pickled']:.0%} smaller")
+
+
+if __name__ == "__main__":
+    main()
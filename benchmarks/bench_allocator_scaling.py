@@ -0,0 +1,109 @@
+"""
+Scaling of the greedy allocator with session size.
+
+Times allocate_students_to_rooms from 10k to 200k students against the
+previous list re-slicing implementation, checks both give identical
+results, and prints the time per student so linear growth is visible.
+The legacy code never mixed subjects, so the comparison runs with
+mix=False; the last columns time the default, mixed allocation.
+
+    python -m benchmarks.bench_allocator_scaling
+"""
+
+import argparse
+import logging
+import time
+
+from allocation.allocator import allocate_students_to_rooms, apply_buffer, usable_seats
+
+
+def legacy_allocate(subject_rolls, room_caps, buffer=0, mode="dense", logger=None):
+    # The pre-offset implementation: re-slices `remaining` for every room
+    # and rescans from the largest room for every subject.
+    adjusted_caps = apply_buffer(room_caps, buffer)
+    seats_left = dict(adjusted_caps)
+    rooms_sorted = sorted(adjusted_caps.items(), key=lambda x: -x[1])
+    final_allocations = {}
+
+    for subject, rolls in subject_rolls.items():
+        remaining = list(rolls)
+        final_allocations[subject] = {}
+        room_index = 0
+        while remaining and room_index < len(rooms_sorted):
+            room_name, _ = rooms_sorted[room_index]
+            free_seats = seats_left[room_name]
+            if free_seats <= 0:
+                room_index += 1
+                continue
+            assign_count = min(usable_seats(free_seats, mode), len(remaining))
+            final_allocations[subject].setdefault(room_name, []).extend(remaining[:assign_count])
+            remaining = remaining[assign_count:]
+            seats_left[room_name] -= assign_count
+            if logger:
+                logger.info(f"Room {room_name}: assigned {assign_count} students of {subject}")
+
+    return final_allocations, seats_left
+
+
+def make_session(students, subjects=40, room_size=30):
+    # One large common course plus electives sharing the rest
+    common = students // 2
+    sizes = [common] + [(students - common) // (subjects - 1)] * (subjects - 1)
+    sizes[-1] += students - sum(sizes)
+
+    subject_rolls = {
+        f"S{s:03d}": [f"{s:03d}X{i:06d}" for i in range(n)]
+        for s, n in enumerate(sizes)
+    }
+    rooms = {f"R{r:05d}": room_size for r in range(students // room_size + 1)}
+    return subject_rolls, rooms
+
+
+def _quiet_logger():
+    # A real handler at INFO, like the CLI console, so logging cost counts
+    logger = logging.getLogger("bench_allocator_scaling")
+    logger.handlers[:] = [logging.NullHandler()]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def _time(fn, *args, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Greedy allocator scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 25_000, 50_000, 100_000, 200_000])
+    parser.add_argument("--mode", choices=["dense", "sparse"], default="dense")
+    args = parser.parse_args()
+
+    logger = _quiet_logger()
+
+    print(f"{'students':>10}{'legacy (s)':>12}{'offset (s)':>12}{'µs/student':>12}{'speedup':>9}"
+          f"{'mixed (s)':>11}{'µs/student':>12}")
+    for n in args.sizes:
+        subject_rolls, rooms = make_session(n)
+
+        legacy_t, legacy_out = _time(legacy_allocate, subject_rolls, rooms, 0, args.mode, logger)
+        current_t, current_out = _time(
+            lambda: allocate_students_to_rooms(subject_rolls, rooms, 0, args.mode, logger,
+                                               mix=False)
+        )
+        if legacy_out != current_out:
+            raise AssertionError(f"{n} students: allocation differs from legacy implementation")
+        mixed_t, _ = _time(allocate_students_to_rooms, subject_rolls, rooms, 0, args.mode, logger)
+
+        print(f"{n:>10}{legacy_t:>12.3f}{current_t:>12.3f}"
+              f"{current_t / n * 1e6:>12.2f}{legacy_t / current_t:>8.1f}x"
+              f"{mixed_t:>11.3f}{mixed_t / n * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare allocation strategies on synthetic sessions.
+
+For each strategy and seating mode reports the rooms opened, subject/room
+pairs (how often subjects are split across rooms; greedy spreads every
+subject over its rooms on purpose) and total runtime, summed over all
+sessions, plus the slowest single session.
+
+    python -m benchmarks.bench_allocators --sessions 40 --mode dense sparse
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from allocation.engine import ALLOCATORS
+
+
+ROOM_SIZES = [30, 30, 30, 72, 72, 55, 25, 90, 70, 70]
+
+
+def make_rooms(count, rng):
+    return {f"R{i:03d}": rng.choice(ROOM_SIZES) for i in range(count)}
+
+
+def make_session(subjects, rng, max_students):
+    session = {}
+    for s in range(subjects):
+        # Mostly small electives with the occasional large common course
+        n = rng.randint(5, 80) if rng.random() < 0.85 else rng.randint(100, max_students)
+        session[f"S{s:03d}"] = [f"R{s:03d}X{i:05d}" for i in range(n)]
+    return session
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocator comparison benchmark")
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--subjects", type=int, default=12, help="Subjects per session")
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--max-students", type=int, default=400,
+                        help="Upper bound for a large course")
+    parser.add_argument("--buffer", type=int, default=0)
+    parser.add_argument("--mode", nargs="+", choices=["dense", "sparse"],
+                        default=["dense", "sparse"])
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rooms = make_rooms(args.rooms, rng)
+    sessions = [make_session(args.subjects, rng, args.max_students) for _ in range(args.sessions)]
+
+    print(f"{args.sessions} sessions × {args.subjects} subjects, {args.rooms} rooms, "
+          f"buffer={args.buffer}")
+    print(f"{'mode':<8}{'allocator':<10}{'rooms':>8}{'pairs':>8}{'unplaced':>10}"
+          f"{'time (s)':>10}{'worst (s)':>11}")
+
+    for mode, (name, allocate) in itertools.product(args.mode, ALLOCATORS.items()):
+        rooms_used = pairs = unplaced = 0
+        elapsed = worst = 0.0
+
+        for subject_rolls in sessions:
+            start = time.perf_counter()
+            allocations, _ = allocate(subject_rolls, rooms, args.buffer, mode)
+            taken = time.perf_counter() - start
+            elapsed += taken
+            worst = max(worst, taken)
+
+            used = set()
+            for subject, room_data in allocations.items():
+                pairs += len(room_data)
+                used.update(room_data)
+                unplaced += len(subject_rolls[subject]) - sum(map(len, room_data.values()))
+            rooms_used += len(used)
+
+        print(f"{mode:<8}{name:<10}{rooms_used:>8}{pairs:>8}{unplaced:>10}"
+              f"{elapsed:>10.3f}{worst:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
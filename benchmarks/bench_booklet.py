@@ -0,0 +1,77 @@
+"""
+Session booklet vs separate PDFs: render time and bytes on disk.
+
+Renders one synthetic session both ways with photos, through export_all,
+and compares the PDF bytes written and the time spent. Photos go through
+a PhotoCache unless --no-thumbnails, as in a normal run.
+
+    python -m benchmarks.bench_booklet --rooms 20 --students 50 --photos 1000
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+from benchmarks.bench_room_pdf import make_room_map
+from benchmarks.synthetic import make_photos
+from output.exporter import PDF_MODES, export_all
+from output.photo_cache import PhotoCache
+from output.photo_index import PhotoIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session booklet benchmark")
+    parser.add_argument("--rooms", type=int, default=20)
+    parser.add_argument("--students", type=int, default=50, help="Students per room")
+    parser.add_argument("--photos", type=int, default=1000,
+                        help="How many students get a photo")
+    parser.add_argument("--no-thumbnails", action="store_true",
+                        help="Embed the photos as they are instead of cached thumbnails")
+    args = parser.parse_args()
+
+    room_map = make_room_map(args.rooms, args.students)
+    rolls = [roll for entries in room_map.values() for _, roll, _ in entries]
+    names = {roll: f"Student {roll}" for roll in rolls}
+    allocations = {}
+    for room, entries in room_map.items():
+        for subject, roll, _ in entries:
+            allocations.setdefault(subject, {}).setdefault(room, []).append(roll)
+    seats_left = {room: 0 for room in room_map}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        photos = os.path.join(tmp, "photos")
+        make_photos(photos, rolls, args.photos, size=(600, 800))
+        index = PhotoIndex(photos)
+        cache = None
+        if not args.no_thumbnails:
+            cache = PhotoCache(os.path.join(tmp, "thumbs"))
+            for roll in rolls:
+                if index.get(roll):
+                    cache.thumbnail(index.get(roll))
+
+        print(f"{args.rooms} rooms × {args.students} students, {args.photos} photos, "
+              f"{'original photos' if cache is None else 'thumbnails'}")
+        print(f"{'mode':<10}{'time (s)':>10}{'PDF files':>11}{'PDF MiB':>10}")
+
+        measured = {}
+        for mode in PDF_MODES:
+            out = os.path.join(tmp, mode)
+            start = time.perf_counter()
+            export_all(out, "2024-04-01", "Morning", allocations, seats_left, names, photos,
+                       seat_map=room_map, photo_cache=cache, photo_index=index, pdf_mode=mode)
+            elapsed = time.perf_counter() - start
+
+            pdfs = glob.glob(os.path.join(out, "*", "*", "*.pdf"))
+            size = sum(os.path.getsize(p) for p in pdfs)
+            measured[mode] = (elapsed, size)
+            print(f"{mode:<10}{elapsed:>10.2f}{len(pdfs):>11}{size / 2**20:>10.2f}")
+
+        (t_sep, s_sep), (t_book, s_book) = measured["separate"], measured["booklet"]
+        print(f"booklet saves {1 - s_book / s_sep:.0%} of the bytes and "
+              f"{1 - t_book / t_sep:.0%} of the time")
+
+
+if __name__ == "__main__":
+    main()
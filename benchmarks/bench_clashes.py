@@ -0,0 +1,87 @@
+"""
+Whole-timetable clash detection on a synthetic exam term.
+
+Compares re-running the pairwise per-session check until a session is
+clean (what finding every clash used to take) with one pass of the
+inverted-index ClashEngine.
+
+    python -m benchmarks.bench_clashes --students 20000 --exams 5
+"""
+
+import argparse
+import random
+import time
+
+from allocation.clash_checker import ClashEngine, summarize_clashes
+
+
+def make_term(students, exams_each, days, sessions_per_day, subjects_per_session, rng):
+    """
+    ([(date, session, [subjects])], { subject: [rolls] }) with every student
+    enrolled in `exams_each` random subjects.
+    """
+    timetable = []
+    subjects = []
+    for d in range(days):
+        for s in range(sessions_per_day):
+            names = [f"D{d}S{s}C{c:02d}" for c in range(subjects_per_session)]
+            timetable.append((f"Day{d:02d}", f"slot{s}", names))
+            subjects.extend(names)
+
+    course_rolls = {subject: [] for subject in subjects}
+    for i in range(students):
+        roll = f"{i:07d}"
+        for subject in rng.sample(subjects, exams_each):
+            course_rolls[subject].append(roll)
+
+    return timetable, course_rolls
+
+
+def pairwise(subjects, subject_rolls):
+    # The original check: set intersections over every pair of subjects
+    sets = {s: set(subject_rolls[s]) for s in subjects}
+    found = []
+    for i in range(len(subjects)):
+        for j in range(i + 1, len(subjects)):
+            shared = sets[subjects[i]] & sets[subjects[j]]
+            if shared:
+                found.append((subjects[i], subjects[j], shared))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clash detection benchmark")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--exams", type=int, default=5, help="Exams per student")
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--sessions", type=int, default=2, help="Sessions per day")
+    parser.add_argument("--subjects", type=int, default=40, help="Subjects per session")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    timetable, course_rolls = make_term(args.students, args.exams, args.days,
+                                        args.sessions, args.subjects, rng)
+    enrolments = sum(len(r) for r in course_rolls.values())
+    print(f"{enrolments} enrolments, {len(timetable)} sessions, "
+          f"{len(course_rolls)} subjects")
+
+    start = time.perf_counter()
+    pairs = sum(len(pairwise(subjects, course_rolls)) for _, _, subjects in timetable)
+    print(f"pairwise sets      {time.perf_counter() - start:8.3f} s  "
+          f"({pairs} clashing subject pairs)")
+
+    start = time.perf_counter()
+    engine = ClashEngine(timetable, course_rolls)
+    built = time.perf_counter()
+    clashes = engine.find()
+    done = time.perf_counter()
+    print(f"inverted index     {done - start:8.3f} s  "
+          f"(index {built - start:.3f} s, scan {done - built:.3f} s)")
+
+    for kind, (count, students) in summarize_clashes(clashes).items():
+        print(f"  {kind:<13} {count:>7} exam pairs  {students:>7} students")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Excel report writing: pandas to_excel vs the streaming (write-only) engine,
+one consolidated workbook for the whole timetable, and the per-student
+csv/jsonl tables (written, then loaded back as a downstream system would).
+
+Reports wall time and, in a second traced run, the peak Python heap
+(tracemalloc) of each variant.
+
+    python -m benchmarks.bench_excel_writer --sessions 40 --subjects 30
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from output.excel_writer import (
+    ConsolidatedWorkbook, write_overall_output, write_seats_left, write_student_table,
+)
+
+
+def make_sessions(count, subjects, rooms, rng):
+    """
+    [(date, session, allocations, seats_left)] with seats_left for every room.
+    """
+    sessions = []
+    for n in range(count):
+        allocations = {}
+        for s in range(subjects):
+            size = rng.randint(10, 300)
+            rolls = [f"{n:02d}{s:03d}X{i:04d}" for i in range(size)]
+            subject_rooms = allocations[f"S{s:03d}"] = {}
+            # A few rooms per subject
+            for k, start in enumerate(range(0, size, 72)):
+                subject_rooms[f"R{(s + k) % rooms:03d}"] = rolls[start:start + 72]
+        seats_left = {f"R{r:03d}": rng.randint(0, 30) for r in range(rooms)}
+        sessions.append((f"Day{n // 2:02d}", ("morning", "evening")[n % 2], allocations, seats_left))
+    return sessions
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+
+    # Tracing slows everything down, so memory gets its own run
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<26}{elapsed:>9.2f} s{peak / 2**20:>10.1f} MB peak")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel writer benchmark")
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--subjects", type=int, default=30, help="Subjects per session")
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sessions = make_sessions(args.sessions, args.subjects, args.rooms, random.Random(args.seed))
+    rolls = sum(len(r) for *_, allocations, _ in sessions
+                for room_data in allocations.values() for r in room_data.values())
+    print(f"{len(sessions)} sessions, {rolls} seated students")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def per_session(engine):
+            folder = os.path.join(tmp, engine)
+            for date, session, allocations, seats_left in sessions:
+                write_overall_output(folder, date, session, allocations, engine=engine)
+                write_seats_left(folder, seats_left, date, session, engine=engine)
+
+        def consolidated():
+            with ConsolidatedWorkbook(os.path.join(tmp, "all_sessions.xlsx")) as book:
+                for date, session, allocations, seats_left in sessions:
+                    book.add_session(date, session, allocations, seats_left)
+
+        def student_tables(output_format):
+            folder = os.path.join(tmp, output_format)
+            for date, session, allocations, _ in sessions:
+                write_student_table(folder, date, session, allocations, output_format=output_format)
+
+        def load_back(output_format):
+            folder = os.path.join(tmp, output_format)
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if name.endswith(".xlsx"):
+                    pd.read_excel(path)
+                elif output_format == "csv":
+                    pd.read_csv(path)
+                else:
+                    pd.read_json(path, lines=True)
+
+        measure("pandas, per session", lambda: per_session("pandas"))
+        measure("streaming, per session", lambda: per_session("streaming"))
+        measure("consolidated workbook", consolidated)
+        measure("csv, per student", lambda: student_tables("csv"))
+        measure("jsonl, per student", lambda: student_tables("jsonl"))
+
+        print()
+        measure("load xlsx reports", lambda: load_back("streaming"))
+        measure("load csv tables", lambda: load_back("csv"))
+        measure("load jsonl tables", lambda: load_back("jsonl"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Roll strings against interned roll ids with the NumPy kernels.
+
+Builds a synthetic timetable in memory, 100,000 enrolments by default
+(the same layout benchmarks/synthetic.py writes: disjoint subjects within
+a session, students sitting several sessions), and times each stage on
+plain roll lists and on SubjectRolls from a RollIndex:
+
+    session clash checks    check_clashes for every session
+    clash report            find_all_clashes over the whole timetable
+    allocate dense/sparse   the greedy allocator for every session
+
+Each pair of variants is checked to give the same result.
+
+    python -m benchmarks.bench_kernels --days 10 --subjects 50 --students 100
+"""
+
+import argparse
+import random
+import time
+
+from allocation.allocator import allocate_students_to_rooms
+from allocation.clash_checker import check_clashes, find_all_clashes
+from input.roll_index import RollIndex
+
+
+def make_timetable(days, subjects, students, seed):
+    """
+    (timetable, course_rolls) for days × 2 sessions of `subjects`
+    subjects with `students` students each.
+    """
+    rng = random.Random(seed)
+    per_session = subjects * students
+    rolls = [f"{2000 + i % 9}X{i:06d}" for i in range(per_session * 2)]
+
+    timetable, course_rolls = [], {}
+    for d in range(days):
+        for session in ("Morning", "Evening"):
+            codes = [f"D{d:02d}{session[0]}C{c:03d}" for c in range(subjects)]
+            sitting = rng.sample(rolls, per_session)
+            for c, code in enumerate(codes):
+                course_rolls[code] = sorted(sitting[c * students:(c + 1) * students])
+            timetable.append((f"Day{d:02d}", session, codes))
+    return timetable, course_rolls
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll-id kernel benchmark")
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--subjects", type=int, default=50, help="Subjects per session")
+    parser.add_argument("--students", type=int, default=100, help="Students per subject")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--seats", type=int, default=65, help="Seats per room")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    timetable, course_rolls = make_timetable(args.days, args.subjects, args.students, args.seed)
+    room_caps = {f"R{r:03d}": args.seats for r in range(args.rooms)}
+    enrolments = sum(map(len, course_rolls.values()))
+
+    intern_time, index = best_of(args.repeat, lambda: RollIndex(course_rolls))
+
+    as_strings = [(codes, {c: list(course_rolls[c]) for c in codes}) for _, _, codes in timetable]
+    as_ids = [(codes, index.session(codes)) for _, _, codes in timetable]
+
+    def clashes(sessions):
+        return [check_clashes(codes, rolls) for codes, rolls in sessions]
+
+    def allocate(sessions, mode):
+        results = []
+        for _, rolls in sessions:
+            allocation, seats_left = allocate_students_to_rooms(rolls, room_caps, mode=mode)
+            results.append((allocation.to_nested(), seats_left))
+        return results
+
+    stages = [
+        ("session clash checks", lambda s: clashes(s)),
+        ("clash report",
+         lambda s: find_all_clashes(timetable, course_rolls,
+                                    index if s is as_ids else None)),
+        ("allocate dense", lambda s: allocate(s, "dense")),
+        ("allocate sparse", lambda s: allocate(s, "sparse")),
+    ]
+
+    print(f"{len(timetable)} sessions, {enrolments} enrolments of {len(index)} students, "
+          f"{args.rooms} rooms")
+    print(f"{'stage':<24}{'strings (s)':>13}{'ids (s)':>10}{'speedup':>9}")
+    print(f"{'intern rolls':<24}{'':>13}{intern_time:>10.3f}")
+    for label, stage in stages:
+        t_str, r_str = best_of(args.repeat, lambda: stage(as_strings))
+        t_ids, r_ids = best_of(args.repeat, lambda: stage(as_ids))
+        assert r_str == r_ids, label
+        print(f"{label:<24}{t_str:>13.3f}{t_ids:>10.3f}{t_str / t_ids:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
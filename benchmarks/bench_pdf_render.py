@@ -0,0 +1,93 @@
+"""
+Serial vs parallel rendering of per-room attendance PDFs, and the
+streaming canvas renderer vs the platypus Table one.
+
+Renders 100 rooms × 60 students (optionally with synthetic photos) once
+per renderer and worker count and reports wall time, then the traced
+peak memory of a serial run per renderer.
+
+    python -m benchmarks.bench_pdf_render --rooms 100 --students 60 --photos 600 --workers 1 4 8
+    python -m benchmarks.bench_pdf_render --rooms 2 --students 500 --photos 1000 --workers 1
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from PIL import Image
+
+from output.attendance_pdf import ATTENDANCE_RENDERERS, generate_attendance_pdfs
+
+
+def make_photos(folder, rolls, size=(600, 800)):
+    os.makedirs(folder, exist_ok=True)
+    for i, roll in enumerate(rolls):
+        shade = (37 * i) % 256
+        Image.new("RGB", size, (shade, 128, 255 - shade)).save(
+            os.path.join(folder, f"{roll}.jpg"), quality=90
+        )
+
+
+def make_room_map(rooms, students):
+    room_map = {}
+    for r in range(rooms):
+        room_map[f"R{r:03d}"] = [
+            (f"S{s % 4}", f"24{r:03d}X{s:03d}", f"R{s // 6 + 1}C{s % 6 + 1}")
+            for s in range(students)
+        ]
+    return room_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Attendance PDF rendering benchmark")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--students", type=int, default=60)
+    parser.add_argument("--photos", type=int, default=0,
+                        help="How many students get a photo (0 = none)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--renderers", nargs="+", choices=ATTENDANCE_RENDERERS,
+                        default=list(ATTENDANCE_RENDERERS))
+    args = parser.parse_args()
+
+    room_map = make_room_map(args.rooms, args.students)
+    rolls = [roll for entries in room_map.values() for _, roll, _ in entries]
+    names = {roll: f"Student {roll}" for roll in rolls}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        photos = os.path.join(tmp, "photos")
+        if args.photos:
+            make_photos(photos, rolls[:args.photos])
+
+        print(f"{args.rooms} rooms × {args.students} students, {args.photos} photos, "
+              f"{os.cpu_count()} CPUs")
+        print(f"{'renderer':<10}{'workers':>8}{'time (s)':>10}{'speedup':>9}")
+
+        baseline = None
+        for renderer in args.renderers:
+            for workers in args.workers:
+                out = os.path.join(tmp, f"out_{renderer}_{workers}")
+                start = time.perf_counter()
+                paths = generate_attendance_pdfs(out, room_map, names, photos, "2024-05-01",
+                                                 "morning", workers=workers, renderer=renderer)
+                elapsed = time.perf_counter() - start
+
+                assert [os.path.basename(p) for p in paths] == [f"attendance_{r}.pdf" for r in room_map]
+                baseline = baseline or elapsed
+                print(f"{renderer:<10}{workers:>8}{elapsed:>10.2f}{baseline / elapsed:>8.1f}x")
+
+        # Timed apart from the runs above, which tracing would slow down
+        print(f"{'renderer':<10}{'peak MiB':>10}")
+        for renderer in args.renderers:
+            out = os.path.join(tmp, f"mem_{renderer}")
+            tracemalloc.start()
+            generate_attendance_pdfs(out, room_map, names, photos, "2024-05-01", "morning",
+                                     renderer=renderer)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{renderer:<10}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+PDF size and render time with original photos vs cached thumbnails.
+
+Every student appears in several sessions, so the same photos are
+rendered repeatedly: the cold run pays for building thumbnails, later
+sessions reuse them.
+
+    python -m benchmarks.bench_photo_cache --rooms 10 --students 60 --sessions 3
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_pdf_render import make_photos, make_room_map
+from output.attendance_pdf import generate_attendance_pdfs
+from output.photo_cache import PhotoCache
+
+
+def _folder_size(paths):
+    return sum(os.path.getsize(p) for p in paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Photo thumbnail cache benchmark")
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--students", type=int, default=60)
+    parser.add_argument("--sessions", type=int, default=3,
+                        help="Sessions the same students sit")
+    parser.add_argument("--photo-size", type=int, nargs=2, default=[1200, 1600],
+                        metavar=("W", "H"), help="Pixel size of the original photos")
+    args = parser.parse_args()
+
+    room_map = make_room_map(args.rooms, args.students)
+    rolls = [roll for entries in room_map.values() for _, roll, _ in entries]
+    names = {roll: f"Student {roll}" for roll in rolls}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        photos = os.path.join(tmp, "photos")
+        make_photos(photos, rolls, size=tuple(args.photo_size))
+
+        print(f"{args.rooms} rooms × {args.students} students × {args.sessions} sessions, "
+              f"photos {args.photo_size[0]}×{args.photo_size[1]}")
+        print(f"{'variant':<14}{'session':>8}{'time (s)':>10}{'PDF MB':>9}")
+
+        variants = [
+            ("original", None),
+            ("thumbnails", PhotoCache(os.path.join(tmp, "thumbs"))),
+        ]
+        for name, cache in variants:
+            for n in range(args.sessions):
+                out = os.path.join(tmp, f"{name}_{n}")
+                start = time.perf_counter()
+                paths = generate_attendance_pdfs(out, room_map, names, photos, "2024-05-01",
+                                                 f"s{n}", photo_cache=cache)
+                elapsed = time.perf_counter() - start
+                print(f"{name:<14}{n + 1:>8}{elapsed:>10.2f}{_folder_size(paths) / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
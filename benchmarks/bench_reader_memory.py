@@ -0,0 +1,110 @@
+"""
+Peak memory of the pandas vs streaming workbook readers.
+
+Writes a synthetic workbook with a large in_course_roll_mapping sheet,
+then loads it once per mode in a fresh interpreter so each peak RSS is
+measured in isolation.
+
+    python -m benchmarks.bench_reader_memory --rows 200000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import openpyxl
+
+
+def write_workbook(path, rows, courses=400):
+    # A regular (not write-only) workbook, so strings are shared and the
+    # sheet dimensions are recorded, as in files saved by Excel.
+    book = openpyxl.Workbook()
+    book.remove(book.active)
+
+    tt = book.create_sheet("in_timetable")
+    tt.append(["Date", "Day", "Morning", "Evening"])
+    tt.append(["2024-01-01", "Monday", "; ".join(f"C{i:04d}" for i in range(10)), "NO EXAM"])
+
+    course_sheet = book.create_sheet("in_course_roll_mapping")
+    course_sheet.append(["rollno", "register_sem", "schedule_sem", "course_code"])
+    students = max(rows // 6, 1)
+    for i in range(rows):
+        course_sheet.append([f"{2000 + i % 9}XX{i % students:05d}", 4, 4, f"C{i % courses:04d}"])
+
+    names = book.create_sheet("in_roll_name_mapping")
+    names.append(["Roll", "Name"])
+    for i in range(students):
+        names.append([f"{2000 + i % 9}XX{i:05d}", f"Student {i}"])
+
+    rooms = book.create_sheet("in_room_capacity")
+    rooms.append(["Room No.", "Exam Capacity", "Block"])
+    for i in range(50):
+        rooms.append([6100 + i, 60, "B1"])
+
+    book.save(path)
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(path, mode):
+    from input.workbook_loader import load_workbook
+
+    before = _peak_rss_mb()
+    start = time.perf_counter()
+    workbook = load_workbook(path, mode=mode)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "mode": mode,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "import_rss_mb": round(before, 1),
+        "courses": len(workbook.course_rolls),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workbook reader memory benchmark")
+    parser.add_argument("--rows", type=int, default=200000,
+                        help="Rows in the synthetic in_course_roll_mapping sheet")
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    parser.add_argument("--write", metavar="PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+    if args.write:
+        write_workbook(args.write, args.rows)
+        return
+
+    # Every step runs in its own interpreter: Linux carries ru_maxrss
+    # across exec, so the parent must stay small for the numbers to hold.
+    module = [sys.executable, "-m", "benchmarks.bench_reader_memory"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.xlsx")
+        subprocess.run(module + ["--rows", str(args.rows), "--write", path], check=True)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"Synthetic workbook: {args.rows} enrolment rows, {size_mb:.1f} MB on disk")
+
+        print(f"{'mode':<12}{'load (s)':>10}{'peak RSS (MB)':>16}{'after import (MB)':>20}")
+        for mode in ("pandas", "streaming"):
+            out = subprocess.run(
+                module + ["--child", path, mode],
+                capture_output=True, text=True, check=True,
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{r['mode']:<12}{r['seconds']:>10.2f}{r['peak_rss_mb']:>16.1f}{r['import_rss_mb']:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Micro-benchmark: row-wise (iterrows) vs column-level input parsing.
+
+Builds synthetic in-memory sheets and times the legacy row-by-row
+parsers against the ones in input/, checking both produce identical
+results.
+
+    python -m benchmarks.bench_readers --rows 50000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from input.roll_reader import parse_roll_name_map
+from input.room_capacity_reader import parse_room_capacity
+from input.timetable_reader import parse_timetable
+
+
+# ---------------------------------------------------------------
+# LEGACY ROW-WISE PARSERS (reference for correctness + timing)
+# ---------------------------------------------------------------
+def legacy_roll_name_map(df):
+    df = df.rename(columns=lambda c: c.strip().lower())
+    return {
+        str(row["roll"]).strip(): str(row["name"]).strip()
+        for _, row in df.iterrows()
+    }
+
+
+def legacy_room_capacity(df):
+    room_capacity = {}
+    for _, row in df.iterrows():
+        room = str(row["Room No."]).strip().upper()
+        cap = row["Exam Capacity"]
+        try:
+            cap = int(cap)
+        except:
+            continue
+        if room:
+            room_capacity[room] = cap
+    return room_capacity
+
+
+def legacy_timetable(df):
+    df = df.rename(columns=lambda c: str(c).strip().lower())
+    timetable = []
+    for _, row in df.iterrows():
+        day = str(row["day"]).strip()
+        sessions = []
+        for session in ("morning", "evening"):
+            raw = str(row[session]).strip()
+            if raw.upper() != "NO EXAM":
+                sessions.append((session, [s.strip() for s in raw.split(";") if s.strip()]))
+            else:
+                sessions.append((session, []))
+        for session, subjects in sessions:
+            if subjects:
+                timetable.append((day, session, subjects))
+    return timetable
+
+
+# ---------------------------------------------------------------
+# SYNTHETIC SHEETS
+# ---------------------------------------------------------------
+def make_roll_name_sheet(rows, rng):
+    rolls = [f" {2000 + i % 9}{i:06d} " for i in range(rows)]
+    names = [f"Student {rng.randint(0, 10**6)}" for _ in range(rows)]
+    rolls[::997] = [np.nan] * len(rolls[::997])
+    return pd.DataFrame({"Roll": rolls, "Name": names})
+
+
+def make_room_sheet(rows, rng):
+    rooms = [f"b-{i:05d} " if i % 3 else 6000 + i for i in range(rows)]
+    caps = []
+    for i in range(rows):
+        pick = i % 10
+        if pick == 0:
+            caps.append(np.nan)            # merged cell
+        elif pick == 1:
+            caps.append(" 45 ")            # integer text
+        elif pick == 2:
+            caps.append("30.5")            # rejected by int()
+        elif pick == 3:
+            caps.append(72.9)              # truncated by int()
+        else:
+            caps.append(rng.randint(20, 120))
+    return pd.DataFrame({"Room No.": rooms, "Exam Capacity": caps})
+
+
+def make_timetable_sheet(rows, rng):
+    def cell(i):
+        if i % 7 == 0:
+            return "NO EXAM"
+        return "; ".join(f"CS{rng.randint(100, 999)}" for _ in range(rng.randint(1, 12))) + ";"
+
+    return pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=rows, freq="h"),
+        "Day": [f" Day{i} " for i in range(rows)],
+        "Morning": [cell(i) for i in range(rows)],
+        "Evening": [cell(i + 3) for i in range(rows)],
+    })
+
+
+def _time(fn, df, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Input reader micro-benchmark")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    cases = [
+        ("roll_name_map", make_roll_name_sheet, legacy_roll_name_map, parse_roll_name_map),
+        ("room_capacity", make_room_sheet, legacy_room_capacity, parse_room_capacity),
+        ("timetable", make_timetable_sheet, legacy_timetable, parse_timetable),
+    ]
+
+    print(f"{'parser':<16}{'rows':>8}{'iterrows (s)':>15}{'vectorized (s)':>17}{'speedup':>10}")
+    for name, make, legacy, current in cases:
+        df = make(args.rows, rng)
+        legacy_t, legacy_out = _time(legacy, df, args.repeat)
+        current_t, current_out = _time(current, df, args.repeat)
+
+        if legacy_out != current_out:
+            raise AssertionError(f"{name}: vectorized output differs from iterrows output")
+        if isinstance(legacy_out, dict) and list(legacy_out) != list(current_out):
+            raise AssertionError(f"{name}: key order differs from iterrows output")
+
+        print(f"{name:<16}{args.rows:>8}{legacy_t:>15.3f}{current_t:>17.3f}{legacy_t / current_t:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Room seating PDFs and student slips for one large session.
+
+Times the canvas renderers in output/ against a platypus Table version of
+the room PDF (the layout approach the attendance sheets use) on a
+synthetic session, 5,000 students by default.
+
+    python -m benchmarks.bench_room_pdf --rooms 100 --students 50 --photos 1000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from benchmarks.synthetic import make_photos
+from output.photo_index import PhotoIndex
+from output.room_pdf import generate_room_pdfs
+from output.student_pdf import generate_student_slips_pdf
+
+
+def make_room_map(rooms, students):
+    room_map = {}
+    for r in range(rooms):
+        room_map[f"R{r:03d}"] = [
+            (f"S{s % 4}", f"24{r:03d}X{s:03d}", f"R{s // 6 + 1}C{s % 6 + 1}")
+            for s in range(students)
+        ]
+    return room_map
+
+
+def platypus_room_pdfs(folder, room_map, roll_name_map, date, session):
+    # Reference: the same table built from platypus flowables
+    styles = getSampleStyleSheet()
+    for room, entries in room_map.items():
+        doc = SimpleDocTemplate(os.path.join(folder, f"table_{room}.pdf"), pagesize=A4,
+                                topMargin=15*mm, bottomMargin=15*mm,
+                                leftMargin=15*mm, rightMargin=15*mm)
+        data = [["S.No", "Seat", "Roll Number", "Student Name", "Subject"]]
+        for n, (subject, roll, seat) in enumerate(entries, start=1):
+            data.append([n, seat, roll, roll_name_map.get(roll, ""), subject])
+        table = Table(data, colWidths=[12*mm, 20*mm, 35*mm, 75*mm, 38*mm], repeatRows=1)
+        table.setStyle(TableStyle([
+            ("GRID", (0, 0), (-1, -1), 0.6, colors.grey),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ]))
+        doc.build([Paragraph(f"Seating Plan – Room {room}", styles["Heading2"]),
+                   Spacer(1, 12), table])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Room PDF and slip rendering benchmark")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--students", type=int, default=50, help="Students per room")
+    parser.add_argument("--photos", type=int, default=0,
+                        help="How many students get a photo (0 = none)")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    room_map = make_room_map(args.rooms, args.students)
+    rolls = [roll for entries in room_map.values() for _, roll, _ in entries]
+    names = {roll: f"Student {roll}" for roll in rolls}
+    date, session = "2024-04-01", "Morning"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        photos = os.path.join(tmp, "photos")
+        if args.photos:
+            make_photos(photos, rolls, args.photos)
+        index = PhotoIndex(photos)
+
+        print(f"{args.rooms} rooms × {args.students} students = {len(rolls)}, "
+              f"{args.photos} photos")
+        print(f"{'renderer':<28}{'time (s)':>10}{'students/s':>12}")
+
+        def report(label, func):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<28}{elapsed:>10.3f}{len(rolls) / elapsed:>12.0f}")
+
+        report("room PDFs, platypus Table",
+               lambda: platypus_room_pdfs(tmp, room_map, names, date, session))
+        report("room PDFs, canvas",
+               lambda: generate_room_pdfs(tmp, room_map, names, date, session,
+                                          workers=args.workers))
+        report("student slips, canvas 8-up",
+               lambda: generate_student_slips_pdf(tmp, room_map, names, date, session,
+                                                  photos, photo_index=index))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Session ZIP building: DEFLATE everything (the old builder) vs storing
+already-compressed members, and an update run with nothing changed.
+
+The synthetic session folder holds incompressible .pdf/.xlsx files (as
+real PDFs and xlsx workbooks are) plus a few text reports.
+
+    python -m benchmarks.bench_zip --rooms 40 --pdf-kb 400
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import zipfile
+
+from output.zip_builder import build_zip
+
+
+def make_session(folder, rooms, pdf_kb):
+    os.makedirs(folder, exist_ok=True)
+    for r in range(rooms):
+        for kind in ("room", "attendance"):
+            with open(os.path.join(folder, f"{kind}_R{r:03d}.pdf"), "wb") as fh:
+                fh.write(os.urandom(pdf_kb * 1024))
+    with open(os.path.join(folder, "overall.xlsx"), "wb") as fh:
+        fh.write(os.urandom(64 * 1024))
+    with open(os.path.join(folder, "students.csv"), "w") as fh:
+        for i in range(20000):
+            fh.write(f"Day01,morning,S{i % 40:03d},R{i % rooms:03d},R1C1,ROLL{i:06d},Student {i}\n")
+
+
+def deflate_all(folder):
+    # What build_zip used to do
+    zip_path = os.path.join(folder, "deflate_all.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name in sorted(os.listdir(folder)):
+            if not name.endswith(".zip"):
+                zf.write(os.path.join(folder, name), name)
+    return zip_path
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    path = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed:>8.2f} s{os.path.getsize(path) / 2**20:>9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ZIP builder benchmark")
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--pdf-kb", type=int, default=400, help="Size of each PDF")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_session(tmp, args.rooms, args.pdf_kb)
+
+        timed("deflate everything", lambda: deflate_all(tmp))
+        timed("store compressed", lambda: build_zip(tmp, "session"))
+        timed("update, no changes", lambda: build_zip(tmp, "session", update=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Stage-by-stage benchmark of the pipeline on a synthetic workbook.
+
+Generates an input with benchmarks.synthetic, then times each stage the
+pipeline runs, repeating each one and keeping the best and median time:
+
+    load_workbook       parse all four sheets (no cache)
+    timetable_read      TimetableReader(path).read()
+    read_subject_rolls  every subject of every session
+    check_clashes       every session
+    allocate            allocate_students_to_rooms, every session
+    export              export_all, every session; the Excel writers
+                        alone if output.exporter fails to import. The
+                        JSON's "export_mode" records which one ran.
+
+Results are written as JSON. Pass an earlier result with --compare to see
+each stage's change and flag regressions. Both commits must contain this
+suite; check the older one out in a separate worktree and run it there:
+
+    git worktree add ../bench_old <older commit>
+    (cd ../bench_old && python -m benchmarks.suite --preset institute --out bench_old.json)
+    python -m benchmarks.suite --preset institute --compare ../bench_old/bench_old.json
+    git worktree remove ../bench_old
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from allocation.allocator import allocate_students_to_rooms
+from allocation.clash_checker import check_clashes
+from benchmarks.synthetic import add_arguments, make_photos, make_workbook
+from input.roll_reader import read_subject_rolls
+from input.timetable_reader import TimetableReader
+from input.workbook_loader import load_workbook
+from output.excel_writer import write_seats_left, write_session_output
+
+try:
+    from output.exporter import export_all
+    HAS_EXPORTER = True
+except Exception:
+    HAS_EXPORTER = False
+
+
+# Bump whenever the JSON layout or a stage's meaning changes
+RESULTS_VERSION = 1
+
+# Workbook shapes; explicit options override the preset's values
+PRESETS = {
+    "small": dict(days=3, sessions=2, subjects=10, students=40, rooms=20, photos=0),
+    "institute": dict(days=10, sessions=2, subjects=30, students=80, rooms=60, photos=500),
+    "large": dict(days=15, sessions=2, subjects=60, students=120, rooms=150, photos=2000),
+}
+
+
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times), "runs": times}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def run_stages(path, photos_folder, output_folder, repeat):
+    workbook = load_workbook(path)
+    timetable = TimetableReader(workbook).read()
+    roll_name_map = workbook.roll_name_map
+    room_caps = workbook.room_capacity
+
+    sessions = [
+        (date, session, subjects,
+         {subj: read_subject_rolls(workbook, subj) for subj in subjects})
+        for date, session, subjects in timetable
+    ]
+    allocated = [
+        (date, session, allocate_students_to_rooms(subject_rolls, room_caps))
+        for date, session, _, subject_rolls in sessions
+    ]
+
+    def read_rolls():
+        for _, _, subjects, _ in sessions:
+            for subj in subjects:
+                read_subject_rolls(workbook, subj)
+
+    def clashes():
+        for _, _, subjects, subject_rolls in sessions:
+            check_clashes(subjects, subject_rolls)
+
+    def allocate():
+        for _, _, _, subject_rolls in sessions:
+            allocate_students_to_rooms(subject_rolls, room_caps)
+
+    def export():
+        shutil.rmtree(output_folder, ignore_errors=True)
+        for date, session, (allocations, seats_left) in allocated:
+            if HAS_EXPORTER:
+                export_all(output_folder, date, session, allocations, seats_left,
+                           roll_name_map, photos_folder)
+            else:
+                write_session_output(output_folder, date, session, allocations)
+                write_seats_left(output_folder, seats_left, date, session)
+
+    return {
+        "load_workbook": measure(lambda: load_workbook(path), repeat),
+        "timetable_read": measure(lambda: TimetableReader(path).read(), repeat),
+        "read_subject_rolls": measure(read_rolls, repeat),
+        "check_clashes": measure(clashes, repeat),
+        "allocate": measure(allocate, repeat),
+        "export": measure(export, repeat),
+    }
+
+
+def compare(results, baseline, threshold, min_delta):
+    """
+    Prints each stage's best time against the baseline's. Returns the
+    stages slower by more than threshold (a fraction) and by at least
+    min_delta seconds, so sub-millisecond jitter is not reported.
+    """
+    regressions = []
+    print(f"{'stage':<20}{'baseline s':>12}{'now s':>10}{'change':>9}")
+    for stage, entry in results["stages"].items():
+        old = baseline["stages"].get(stage)
+        if old is None:
+            print(f"{stage:<20}{'-':>12}{entry['best']:>10.4f}")
+            continue
+        change = entry["best"] / old["best"] - 1 if old["best"] else 0.0
+        flag = ""
+        if change > threshold and entry["best"] - old["best"] >= min_delta:
+            flag = "  REGRESSION"
+            regressions.append(stage)
+        print(f"{stage:<20}{old['best']:>12.4f}{entry['best']:>10.4f}{change:>+9.1%}{flag}")
+    if baseline.get("params") != results["params"]:
+        print("Note: the baseline was run with different parameters.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline stage benchmarks")
+    parser.add_argument("--preset", choices=list(PRESETS), default="small")
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=None, help="Write results to this JSON file")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown flagged as a regression (default 0.10 = 10%%)")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="Smallest slowdown in seconds worth flagging (default 0.005)")
+    parser.set_defaults(**{name: None for name in PRESETS["small"]}, seed=1)
+    args = parser.parse_args()
+
+    params = dict(PRESETS[args.preset])
+    for name in params:
+        if getattr(args, name) is not None:
+            params[name] = getattr(args, name)
+    params["seed"] = args.seed
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_input.xlsx")
+        photos_folder = os.path.join(tmp, "photos")
+        stats = make_workbook(path, params["days"], params["sessions"], params["subjects"],
+                              params["students"], params["rooms"], params["seed"])
+        if params["photos"]:
+            make_photos(photos_folder, stats["rolls"], params["photos"])
+
+        print(f"{stats['sessions']} sessions, {stats['subjects']} subjects, "
+              f"{stats['students']} students, {stats['enrolments']} enrolments, "
+              f"{stats['rooms']} rooms, {params['photos']} photos")
+
+        stages = run_stages(path, photos_folder, os.path.join(tmp, "output"), args.repeat)
+
+    results = {
+        "version": RESULTS_VERSION,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": params,
+        "export_mode": "export_all" if HAS_EXPORTER else "excel_only",
+        "repeat": args.repeat,
+        "stages": stages,
+    }
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+    else:
+        regressions = []
+        print(f"{'stage':<20}{'best s':>10}{'median s':>10}")
+        for stage, entry in stages.items():
+            print(f"{stage:<20}{entry['best']:>10.4f}{entry['median']:>10.4f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"Results written to {args.out}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Synthetic input workbooks at institute scale.
+
+Writes all four sheets the pipeline reads (in_timetable,
+in_course_roll_mapping, in_roll_name_mapping, in_room_capacity) and,
+optionally, a folder of small JPEG photos. The same parameters and seed
+always give the same files, so benchmark results stay comparable across
+commits.
+
+    python -m benchmarks.synthetic --days 10 --subjects 30 --students 80 \\
+        --rooms 60 --photos 2000 --out bench_input.xlsx --photos-folder bench_photos
+
+Subjects sitting in the same session never share a student, so no session
+is skipped for clashing; students do sit consecutive sessions, so the
+whole-timetable clash scan has back-to-back findings to report.
+"""
+
+import argparse
+import datetime
+import math
+import os
+import random
+
+import openpyxl
+
+
+def make_workbook(path, days=5, sessions=2, subjects=20, students=60, rooms=40, seed=1):
+    """
+    Writes the workbook to path.
+
+    days × sessions (1 or 2 a day) exam sessions, each with `subjects`
+    subjects of `students` students, seated in `rooms` rooms whose total
+    capacity is about 1.3 times the largest session.
+
+    RETURNS { "sessions", "subjects", "students", "enrolments", "rooms",
+              "rolls" } where rolls lists every student's roll.
+    """
+    if sessions not in (1, 2):
+        raise ValueError("sessions must be 1 or 2 (Morning, Evening)")
+
+    rng = random.Random(seed)
+    per_session = subjects * students
+    # Twice a session's head count, so every student sits several exams
+    rolls = [f"{2000 + i % 9}X{i:06d}" for i in range(per_session * 2)]
+
+    book = openpyxl.Workbook(write_only=True)
+
+    # ---------------- TIMETABLE ----------------
+    timetable = book.create_sheet("in_timetable")
+    timetable.append(["Date", "Day", "Morning", "Evening"])
+    slots = []
+    first = datetime.date(2024, 4, 1)
+    for d in range(days):
+        date = first + datetime.timedelta(days=d)
+        cells = []
+        for s in range(2):
+            if s < sessions:
+                codes = [f"D{d:02d}S{s}C{c:03d}" for c in range(subjects)]
+                slots.append(codes)
+                cells.append("; ".join(codes))
+            else:
+                cells.append("NO EXAM")
+        timetable.append([date, date.strftime("%A"), *cells])
+
+    # ---------------- COURSE ROLLS ----------------
+    course_sheet = book.create_sheet("in_course_roll_mapping")
+    course_sheet.append(["rollno", "register_sem", "schedule_sem", "course_code"])
+    enrolments = 0
+    for codes in slots:
+        # Disjoint blocks of one shuffle: no clash inside a session
+        sitting = rng.sample(rolls, per_session)
+        for c, code in enumerate(codes):
+            for roll in sorted(sitting[c * students:(c + 1) * students]):
+                course_sheet.append([roll, 4, 4, code])
+                enrolments += 1
+
+    # ---------------- NAMES ----------------
+    names = book.create_sheet("in_roll_name_mapping")
+    names.append(["Roll", "Name"])
+    for roll in rolls:
+        names.append([roll, f"Student {roll[-6:]}"])
+
+    # ---------------- ROOMS ----------------
+    room_sheet = book.create_sheet("in_room_capacity")
+    room_sheet.append(["Room No.", "Exam Capacity", "Block"])
+    average = math.ceil(per_session * 1.3 / rooms)
+    for r in range(rooms):
+        cap = max(1, round(average * rng.uniform(0.6, 1.4)))
+        room_sheet.append([f"{6001 + r}", cap, f"B{1 + r % 4}"])
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    book.save(path)
+
+    return {
+        "sessions": len(slots),
+        "subjects": len(slots) * subjects,
+        "students": len(rolls),
+        "enrolments": enrolments,
+        "rooms": rooms,
+        "rolls": rolls,
+    }
+
+
+def make_photos(folder, rolls, count, size=(120, 160)):
+    """
+    Writes one small JPEG for each of the first `count` rolls.
+    """
+    from PIL import Image
+
+    os.makedirs(folder, exist_ok=True)
+    image = Image.new("RGB", size, (180, 190, 200))
+    for roll in rolls[:count]:
+        image.save(os.path.join(folder, f"{roll}.jpg"), quality=80)
+    return min(count, len(rolls))
+
+
+def add_arguments(parser):
+    """
+    The workbook shape options, shared with the benchmark suite.
+    """
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--sessions", type=int, default=2, choices=[1, 2],
+                        help="Sessions per day")
+    parser.add_argument("--subjects", type=int, default=20, help="Subjects per session")
+    parser.add_argument("--students", type=int, default=60, help="Students per subject")
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--photos", type=int, default=0, help="Students with a photo")
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic input workbook")
+    add_arguments(parser)
+    parser.add_argument("--out", default="bench_input.xlsx")
+    parser.add_argument("--photos-folder", default="bench_photos")
+    args = parser.parse_args()
+
+    stats = make_workbook(args.out, args.days, args.sessions, args.subjects, args.students,
+                          args.rooms, args.seed)
+    print(f"{args.out}: {stats['sessions']} sessions, {stats['subjects']} subjects, "
+          f"{stats['students']} students, {stats['enrolments']} enrolments, "
+          f"{stats['rooms']} rooms")
+
+    if args.photos:
+        written = make_photos(args.photos_folder, stats["rolls"], args.photos)
+        print(f"{args.photos_folder}: {written} photos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import pickle
+
+from input.workbook import WorkbookData
+
+
+# Bump whenever the normalized structures in WorkbookData change shape,
+# so stale cache entries are never handed to a newer pipeline.
+CACHE_VERSION = 4
+
+DEFAULT_CACHE_DIR = ".seating_cache"
+
+
+def workbook_hash(filepath, sheet_names, chunk_size=1 << 20):
+    """
+    Content hash of the workbook plus the sheet names it is parsed with.
+    filepath may also be the workbook's bytes.
+    """
+    h = hashlib.sha256()
+    h.update(f"v{CACHE_VERSION}".encode())
+    for name in sheet_names:
+        h.update(b"\0" + name.encode())
+
+    if isinstance(filepath, (bytes, bytearray)):
+        h.update(filepath)
+        return h.hexdigest()
+
+    with open(filepath, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            h.update(chunk)
+
+    return h.hexdigest()
+
+
+class InputCache:
+    """
+    Pickle files of parsed workbooks under cache_dir, one per content hash.
+
+    A hit skips openpyxl entirely; a corrupt or unreadable entry is treated
+    as a miss and rewritten on the next store.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, logger=None):
+        self.cache_dir = cache_dir
+        self.logger = logger
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def load(self, key, filepath):
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as fh:
+                payload = pickle.load(fh)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Ignoring unreadable input cache {path}: {e}")
+            return None
+
+        if self.logger:
+            self.logger.info(f"Input cache hit: {path}")
+
+        return WorkbookData(
+            filepath=filepath,
+            timetable=payload["timetable"],
+            course_rolls=payload["course_rolls"],
+            roll_name_map=payload["roll_name_map"],
+            room_capacity=payload["room_capacity"],
+            room_layouts=payload["room_layouts"],
+            roll_index=payload["roll_index"],
+        )
+
+    def store(self, key, workbook):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        payload = {
+            "timetable": workbook.timetable,
+            "course_rolls": workbook.course_rolls,
+            "roll_name_map": workbook.roll_name_map,
+            "room_capacity": workbook.room_capacity,
+            "room_layouts": workbook.room_layouts,
+            "roll_index": workbook.roll_index,
+        }
+
+        # Write to a temp file first so a crash never leaves half an entry
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        if self.logger:
+            self.logger.info(f"Input cache written: {path}")
+
+        return path
@@ -0,0 +1,77 @@
+"""
+Every roll number of the workbook interned once as a dense integer id.
+
+Ids follow the sorted order of the roll strings, so each course's sorted
+roll list becomes a sorted id array and comparing ids compares rolls.
+The clash and allocation kernels (allocation/kernels.py) work on these
+arrays; roll strings are looked up again only when outputs are written.
+"""
+
+import numpy as np
+
+
+# Shared by every course without rolls
+_NO_IDS = np.zeros(0, dtype=np.int32)
+_NO_IDS.flags.writeable = False
+
+
+class RollIndex:
+    """
+    rolls[id] is the roll string of id; course(code) the sorted ids of a
+    course's rolls, as a read-only view of one array holding them all.
+    """
+
+    def __init__(self, course_rolls):
+        self.course_rolls = course_rolls
+
+        codes = list(course_rolls)
+        flat = np.array([roll for code in codes for roll in course_rolls[code]], dtype=str)
+        rolls, inverse = np.unique(flat, return_inverse=True)
+
+        self.rolls = tuple(rolls.tolist())
+        self._ids = None
+
+        ids = inverse.astype(np.int32)
+        ids.flags.writeable = False
+        ends = np.cumsum([len(course_rolls[code]) for code in codes], dtype=np.int64)
+        self._courses = {
+            code: ids[end - len(course_rolls[code]):end]
+            for code, end in zip(codes, ends.tolist())
+        }
+
+    def __len__(self):
+        return len(self.rolls)
+
+    def course(self, code):
+        return self._courses.get(code, _NO_IDS)
+
+    def encode(self, rolls):
+        """
+        Ids of known rolls; KeyError for a roll the workbook never lists.
+        """
+        if self._ids is None:
+            self._ids = {roll: i for i, roll in enumerate(self.rolls)}
+        return np.array([self._ids[roll] for roll in rolls], dtype=np.int32)
+
+    def decode(self, ids):
+        rolls = self.rolls
+        return [rolls[i] for i in np.asarray(ids).tolist()]
+
+    def session(self, subjects):
+        """
+        SubjectRolls of one session's subjects.
+        """
+        rolls = SubjectRolls({code: list(self.course_rolls.get(code, [])) for code in subjects})
+        rolls.index = self
+        rolls.ids = {code: self.course(code) for code in subjects}
+        return rolls
+
+
+class SubjectRolls(dict):
+    """
+    { subject: [rolls] } of one session, as read_subject_rolls returns
+    them, with each subject's roll ids alongside: ids[subject] is a sorted
+    id array of index, the session's RollIndex.
+    """
+
+    __slots__ = ("index", "ids")
@@ -1,8 +1,146 @@
+import openpyxl
 import pandas as pd
 
+from input.workbook import WorkbookData
+
+
+READER_MODES = ("pandas", "streaming")
+
+
+def _cell_text(value):
+    """
+    A cell as text, the same from either reader: blanks become "nan" and
+    whole-number floats lose their ".0" (pandas reads a numeric column
+    with a blank as floats, openpyxl reads the same cells as ints).
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return "nan"
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _sheet_rows(df):
+    # Rows with any cell filled, as the streaming reader keeps them
+    return df.dropna(how="all")
+
+
+def parse_course_rolls(df):
+    """
+    Builds the course_code -> sorted rolls index from the
+    in_course_roll_mapping sheet (columns: rollno, course_code).
+    """
+    # Normalize column names
+    df = _sheet_rows(df).rename(columns=lambda c: c.strip().lower())
+
+    if "rollno" not in df.columns or "course_code" not in df.columns:
+        raise KeyError("❌ Expected columns: rollno, course_code in sheet in_course_roll_mapping")
+
+    pairs = pd.DataFrame({
+        "course_code": df["course_code"].map(_cell_text),
+        "rollno": df["rollno"].map(_cell_text),
+    })
+
+    # One sort over the whole sheet, then split per course in order
+    pairs = pairs.sort_values("rollno", kind="stable")
+    grouped = pairs.groupby("course_code", sort=False)["rollno"].agg(list)
+
+    return grouped.to_dict()
+
+
+def parse_roll_name_map(df):
+    """
+    Builds roll number → student name from the in_roll_name_mapping sheet
+    (columns: Roll, Name).
+    """
+    df = _sheet_rows(df).rename(columns=lambda c: c.strip().lower())
+
+    if "roll" not in df.columns or "name" not in df.columns:
+        raise KeyError("❌ Expected columns: Roll, Name in sheet in_roll_name_mapping")
+
+    rolls = df["roll"].map(_cell_text)
+    names = df["name"].map(_cell_text)
+
+    # Later rows win on duplicate rolls, as with a row-by-row dict build
+    roll_name_map = dict(zip(rolls.tolist(), names.tolist()))
+
+    return roll_name_map
+
+
+def _stream_columns(filepath, sheet_name, columns, error):
+    """
+    Yields the requested columns of a sheet one row at a time, using
+    openpyxl's read-only mode so the sheet is never held in memory.
+    Header matching is case/whitespace insensitive; blank rows are skipped.
+    """
+    book = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        sheet = book[sheet_name]
+        # Ignore the stored <dimension>: some writers omit it, which makes
+        # openpyxl pre-scan the whole sheet just to find max_row.
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+
+        header = [str(c).strip().lower() if c is not None else "" for c in next(rows, ())]
+        if any(col not in header for col in columns):
+            raise KeyError(error)
+        positions = [header.index(col) for col in columns]
+
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue
+            yield tuple(
+                _cell_text(row[i] if i < len(row) else None)
+                for i in positions
+            )
+    finally:
+        book.close()
+
+
+def stream_course_rolls(filepath):
+    """
+    Streaming counterpart of parse_course_rolls: builds the
+    course_code -> sorted rolls index row by row, with memory bounded by
+    the index itself rather than by the whole sheet.
+    """
+    course_rolls = {}
+    rows = _stream_columns(
+        filepath, "in_course_roll_mapping", ["rollno", "course_code"],
+        "❌ Expected columns: rollno, course_code in sheet in_course_roll_mapping",
+    )
+    for roll, code in rows:
+        course_rolls.setdefault(code, []).append(roll)
+
+    for rolls in course_rolls.values():
+        rolls.sort()
+
+    return course_rolls
+
+
+def stream_roll_name_map(filepath):
+    """
+    Streaming counterpart of parse_roll_name_map.
+    """
+    rows = _stream_columns(
+        filepath, "in_roll_name_mapping", ["roll", "name"],
+        "❌ Expected columns: Roll, Name in sheet in_roll_name_mapping",
+    )
+    return dict(rows)
+
+
 class RollReader:
-    def __init__(self, filepath):
-        self.filepath = filepath
+    def __init__(self, filepath, mode="pandas"):
+        # filepath may also be an already loaded WorkbookData
+        if isinstance(filepath, WorkbookData):
+            self.workbook = filepath
+            self.filepath = filepath.filepath
+        else:
+            self.workbook = None
+            self.filepath = filepath
+
+        if mode not in READER_MODES:
+            raise ValueError(f"Invalid reader mode: {mode}")
+        self.mode = mode
 
     def read_subject_rolls(self, subject_code):
         """
@@ -10,20 +148,16 @@ class RollReader:
         Excel sheet: in_course_roll_mapping
         Columns: rollno, course_code
         """
-        df = pd.read_excel(self.filepath, sheet_name="in_course_roll_mapping")
-
-        # Normalize column names
-        df.columns = [c.strip().lower() for c in df.columns]
-
-        if "rollno" not in df.columns or "course_code" not in df.columns:
-            raise KeyError("❌ Expected columns: rollno, course_code in sheet in_course_roll_mapping")
+        if self.workbook is not None:
+            course_rolls = self.workbook.course_rolls
+        elif self.mode == "streaming":
+            course_rolls = stream_course_rolls(self.filepath)
+        else:
+            df = pd.read_excel(self.filepath, sheet_name="in_course_roll_mapping")
+            course_rolls = parse_course_rolls(df)
 
-        df_filtered = df[df["course_code"].astype(str).str.strip() == subject_code]
-
-        # Convert to clean roll list
-        rolls = sorted(df_filtered["rollno"].astype(str).str.strip().tolist())
-
-        return rolls
+        # Copy so callers never mutate the shared index
+        return list(course_rolls.get(subject_code, []))
 
     def read_roll_name_map(self):
         """
@@ -31,26 +165,21 @@ class RollReader:
         Excel sheet: in_roll_name_mapping
         Columns: Roll, Name
         """
-        df = pd.read_excel(self.filepath, sheet_name="in_roll_name_mapping")
+        if self.workbook is not None:
+            return dict(self.workbook.roll_name_map)
 
-        df.columns = [c.strip().lower() for c in df.columns]
+        if self.mode == "streaming":
+            return stream_roll_name_map(self.filepath)
 
-        if "roll" not in df.columns or "name" not in df.columns:
-            raise KeyError("❌ Expected columns: Roll, Name in sheet in_roll_name_mapping")
-
-        roll_name_map = {
-            str(row["roll"]).strip(): str(row["name"]).strip()
-            for _, row in df.iterrows()
-        }
-
-        return roll_name_map
+        df = pd.read_excel(self.filepath, sheet_name="in_roll_name_mapping")
+        return parse_roll_name_map(df)
 
 
-def read_subject_rolls(filepath, subject_code):
-    reader = RollReader(filepath)
+def read_subject_rolls(filepath, subject_code, mode="pandas"):
+    reader = RollReader(filepath, mode)
     return reader.read_subject_rolls(subject_code)
 
 
-def read_roll_name_map(filepath):
-    reader = RollReader(filepath)
+def read_roll_name_map(filepath, mode="pandas"):
+    reader = RollReader(filepath, mode)
     return reader.read_roll_name_map()
@@ -1,42 +1,108 @@
+import numpy as np
 import pandas as pd
 
+from input.workbook import WorkbookData
+
+
+def parse_room_capacity(df):
+    """
+    Builds room -> exam capacity from the in_room_capacity sheet
+    (columns: Room No., Exam Capacity).
+    """
+    required_cols = ["Room No.", "Exam Capacity"]
+
+    for col in required_cols:
+        if col not in df.columns:
+            raise KeyError(
+                f"Column '{col}' missing in room capacity sheet. "
+                f"Found columns: {list(df.columns)}"
+            )
+
+    rooms = df["Room No."].map(str).str.strip().str.upper()
+    caps = df["Exam Capacity"]
+
+    # int(cap) semantics: numbers truncate, text must be an integer literal,
+    # anything else (merged cells, NaN, "30.5", "N/A") is skipped
+    numeric = pd.to_numeric(caps, errors="coerce").astype("float64")
+    if not pd.api.types.is_numeric_dtype(caps):
+        text = caps[caps.map(lambda v: isinstance(v, str))].str.strip()
+        text = text.where(text.str.fullmatch(r"[+-]?\d+").astype(bool))
+        numeric.loc[text.index] = pd.to_numeric(text, errors="coerce")
+
+    valid = np.isfinite(numeric) & (rooms != "")
+
+    room_capacity = dict(zip(
+        rooms[valid].tolist(),
+        numeric[valid].astype("int64").tolist(),
+    ))
+
+    return room_capacity
+
+
+def parse_room_layouts(df):
+    """
+    Optional seat grid per room from "Rows" and "Columns" (or "Cols")
+    columns of the in_room_capacity sheet: { room: (rows, columns) }.
+    Rooms without valid positive values are left out.
+    """
+    lookup = {str(c).strip().lower(): c for c in df.columns}
+    rows_col = lookup.get("rows")
+    cols_col = lookup.get("columns", lookup.get("cols"))
+
+    if rows_col is None or cols_col is None or "Room No." not in df.columns:
+        return {}
+
+    rooms = df["Room No."].map(str).str.strip().str.upper()
+    rows = pd.to_numeric(df[rows_col], errors="coerce")
+    cols = pd.to_numeric(df[cols_col], errors="coerce")
+
+    valid = (rows >= 1) & (cols >= 1) & (rooms != "")
+
+    return dict(zip(
+        rooms[valid].tolist(),
+        zip(rows[valid].astype("int64").tolist(), cols[valid].astype("int64").tolist()),
+    ))
+
+
 class RoomCapacityReader:
     def __init__(self, filepath, logger=None):
-        self.filepath = filepath
+        # filepath may also be an already loaded WorkbookData
+        if isinstance(filepath, WorkbookData):
+            self.workbook = filepath
+            self.filepath = filepath.filepath
+        else:
+            self.workbook = None
+            self.filepath = filepath
         self.logger = logger
 
     def read_room_capacity(self):
+        if self.workbook is not None:
+            return dict(self.workbook.room_capacity)
+
         try:
             df = pd.read_excel(self.filepath, sheet_name="in_room_capacity")
         except Exception as e:
             raise Exception(f"Error reading sheet 'in_room_capacity': {str(e)}")
 
-        required_cols = ["Room No.", "Exam Capacity"]
-
-        for col in required_cols:
-            if col not in df.columns:
-                raise KeyError(
-                    f"Column '{col}' missing in room capacity sheet. "
-                    f"Found columns: {list(df.columns)}"
-                )
+        return parse_room_capacity(df)
 
-        room_capacity = {}
+    def read_room_layouts(self):
+        if self.workbook is not None:
+            return dict(self.workbook.room_layouts)
 
-        for _, row in df.iterrows():
-            room = str(row["Room No."]).strip().upper()
-            cap = row["Exam Capacity"]
-
-            try:
-                cap = int(cap)
-            except:
-                continue  # skip merged cells or invalid values
-
-            if room:
-                room_capacity[room] = cap
+        try:
+            df = pd.read_excel(self.filepath, sheet_name="in_room_capacity")
+        except Exception as e:
+            raise Exception(f"Error reading sheet 'in_room_capacity': {str(e)}")
 
-        return room_capacity
+        return parse_room_layouts(df)
 
 
 def read_room_capacity(filepath, logger=None):
     reader = RoomCapacityReader(filepath, logger)
     return reader.read_room_capacity()
+
+
+def read_room_layouts(filepath, logger=None):
+    reader = RoomCapacityReader(filepath, logger)
+    return reader.read_room_layouts()
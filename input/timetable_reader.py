@@ -1,9 +1,73 @@
+import numpy as np
 import pandas as pd
 
+from input.workbook import WorkbookData
+
+
+def parse_timetable(df):
+    """
+    Parses the in_timetable sheet.
+    Expected columns:
+        Day | Morning | Evening
+    Returns:
+        list of (day, session, [subjects])
+    """
+    # Normalize column names
+    df = df.rename(columns=lambda c: str(c).strip().lower())
+
+    # Ensure required columns exist
+    required = ["day", "morning", "evening"]
+    for col in required:
+        if col not in df.columns:
+            raise KeyError(f"Missing required column: {col}")
+
+    days = df["day"].map(str).str.strip().tolist()
+    morning = _session_subjects(df["morning"])
+    evening = _session_subjects(df["evening"])
+
+    timetable = []
+
+    for i, day in enumerate(days):
+        # Add only if subjects exist
+        if morning[i]:
+            timetable.append((day, "morning", morning[i]))
+        if evening[i]:
+            timetable.append((day, "evening", evening[i]))
+
+    return timetable
+
+
+def _session_subjects(column):
+    """
+    Splits one session column into a list of subjects per row.
+    "NO EXAM" cells and empty entries between semicolons yield nothing.
+    """
+    raw = column.map(str).str.strip()
+    raw = raw[raw.str.upper() != "NO EXAM"]
+
+    subjects = raw.str.split(";").explode().str.strip()
+    subjects = subjects[subjects != ""]
+
+    # explode keeps rows contiguous, so each row is one run of equal labels
+    labels = subjects.index.to_numpy()
+    values = subjects.tolist()
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]]) if len(labels) else []
+    ends = list(starts[1:]) + [len(values)]
+
+    per_row = {labels[a]: values[a:b] for a, b in zip(starts, ends)}
+
+    return [per_row.get(i, []) for i in column.index]
+
 
 class TimetableReader:
     def __init__(self, filepath):
-        self.filepath = filepath
+        # filepath may also be an already loaded WorkbookData
+        if isinstance(filepath, WorkbookData):
+            self.workbook = filepath
+            self.filepath = filepath.filepath
+        else:
+            self.workbook = None
+            self.filepath = filepath
 
     def read(self):
         """
@@ -13,45 +77,11 @@ class TimetableReader:
         Returns:
             list of (day, session, [subjects])
         """
-        df = pd.read_excel(self.filepath, sheet_name="in_timetable")
+        if self.workbook is not None:
+            return [
+                (day, session, list(subjects))
+                for day, session, subjects in self.workbook.timetable
+            ]
 
-        # Normalize column names
-        df.columns = [str(c).strip().lower() for c in df.columns]
-
-        # Ensure required columns exist
-        required = ["day", "morning", "evening"]
-        for col in required:
-            if col not in df.columns:
-                raise KeyError(f"Missing required column: {col}")
-
-        timetable = []
-
-        for _, row in df.iterrows():
-
-            day = str(row["day"]).strip()
-
-            # ---------- MORNING ----------
-            morning_raw = str(row["morning"]).strip()
-            if morning_raw.upper() != "NO EXAM":
-                morning_subjects = [
-                    s.strip() for s in morning_raw.split(";") if s.strip()
-                ]
-            else:
-                morning_subjects = []
-
-            # ---------- EVENING ----------
-            evening_raw = str(row["evening"]).strip()
-            if evening_raw.upper() != "NO EXAM":
-                evening_subjects = [
-                    s.strip() for s in evening_raw.split(";") if s.strip()
-                ]
-            else:
-                evening_subjects = []
-
-            # Add only if subjects exist
-            if morning_subjects:
-                timetable.append((day, "morning", morning_subjects))
-            if evening_subjects:
-                timetable.append((day, "evening", evening_subjects))
-
-        return timetable
+        df = pd.read_excel(self.filepath, sheet_name="in_timetable")
+        return parse_timetable(df)
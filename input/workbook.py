@@ -0,0 +1,30 @@
+from input.roll_index import RollIndex
+
+
+class WorkbookData:
+    """
+    Parsed contents of the input workbook, loaded once per run.
+
+    Holds the normalized form of every sheet the pipeline uses:
+        timetable      -> [(day, session, [subjects])]
+        course_rolls   -> { course_code: [sorted rolls] }
+        roll_name_map  -> { roll: name }
+        room_capacity  -> { room: capacity }
+        room_layouts   -> { room: (rows, columns) }  (optional seat grids)
+
+    plus roll_index, a RollIndex interning every roll of course_rolls,
+    built here unless the input cache already holds one.
+
+    The readers in input/ accept an instance of this class in place of a
+    file path and answer from it without touching the disk again.
+    """
+
+    def __init__(self, filepath, timetable, course_rolls, roll_name_map, room_capacity,
+                 room_layouts=None, roll_index=None):
+        self.filepath = filepath
+        self.timetable = timetable
+        self.course_rolls = course_rolls
+        self.roll_name_map = roll_name_map
+        self.room_capacity = room_capacity
+        self.room_layouts = room_layouts or {}
+        self.roll_index = roll_index if roll_index is not None else RollIndex(course_rolls)
@@ -0,0 +1,129 @@
+import io
+
+import pandas as pd
+
+from input.workbook import WorkbookData
+from input.input_cache import InputCache, workbook_hash
+from input.timetable_reader import parse_timetable
+from input.roll_reader import (
+    READER_MODES,
+    parse_course_rolls,
+    parse_roll_name_map,
+    stream_course_rolls,
+    stream_roll_name_map,
+)
+from input.room_capacity_reader import parse_room_capacity, parse_room_layouts
+
+
+TIMETABLE_SHEET = "in_timetable"
+COURSE_ROLL_SHEET = "in_course_roll_mapping"
+ROLL_NAME_SHEET = "in_roll_name_mapping"
+ROOM_CAPACITY_SHEET = "in_room_capacity"
+
+SHEET_NAMES = [TIMETABLE_SHEET, COURSE_ROLL_SHEET, ROLL_NAME_SHEET, ROOM_CAPACITY_SHEET]
+
+
+# Stands in for the path of a workbook handed over in memory
+IN_MEMORY_NAME = "<upload>"
+
+
+class WorkbookLoader:
+    def __init__(self, filepath, logger=None, cache_dir=None, mode="pandas"):
+        if mode not in READER_MODES:
+            raise ValueError(f"Invalid reader mode: {mode}")
+
+        # filepath may also be the workbook's bytes or a binary file
+        # object (e.g. an upload), which is read into memory once
+        self.data = None
+        if isinstance(filepath, (bytes, bytearray)):
+            self.data = bytes(filepath)
+            filepath = IN_MEMORY_NAME
+        elif hasattr(filepath, "read"):
+            self.data = filepath.read()
+            filepath = getattr(filepath, "name", None) or IN_MEMORY_NAME
+
+        self.filepath = filepath
+        self.logger = logger
+        self.cache_dir = cache_dir
+        self.mode = mode
+
+    def load(self):
+        """
+        Returns the parsed workbook, from the on-disk cache when cache_dir
+        is set and holds an entry for this exact file content.
+        """
+        if not self.cache_dir:
+            return self.parse()
+
+        # Both reader modes parse to the same data, so one entry serves either
+        cache = InputCache(self.cache_dir, self.logger)
+        key = workbook_hash(self.data if self.data is not None else self.filepath, SHEET_NAMES)
+
+        workbook = cache.load(key, self.filepath)
+        if workbook is None:
+            workbook = self.parse()
+            try:
+                cache.store(key, workbook)
+            except OSError as e:
+                if self.logger:
+                    self.logger.warning(f"Could not write input cache: {e}")
+
+        return workbook
+
+    def parse(self):
+        """
+        Opens the input workbook once and parses every sheet the
+        pipeline needs into a WorkbookData.
+        """
+        if self.mode == "streaming":
+            # Large roll sheets are walked row by row; the two small
+            # sheets still go through pandas in a single open.
+            course_rolls = stream_course_rolls(self._source())
+            roll_name_map = stream_roll_name_map(self._source())
+
+            with pd.ExcelFile(self._source()) as xls:
+                timetable = parse_timetable(xls.parse(TIMETABLE_SHEET))
+                room_df = self._room_sheet(xls)
+        else:
+            with pd.ExcelFile(self._source()) as xls:
+                timetable = parse_timetable(xls.parse(TIMETABLE_SHEET))
+                course_rolls = parse_course_rolls(xls.parse(COURSE_ROLL_SHEET))
+                roll_name_map = parse_roll_name_map(xls.parse(ROLL_NAME_SHEET))
+                room_df = self._room_sheet(xls)
+
+        room_capacity = parse_room_capacity(room_df)
+        room_layouts = parse_room_layouts(room_df)
+
+        if self.logger:
+            self.logger.info(
+                f"Loaded workbook: {len(timetable)} sessions, "
+                f"{len(course_rolls)} courses, {len(roll_name_map)} students, "
+                f"{len(room_capacity)} rooms"
+            )
+
+        return WorkbookData(
+            filepath=self.filepath,
+            timetable=timetable,
+            course_rolls=course_rolls,
+            roll_name_map=roll_name_map,
+            room_capacity=room_capacity,
+            room_layouts=room_layouts,
+        )
+
+    def _source(self):
+        # A fresh buffer per open: every reader starts from byte 0
+        if self.data is not None:
+            return io.BytesIO(self.data)
+        return self.filepath
+
+    @staticmethod
+    def _room_sheet(xls):
+        try:
+            return xls.parse(ROOM_CAPACITY_SHEET)
+        except Exception as e:
+            raise Exception(f"Error reading sheet '{ROOM_CAPACITY_SHEET}': {str(e)}")
+
+
+def load_workbook(filepath, logger=None, cache_dir=None, mode="pandas"):
+    loader = WorkbookLoader(filepath, logger, cache_dir, mode)
+    return loader.load()
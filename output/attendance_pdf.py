@@ -1,4 +1,5 @@
 # output/attendance_pdf.py
+import math
 import os
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
@@ -6,6 +7,232 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 
+from output.parallel_render import render_documents
+from output.pdf_canvas import (
+    BOLD_FONT, FONT, GRID_GREY, HEADER_FILL, MARGIN, PAGE_HEIGHT, PAGE_WIDTH,
+    BinaryCanvas, draw_footer, fit_text,
+)
+from output.photo_index import PhotoIndex
+
+
+# "streaming" draws fixed-height rows page by page on a canvas; "table"
+# builds one platypus Table per room and lets platypus split it
+ATTENDANCE_RENDERERS = ("streaming", "table")
+
+# Photo | Seat | Roll Number | Student Name | Signature
+COLUMNS = [("Photo", 30 * mm), ("Seat", 18 * mm), ("Roll Number", 35 * mm),
+           ("Student Name", 55 * mm), ("Signature", 42 * mm)]
+
+PHOTO_WIDTH, PHOTO_HEIGHT = 25 * mm, 30 * mm
+ROW_HEIGHT = PHOTO_HEIGHT + 2 * mm
+HEADER_HEIGHT = 8 * mm
+TITLE_HEIGHT = 18 * mm
+FONT_SIZE = 10
+
+
+def _rows_per_page(first):
+    usable = PAGE_HEIGHT - 2 * MARGIN - HEADER_HEIGHT
+    if first:
+        usable -= TITLE_HEIGHT
+    return int(usable // ROW_HEIGHT)
+
+
+def _page_count(rows):
+    first = _rows_per_page(True)
+    if rows <= first:
+        return 1
+    return 1 + math.ceil((rows - first) / _rows_per_page(False))
+
+
+def _draw_header(c, top):
+    width = sum(w for _, w in COLUMNS)
+    c.setFillColorRGB(*HEADER_FILL)
+    c.rect(MARGIN, top - HEADER_HEIGHT, width, HEADER_HEIGHT, stroke=0, fill=1)
+    c.setFillColorRGB(0, 0, 0)
+
+    c.setFont(BOLD_FONT, FONT_SIZE)
+    x = MARGIN
+    for name, w in COLUMNS:
+        c.drawString(x + 1.5 * mm, top - HEADER_HEIGHT / 2 - FONT_SIZE / 3, name)
+        x += w
+
+
+def _draw_row(c, top, roll, seat, name, photo_path):
+    """
+    One fixed-height row with its top edge at y = top. The photo is read
+    from disk here, when its row is drawn, and nowhere else.
+    """
+    x = MARGIN
+    photo_w = COLUMNS[0][1]
+
+    drawn = False
+    if photo_path:
+        try:
+            c.drawImage(photo_path, x + (photo_w - PHOTO_WIDTH) / 2, top - ROW_HEIGHT + 1 * mm,
+                        PHOTO_WIDTH, PHOTO_HEIGHT)
+            drawn = True
+        except Exception:
+            pass
+
+    middle = top - ROW_HEIGHT / 2 - FONT_SIZE / 3
+    c.setFont(FONT, FONT_SIZE)
+    if not drawn:
+        c.drawString(x + 1.5 * mm, middle, "No Photo")
+    x += photo_w
+
+    for value, (_, w) in zip((seat, roll, name), COLUMNS[1:4]):
+        c.drawString(x + 1.5 * mm, middle, fit_text(value, FONT, FONT_SIZE, w - 3 * mm))
+        x += w
+
+
+def _draw_grid(c, top, rows):
+    c.setStrokeColorRGB(*GRID_GREY)
+    c.setLineWidth(0.6)
+
+    xs = [MARGIN]
+    for _, w in COLUMNS:
+        xs.append(xs[-1] + w)
+    ys = [top, top - HEADER_HEIGHT]
+    ys += [top - HEADER_HEIGHT - (i + 1) * ROW_HEIGHT for i in range(rows)]
+
+    c.grid(xs, ys)
+    c.setStrokeColorRGB(0, 0, 0)
+
+
+def render_attendance_pdf_streaming(
+    out_path: str,
+    room: str,
+    entries: list,
+    roll_name_map: dict,
+    photo_paths: dict,
+    date: str,
+    session: str,
+    photo_cache=None
+) -> str:
+    """
+    Same sheet as render_attendance_pdf, drawn on a canvas one page at a
+    time. Rows have a fixed height, so each page takes the next slice of
+    entries with no table to build or split, and each photo is opened
+    only while its row is drawn. Work per page stays the same however
+    large the room is.
+
+    reportlab keeps the finished pages in memory until save(), so the
+    file's own size (mostly the embedded JPEGs) is the floor; nothing
+    else grows with the room.
+    """
+    c = BinaryCanvas(out_path, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    c.setTitle(f"Attendance Sheet - Room {room} - {date} {session}")
+    draw_attendance_pages(c, room, entries, roll_name_map, photo_paths, date, session,
+                          photo_cache)
+    c.save()
+    return out_path
+
+
+def draw_attendance_pages(c, room, entries, roll_name_map, photo_paths, date, session,
+                          photo_cache=None):
+    """
+    Draws the room's attendance pages onto canvas c, ending each with
+    showPage(). Shared by the per-room files and the session booklet.
+    """
+
+    pages = _page_count(len(entries))
+    footer = f"Attendance - Room {room} - {date} - {session}"
+
+    index = 0
+    for page in range(1, pages + 1):
+        top = PAGE_HEIGHT - MARGIN
+
+        if page == 1:
+            c.setFont(BOLD_FONT, 14)
+            c.drawString(MARGIN, top - 14, f"Attendance Sheet – Room {room}")
+            c.drawString(MARGIN, top - 32, f"{date} — {session}")
+            top -= TITLE_HEIGHT
+
+        rows = _rows_per_page(page == 1)
+        _draw_header(c, top)
+
+        row_top = top - HEADER_HEIGHT
+        for subj, roll, seat in entries[index:index + rows]:
+            photo_path = photo_paths.get(roll)
+            if photo_path and photo_cache is not None:
+                photo_path = photo_cache.thumbnail(photo_path)
+            _draw_row(c, row_top, roll, seat, roll_name_map.get(roll, ""), photo_path)
+            row_top -= ROW_HEIGHT
+
+        drawn = min(rows, len(entries) - index)
+        _draw_grid(c, top, drawn)
+        index += drawn
+
+        draw_footer(c, footer, page, pages)
+        c.showPage()
+
+
+def render_attendance_pdf(
+    out_path: str,
+    room: str,
+    entries: list,
+    roll_name_map: dict,
+    photo_paths: dict,
+    date: str,
+    session: str,
+    photo_cache=None
+) -> str:
+    """
+    Renders the attendance sheet of one room and returns its path.
+    photo_paths maps roll -> photo file for the rolls that have one.
+    With a PhotoCache, pre-scaled thumbnails are embedded instead of
+    the original photos.
+    """
+    styles = getSampleStyleSheet()
+    header = styles["Heading2"]
+    normal = styles["Normal"]
+
+    doc = SimpleDocTemplate(out_path, pagesize=A4,
+                            topMargin=15*mm, bottomMargin=15*mm,
+                            leftMargin=15*mm, rightMargin=15*mm)
+
+    elements = []
+
+    title = Paragraph(f"Attendance Sheet – Room {room}<br/>{date} — {session}", header)
+    elements.append(title)
+    elements.append(Spacer(1, 12))
+
+    # Table Header
+    data = [["Photo", "Seat", "Roll Number", "Student Name", "Signature"]]
+
+    for subj, roll, seat in entries:
+        name = roll_name_map.get(roll, "")
+
+        # Load photo ONLY if exists
+        photo_path = photo_paths.get(roll)
+        if photo_path and photo_cache is not None:
+            photo_path = photo_cache.thumbnail(photo_path)
+        if photo_path:
+            try:
+                img = Image(photo_path, width=25*mm, height=30*mm)
+            except Exception:
+                img = Paragraph("No Photo", normal)
+        else:
+            img = Paragraph("No Photo", normal)
+
+        data.append([img, seat, roll, name, ""])
+
+    table = Table(
+        data,
+        colWidths=[30*mm, 18*mm, 35*mm, 55*mm, 42*mm]
+    )
+
+    table.setStyle(TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.6, colors.grey),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]))
+
+    elements.append(table)
+
+    doc.build(elements)
+    return out_path
+
 
 def generate_attendance_pdfs(
     session_folder: str,
@@ -13,72 +240,59 @@ def generate_attendance_pdfs(
     roll_name_map: dict,
     photos_folder: str,
     date: str,
-    session: str
+    session: str,
+    workers: int = 1,
+    photo_cache=None,
+    photo_index=None,
+    renderer: str = "streaming"
 ) -> list:
     """
     Generates one attendance PDF per room.
 
+    room_map entries are (subject, roll, seat) in seat order.
+
     Attendance Format:
-    ----------------------------------------------
-    | Photo | Roll | Name | Signature |
-    ----------------------------------------------
+    -----------------------------------------------------
+    | Photo | Seat | Roll | Name | Signature |
+    -----------------------------------------------------
 
     Photos are optional. Missing photos do NOT break.
+    Pass a PhotoIndex to reuse one scan of the photos folder across
+    sessions; otherwise photos_folder is scanned here.
+    With workers > 1 rooms are rendered in parallel; paths are returned
+    in room_map order either way.
+    renderer is one of ATTENDANCE_RENDERERS; "streaming" (the default)
+    keeps memory flat for halls of any size.
     """
+    if renderer not in ATTENDANCE_RENDERERS:
+        raise ValueError(f"Invalid attendance renderer: {renderer}")
 
     os.makedirs(session_folder, exist_ok=True)
-    styles = getSampleStyleSheet()
-    header = styles["Heading2"]
-    normal = styles["Normal"]
 
-    pdf_paths = []
+    if photo_index is None:
+        photo_index = PhotoIndex(photos_folder)
 
+    # Render workers get the thumbnail lookups already made for their
+    # room; in-process rendering shares the run's cache directly
+    parallel = workers > 1 and len(room_map) > 1
+
+    jobs = []
     for room, entries in room_map.items():
         filename = f"attendance_{room}.pdf"
         out_path = os.path.join(session_folder, filename)
 
-        doc = SimpleDocTemplate(out_path, pagesize=A4,
-                                topMargin=15*mm, bottomMargin=15*mm,
-                                leftMargin=15*mm, rightMargin=15*mm)
-
-        elements = []
-
-        title = Paragraph(f"Attendance Sheet – Room {room}<br/>{date} — {session}", header)
-        elements.append(title)
-        elements.append(Spacer(1, 12))
-
-        # Table Header
-        data = [["Photo", "Roll Number", "Student Name", "Signature"]]
-
-        for subj, roll in entries:
-            name = roll_name_map.get(roll, "")
-
-            # Load photo ONLY if exists
-            photo_path = os.path.join(photos_folder, f"{roll}.jpg") if photos_folder else None
-            if photo_path and os.path.exists(photo_path):
-                try:
-                    img = Image(photo_path, width=25*mm, height=30*mm)
-                except Exception:
-                    img = Paragraph("No Photo", normal)
-            else:
-                img = Paragraph("No Photo", normal)
-
-            data.append([img, roll, name, ""])
-
-        table = Table(
-            data,
-            colWidths=[30*mm, 40*mm, 60*mm, 50*mm]
-        )
+        # Ship each worker only the names it needs
+        names = {roll: roll_name_map[roll] for _, roll, _ in entries if roll in roll_name_map}
+        photos = photo_index.subset(roll for _, roll, _ in entries)
 
-        table.setStyle(TableStyle([
-            ("GRID", (0, 0), (-1, -1), 0.6, colors.grey),
-            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ]))
+        cache = photo_cache
+        if parallel and photo_cache is not None:
+            cache = photo_cache.subset(photos.values())
 
-        elements.append(table)
+        jobs.append((out_path, room, entries, names, photos, date, session, cache))
 
-        doc.build(elements)
-        pdf_paths.append(out_path)
+    render_one = render_attendance_pdf
+    if renderer == "streaming":
+        render_one = render_attendance_pdf_streaming
 
-    return pdf_paths
+    return render_documents(render_one, jobs, workers)
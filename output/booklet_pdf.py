@@ -0,0 +1,79 @@
+# output/booklet_pdf.py
+"""
+One print-ready PDF per session: for every room its seating list,
+attendance sheet and student slips, with a bookmark per room and per
+section.
+
+Everything is drawn on a single canvas, so each student photo becomes one
+image XObject that the attendance row and the slip both reference. With
+separate files the same photo is embedded in each file that shows it.
+"""
+
+import os
+
+
+from output.attendance_pdf import draw_attendance_pages
+from output.pdf_canvas import PAGE_HEIGHT, PAGE_WIDTH, BinaryCanvas
+from output.photo_index import PhotoIndex
+from output.room_pdf import draw_room_pages
+from output.student_pdf import SLIP_LAYOUT, draw_slip_pages
+
+
+def _bookmark(c, key, title, level):
+    # Every section starts on a fresh page, so this marks its first page
+    c.bookmarkPage(key)
+    c.addOutlineEntry(title, key, level=level)
+
+
+def booklet_name(date, session):
+    return f"booklet_{date}_{session}.pdf".replace(" ", "_")
+
+
+def generate_session_booklet(
+    session_folder: str,
+    room_map: dict,
+    roll_name_map: dict,
+    date: str,
+    session: str,
+    photos_folder: str = None,
+    photo_cache=None,
+    photo_index=None,
+    layout: tuple = SLIP_LAYOUT
+) -> str:
+    """
+    Writes booklet_<date>_<session>.pdf into session_folder and returns
+    its path.
+
+    room_map entries are (subject, roll, seat) in seat order. Rooms
+    appear in room_map order, each as seating list, attendance sheet,
+    slips. Photos follow the same rules as the separate files: optional,
+    thumbnails from a PhotoCache when given.
+    """
+    os.makedirs(session_folder, exist_ok=True)
+    out_path = os.path.join(session_folder, booklet_name(date, session))
+
+    if photo_index is None:
+        photo_index = PhotoIndex(photos_folder)
+
+    c = BinaryCanvas(out_path, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    c.setTitle(f"Session booklet - {date} {session}")
+
+    for room, entries in room_map.items():
+        _bookmark(c, f"room_{room}", f"Room {room} ({len(entries)} students)", 0)
+
+        _bookmark(c, f"room_{room}_seating", "Seating list", 1)
+        draw_room_pages(c, room, entries, roll_name_map, date, session)
+
+        _bookmark(c, f"room_{room}_attendance", "Attendance sheet", 1)
+        photos = photo_index.subset(roll for _, roll, _ in entries)
+        draw_attendance_pages(c, room, entries, roll_name_map, photos, date, session,
+                              photo_cache)
+
+        _bookmark(c, f"room_{room}_slips", "Student slips", 1)
+        draw_slip_pages(c, {room: entries}, roll_name_map, date, session, photo_index,
+                        photo_cache, layout)
+
+    c.showOutline()
+    c.save()
+
+    return out_path
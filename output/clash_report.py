@@ -0,0 +1,29 @@
+# output/clash_report.py
+import csv
+import json
+import os
+
+from allocation.clash_checker import Clash
+
+
+def write_clash_report(path, clashes):
+    """
+    Writes every Clash to path, as CSV or JSON according to its extension
+    (.json for JSON, anything else CSV). One row / object per finding:
+
+    kind, roll, date, session, subject, other_date, other_session, other_subject
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump([c._asdict() for c in clashes], fh, indent=1, ensure_ascii=False)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(Clash._fields)
+            writer.writerows(clashes)
+
+    return path
@@ -1,12 +1,151 @@
+import csv
+import importlib.util
+import json
 import os
+import re
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 
+from allocation.model import SeatMap
 
-def write_overall_output(output_folder, date, session, allocations):
+
+# "pandas" builds a DataFrame and writes it with to_excel; "streaming"
+# appends rows to an openpyxl write-only workbook, in constant memory
+EXCEL_ENGINES = ("pandas", "streaming")
+
+# xlsx keeps the one-row-per-room reports; the others write one row per
+# student in STUDENT_COLUMNS, for systems that load the data back in
+OUTPUT_FORMATS = ("xlsx", "csv", "parquet", "jsonl")
+
+# pandas writes parquet through whichever of these is installed
+HAS_PARQUET = any(importlib.util.find_spec(m) for m in ("pyarrow", "fastparquet"))
+
+OVERALL_COLUMNS = ["Date", "Session", "Subject", "Room", "Count", "Roll_Numbers"]
+SEATS_LEFT_COLUMNS = ["Room", "Seats_Left"]
+STUDENT_COLUMNS = ["date", "session", "subject", "room", "seat", "roll", "name"]
+
+# Excel refuses sheet names longer than this, or containing these
+MAX_SHEET_NAME = 31
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def _seat_lookup(allocations, seat_map):
+    """
+    seats(room, rolls) -> the seat of each roll, "" where unknown.
+
+    A seat map viewing the same Allocation reads the seats stored next to
+    the rolls; any other seat map is indexed by (room, roll) first.
+    """
+    if isinstance(seat_map, SeatMap) and seat_map.allocation is allocations:
+        return lambda room, rolls: rolls.seats()
+
+    seat_of = {}
+    if seat_map:
+        for room, entries in seat_map.items():
+            for _, roll, seat in entries:
+                seat_of[(room, roll)] = seat
+    return lambda room, rolls: [seat_of.get((room, r), "") for r in rolls]
+
+
+def _overall_rows(date, session, allocations, seat_map=None):
+    """
+    One row (list, in OVERALL_COLUMNS order, plus Seats with a seat_map)
+    per subject and room.
+    """
+    seats = _seat_lookup(allocations, seat_map)
+
+    for subject, room_data in allocations.items():
+        for room, rolls in room_data.items():
+            row = [date, session, subject, room, len(rolls), ";".join(rolls)]
+            if seat_map:
+                row.append(";".join(seats(room, rolls)))
+            yield row
+
+
+def _overall_columns(seat_map):
+    return OVERALL_COLUMNS + ["Seats"] if seat_map else OVERALL_COLUMNS
+
+
+def _student_rows(date, session, allocations, seat_map=None, roll_name_map=None):
+    """
+    One row (list, in STUDENT_COLUMNS order) per seated student.
+    """
+    seats = _seat_lookup(allocations, seat_map)
+    roll_name_map = roll_name_map or {}
+
+    for subject, room_data in allocations.items():
+        for room, rolls in room_data.items():
+            for roll, seat in zip(rolls, seats(room, rolls)):
+                yield [date, session, subject, room, seat,
+                       roll, roll_name_map.get(roll, "")]
+
+
+def _seats_left_rows(seats_left):
+    for room, left in seats_left.items():
+        yield [room, left]
+
+
+def _append_header(sheet, columns):
+    # Bold like the header row pandas writes
+    bold = Font(bold=True)
+    cells = []
+    for name in columns:
+        cell = WriteOnlyCell(sheet, value=name)
+        cell.font = bold
+        cells.append(cell)
+    sheet.append(cells)
+
+
+def _stream_sheet(out_path, columns, rows):
+    wb = Workbook(write_only=True)
+    sheet = wb.create_sheet()
+    _append_header(sheet, columns)
+    for row in rows:
+        sheet.append(row)
+    wb.save(out_path)
+
+
+def _check_engine(engine):
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Invalid Excel engine: {engine}")
+
+
+def _write_table(out_path, columns, rows, output_format):
+    """
+    Writes rows to a csv, jsonl or parquet file. csv and jsonl stream
+    row by row; parquet goes through a DataFrame.
+    """
+    if output_format == "csv":
+        with open(out_path, "w", encoding="utf-8", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(columns)
+            writer.writerows(rows)
+
+    elif output_format == "jsonl":
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        with open(out_path, "w", encoding="utf-8") as fh:
+            fh.writelines(encode(dict(zip(columns, row))) + "\n" for row in rows)
+
+    elif output_format == "parquet":
+        if not HAS_PARQUET:
+            raise RuntimeError("Parquet output needs pyarrow or fastparquet installed")
+        df = pd.DataFrame(list(rows), columns=columns)
+        df.to_parquet(out_path, index=False)
+
+    else:
+        raise ValueError(f"Invalid output format: {output_format}")
+
+
+def write_overall_output(output_folder, date, session, allocations, seat_map=None, engine="pandas"):
     """
     Creates an Excel file storing the overall seating allocation for a day+session.
-    
-    allocations format:
+
+    With a seat_map (room -> [(subject, roll, seat)]) a "Seats" column lists
+    each roll's seat, aligned with Roll_Numbers.
+
+    allocations format (an Allocation, or the same as plain dicts):
     {
         "CS249": {
             "6101": ["1401AI01", "1401AI02", ...],
@@ -17,34 +156,63 @@ def write_overall_output(output_folder, date, session, allocations):
         ...
     }
     """
+    _check_engine(engine)
 
     os.makedirs(output_folder, exist_ok=True)
 
-    rows = []
+    # Filename for summary
+    filename = f"{date}_{session}_overall.xlsx".replace(" ", "_")
+    out_path = os.path.join(output_folder, filename)
 
-    for subject, room_data in allocations.items():
-        for room, rolls in room_data.items():
-            rows.append({
-                "Date": date,
-                "Session": session,
-                "Subject": subject,
-                "Room": room,
-                "Count": len(rolls),
-                "Roll_Numbers": ";".join(rolls)
-            })
+    rows = _overall_rows(date, session, allocations, seat_map)
+    columns = _overall_columns(seat_map)
 
-    df = pd.DataFrame(rows)
+    if engine == "streaming":
+        _stream_sheet(out_path, columns, rows)
+    else:
+        df = pd.DataFrame(list(rows), columns=columns)
+        df.to_excel(out_path, index=False)
 
-    # Filename for summary
-    filename = f"{date}_{session}_overall.xlsx".replace(" ", "_")
+    return out_path
+
+
+
+def write_student_table(output_folder, date, session, allocations, seat_map=None,
+                        roll_name_map=None, output_format="csv"):
+    """
+    Writes <date>_<session>_students.<format>, one row per seated student:
+
+        date, session, subject, room, seat, roll, name
+
+    Same allocations and seat_map as write_overall_output; seat and name
+    are empty where unknown.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+
+    filename = f"{date}_{session}_students.{output_format}".replace(" ", "_")
     out_path = os.path.join(output_folder, filename)
 
-    df.to_excel(out_path, index=False)
+    rows = _student_rows(date, session, allocations, seat_map, roll_name_map)
+    _write_table(out_path, STUDENT_COLUMNS, rows, output_format)
+
     return out_path
 
 
+def write_session_output(output_folder, date, session, allocations, seat_map=None,
+                         roll_name_map=None, output_format="xlsx", engine="pandas"):
+    """
+    The session's allocation report in output_format: the per-room
+    *_overall.xlsx for xlsx, otherwise the per-student table.
+    """
+    if output_format == "xlsx":
+        return write_overall_output(output_folder, date, session, allocations, seat_map,
+                                    engine=engine)
+    return write_student_table(output_folder, date, session, allocations, seat_map,
+                               roll_name_map, output_format)
+
 
-def write_seats_left(output_folder, seats_left):
+def write_seats_left(output_folder, seats_left, date=None, session=None, engine="pandas",
+                     output_format="xlsx"):
     """
     seats_left format:
     {
@@ -52,18 +220,83 @@ def write_seats_left(output_folder, seats_left):
         "6102": 2,
         ...
     }
+
+    Written to remaining_seats.<format>, or to
+    <date>_<session>_remaining_seats.<format> when date and session are
+    given, so sessions sharing a folder do not overwrite each other.
     """
+    _check_engine(engine)
 
     os.makedirs(output_folder, exist_ok=True)
 
-    rows = [
-        {"Room": room, "Seats_Left": left}
-        for room, left in seats_left.items()
-    ]
+    filename = f"remaining_seats.{output_format}"
+    if date is not None and session is not None:
+        filename = f"{date}_{session}_remaining_seats.{output_format}".replace(" ", "_")
+    out_path = os.path.join(output_folder, filename)
 
-    df = pd.DataFrame(rows)
+    rows = _seats_left_rows(seats_left)
 
-    out_path = os.path.join(output_folder, "remaining_seats.xlsx")
-    df.to_excel(out_path, index=False)
+    if output_format != "xlsx":
+        _write_table(out_path, SEATS_LEFT_COLUMNS, rows, output_format)
+    elif engine == "streaming":
+        _stream_sheet(out_path, SEATS_LEFT_COLUMNS, rows)
+    else:
+        df = pd.DataFrame(list(rows), columns=SEATS_LEFT_COLUMNS)
+        df.to_excel(out_path, index=False)
 
     return out_path
+
+
+class ConsolidatedWorkbook:
+    """
+    One workbook for the whole timetable, written in a single pass:
+    an "Overall" sheet with every session's rows, then one seats-left
+    sheet per session. Rows are streamed to disk as sessions are added,
+    so memory stays flat however long the timetable is.
+
+        with ConsolidatedWorkbook(path) as book:
+            for ...:
+                book.add_session(date, session, allocations, seats_left, seat_map)
+    """
+
+    def __init__(self, out_path):
+        self.out_path = out_path
+        self.workbook = Workbook(write_only=True)
+        self.overall = self.workbook.create_sheet("Overall")
+        _append_header(self.overall, _overall_columns(True))
+        self.sheet_names = {"Overall"}
+
+    def _sheet_name(self, date, session):
+        base = INVALID_SHEET_CHARS.sub("-", f"Left {date} {session}")[:MAX_SHEET_NAME]
+        name = base
+        n = 2
+        while name in self.sheet_names:
+            suffix = f" ({n})"
+            name = base[:MAX_SHEET_NAME - len(suffix)] + suffix
+            n += 1
+        self.sheet_names.add(name)
+        return name
+
+    def add_session(self, date, session, allocations, seats_left, seat_map=None):
+        for row in _overall_rows(date, session, allocations, seat_map):
+            # Keep the Seats column even for sessions seated without a seat map
+            if not seat_map:
+                row.append("")
+            self.overall.append(row)
+
+        sheet = self.workbook.create_sheet(self._sheet_name(date, session))
+        _append_header(sheet, SEATS_LEFT_COLUMNS)
+        for row in _seats_left_rows(seats_left):
+            sheet.append(row)
+
+    def close(self):
+        os.makedirs(os.path.dirname(self.out_path) or ".", exist_ok=True)
+        self.workbook.save(self.out_path)
+        return self.out_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
@@ -1,86 +1,192 @@
-# output/exporter.py
-import os
-import logging
-
-from output.excel_writer import write_overall_output, write_seats_left
-from output.room_pdf import generate_room_pdfs
-from output.student_pdf import generate_student_slips_pdf
-from output.attendance_pdf import generate_attendance_pdfs
-from output.zip_builder import build_zip
-
-logger = logging.getLogger(__name__)
-
-
-def export_all(
-        output_root: str,
-        date: str,
-        session: str,
-        allocations: dict,
-        seats_left: dict,
-        roll_name_map: dict,
-        photos_folder: str = None
-) -> dict:
-
-    # --------------------- CREATE FOLDERS ---------------------
-    date_folder = os.path.join(output_root, date)
-    session_folder = os.path.join(date_folder, session)
-
-    os.makedirs(session_folder, exist_ok=True)
-
-    logger.info(f"Writing all export files into: {session_folder}")
-
-    results = {}
-
-    # --------------------- 1. Excel: overall + seats left ---------------------
-    overall_excel = write_overall_output(session_folder, date, session, allocations)
-    seats_left_excel = write_seats_left(session_folder, seats_left)
-
-    results["overall_excel"] = overall_excel
-    results["remaining_seats_excel"] = seats_left_excel
-
-    logger.info("Excel outputs written.")
-
-    # --------------------- 2. Build room-wise map ----------------------
-    room_map = {}
-    for subject, room_data in allocations.items():
-        for room, rolls in room_data.items():
-            room_map.setdefault(room, []).extend(
-                [(subject, r) for r in rolls]
-            )
-
-    # --------------------- 3. Room PDFs ----------------------
-    room_pdfs = generate_room_pdfs(
-        session_folder, room_map, roll_name_map, date, session
-    )
-    results["room_pdfs"] = room_pdfs
-
-    logger.info(f"Generated {len(room_pdfs)} room PDFs.")
-
-    # --------------------- 4. Attendance PDFs (NEW) ----------------------
-    attendance_pdfs = generate_attendance_pdfs(
-        session_folder=session_folder,
-        room_map=room_map,
-        roll_name_map=roll_name_map,
-        photos_folder=photos_folder,
-        date=date,
-        session=session
-    )
-    results["attendance_pdfs"] = attendance_pdfs
-
-    logger.info(f"Generated {len(attendance_pdfs)} attendance PDFs.")
-
-    # --------------------- 5. Student Slips PDF ----------------------
-    student_slips_pdf = generate_student_slips_pdf(
-        session_folder, room_map, roll_name_map, date, session, photos_folder
-    )
-    results["student_slips_pdf"] = student_slips_pdf
-
-    logger.info("Student slips PDF generated.")
-
-    # --------------------- 6. ZIP File ----------------------
-    zip_path = build_zip(session_folder, prefix=f"seating_{date}_{session}")
-    results["zip"] = zip_path
-
-    logger.info(f"ZIP file created: {zip_path}")
-
-    return results
+# output/exporter.py
+import os
+import logging
+
+from allocation.model import Allocation
+from output.excel_writer import write_seats_left, write_session_output
+from output.room_pdf import generate_room_pdfs
+from output.student_pdf import SLIPS_PDF, generate_student_slips_pdf
+from output.attendance_pdf import generate_attendance_pdfs
+from output.photo_index import PhotoIndex
+from output.booklet_pdf import booklet_name, generate_session_booklet
+from output.zip_builder import build_zip
+from utils.profiler import NULL_PROFILER
+
+logger = logging.getLogger(__name__)
+
+# "separate": per-room seating and attendance PDFs plus one slips PDF;
+# "booklet": everything for the session in one bookmarked PDF
+PDF_MODES = ("separate", "booklet")
+
+
+def export_all(
+        output_root: str,
+        date: str,
+        session: str,
+        allocations: dict,
+        seats_left: dict,
+        roll_name_map: dict,
+        photos_folder: str = None,
+        seat_map: dict = None,
+        pdf_workers: int = 1,
+        photo_cache=None,
+        photo_index=None,
+        only_rooms=None,
+        excel_engine: str = "pandas",
+        output_format: str = "xlsx",
+        profiler=None,
+        pdf_mode: str = "separate"
+) -> dict:
+    """
+    Writes every output of one session. With only_rooms (incremental runs)
+    the per-room PDFs are redrawn for those rooms alone, unless they
+    replace a booklet; the Excel files, slips and ZIP always cover the
+    whole session.
+
+    pdf_mode is one of PDF_MODES: "separate" writes room_*, attendance_*
+    and student_slips PDFs; "booklet" writes them all into one bookmarked
+    booklet_<date>_<session>.pdf instead, always for the whole session.
+
+    profiler, if given, times the excel, room_pdf, attendance_pdf,
+    slips_pdf (or booklet_pdf) and zip stages.
+    """
+    if pdf_mode not in PDF_MODES:
+        raise ValueError(f"Invalid PDF mode: {pdf_mode}")
+    profiler = profiler or NULL_PROFILER
+
+    # --------------------- CREATE FOLDERS ---------------------
+    date_folder = os.path.join(output_root, date)
+    session_folder = os.path.join(date_folder, session)
+
+    os.makedirs(session_folder, exist_ok=True)
+
+    logger.info(f"Writing all export files into: {session_folder}")
+
+    results = {}
+
+    # --------------------- 1. Excel: overall + seats left ---------------------
+    # Non-xlsx formats write one row per student instead of per room
+    with profiler.stage("excel", date, session):
+        overall_excel = write_session_output(session_folder, date, session, allocations,
+                                             seat_map, roll_name_map, output_format,
+                                             engine=excel_engine)
+        seats_left_excel = write_seats_left(session_folder, seats_left, engine=excel_engine,
+                                            output_format=output_format)
+
+    results["overall_excel"] = overall_excel
+    results["remaining_seats_excel"] = seats_left_excel
+
+    logger.info("Excel outputs written.")
+
+    # --------------------- 2. Room-wise view ----------------------
+    # room -> [(subject, roll, seat)], in seat order when seats are assigned
+    if seat_map is not None:
+        room_map = seat_map
+    else:
+        if not isinstance(allocations, Allocation):
+            allocations = Allocation.from_nested(allocations)
+        room_map = allocations.seat_map()
+
+    # Per-room PDFs of rooms this session no longer uses are stale
+    _remove_stale_room_pdfs(session_folder, room_map)
+
+    # A booklet holds every room; separate files replacing it must too
+    booklet_path = os.path.join(session_folder, booklet_name(date, session))
+    if pdf_mode == "separate" and os.path.exists(booklet_path):
+        only_rooms = None
+
+    pdf_room_map = room_map
+    if only_rooms is not None:
+        pdf_room_map = {room: entries for room, entries in room_map.items() if room in only_rooms}
+        logger.info(f"Redrawing PDFs for {len(pdf_room_map)} of {len(room_map)} rooms.")
+
+    # One scan of the photos folder serves every generator below
+    if photo_index is None:
+        photo_index = PhotoIndex(photos_folder)
+
+    if pdf_mode == "booklet":
+        # --------------------- 3-5. Session booklet ----------------------
+        # One file replaces the separate room, attendance and slip PDFs
+        _remove_stale_room_pdfs(session_folder, {})
+        _remove_if_exists(os.path.join(session_folder, SLIPS_PDF))
+
+        with profiler.stage("booklet_pdf", date, session):
+            booklet_pdf = generate_session_booklet(
+                session_folder, room_map, roll_name_map, date, session, photos_folder,
+                photo_cache=photo_cache,
+                photo_index=photo_index
+            )
+        results["booklet_pdf"] = booklet_pdf
+        results["room_pdfs"] = []
+        results["attendance_pdfs"] = []
+        results["student_slips_pdf"] = None
+
+        logger.info(f"Session booklet generated: {booklet_pdf}")
+
+    else:
+        _remove_if_exists(booklet_path)
+
+        # --------------------- 3. Room PDFs ----------------------
+        with profiler.stage("room_pdf", date, session):
+            room_pdfs = generate_room_pdfs(
+                session_folder, pdf_room_map, roll_name_map, date, session,
+                workers=pdf_workers
+            )
+        results["room_pdfs"] = room_pdfs
+
+        logger.info(f"Generated {len(room_pdfs)} room PDFs.")
+
+        # --------------------- 4. Attendance PDFs (NEW) ----------------------
+        with profiler.stage("attendance_pdf", date, session):
+            attendance_pdfs = generate_attendance_pdfs(
+                session_folder=session_folder,
+                room_map=pdf_room_map,
+                roll_name_map=roll_name_map,
+                photos_folder=photos_folder,
+                date=date,
+                session=session,
+                workers=pdf_workers,
+                photo_cache=photo_cache,
+                photo_index=photo_index
+            )
+        results["attendance_pdfs"] = attendance_pdfs
+
+        logger.info(f"Generated {len(attendance_pdfs)} attendance PDFs.")
+
+        # --------------------- 5. Student Slips PDF ----------------------
+        with profiler.stage("slips_pdf", date, session):
+            student_slips_pdf = generate_student_slips_pdf(
+                session_folder, room_map, roll_name_map, date, session, photos_folder,
+                photo_cache=photo_cache,
+                photo_index=photo_index
+            )
+        results["student_slips_pdf"] = student_slips_pdf
+
+        logger.info("Student slips PDF generated.")
+
+    # --------------------- 6. ZIP File ----------------------
+    # Reruns only touch the ZIP when the session's files changed
+    with profiler.stage("zip", date, session):
+        zip_path = build_zip(session_folder, prefix=f"seating_{date}_{session}", update=True)
+    results["zip"] = zip_path
+
+    logger.info(f"ZIP file created: {zip_path}")
+
+    return results
+
+
+ROOM_PDF_PREFIXES = ("room_", "attendance_")
+
+
+def _remove_stale_room_pdfs(session_folder, room_map):
+    for name in os.listdir(session_folder):
+        for prefix in ROOM_PDF_PREFIXES:
+            if name.startswith(prefix) and name.endswith(".pdf"):
+                room = name[len(prefix):-len(".pdf")]
+                if room not in room_map:
+                    os.remove(os.path.join(session_folder, name))
+
+
+def _remove_if_exists(path):
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,28 @@
+# output/parallel_render.py
+"""
+Render independent PDF documents in worker processes.
+
+ReportLab is pure Python and CPU-bound, so one document per room is the
+natural unit of parallel work. Every PDF generator in output/ builds a
+list of job argument tuples and hands them to render_documents together
+with a module-level render function.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+def render_documents(render_one, jobs, workers=1):
+    """
+    Calls render_one(*job) for every job and returns the results in job
+    order, using up to `workers` processes.
+
+    render_one must be a module-level function so it can be pickled.
+    """
+    jobs = list(jobs)
+
+    if workers <= 1 or len(jobs) <= 1:
+        return [render_one(*job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        # map() preserves submission order
+        return list(pool.map(render_one, *zip(*jobs)))
@@ -0,0 +1,140 @@
+# output/pdf_canvas.py
+"""
+Shared helpers for the PDF generators that draw straight onto a
+reportlab canvas.
+
+Platypus builds a flowable per cell and measures every one of them
+before laying out the page. For fixed-height rows and fixed-size slips
+the layout is known in advance, so drawing with canvas calls at computed
+positions does the same job for a fraction of the work.
+"""
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.lib.utils import _digester
+from reportlab.pdfbase import pdfdoc, pdfutils
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 15 * mm
+
+FONT = "Helvetica"
+BOLD_FONT = "Helvetica-Bold"
+
+HEADER_FILL = (0.83, 0.83, 0.83)   # lightgrey, as in the platypus tables
+GRID_GREY = (0.5, 0.5, 0.5)
+
+
+class _BinaryImage(pdfdoc.PDFImageXObject):
+    """
+    An image XObject that keeps its data as raw binary whatever
+    rl_config.useA85 says.
+    """
+
+    def loadImageFromA85(self, source):
+        return self.loadImageFromRaw(source)
+
+    def loadImageFromJPEG(self, imageFile):
+        # As reportlab's, minus the ASCII85 pass: DCTDecode takes the
+        # file's bytes as they are
+        try:
+            try:
+                info = pdfutils.readJPEGInfo(imageFile)
+            finally:
+                imageFile.seek(0)
+        except Exception:
+            return False
+        self.width, self.height = info[0], info[1]
+        self.bitsPerComponent = 8
+        if info[2] == 1:
+            self.colorSpace = "DeviceGray"
+        elif info[2] == 3:
+            self.colorSpace = "DeviceRGB"
+        else:
+            self.colorSpace = "DeviceCMYK"
+            self._dotrans = 1
+        self.streamContent = imageFile.read()
+        self._filters = ("DCTDecode",)
+        self.mask = None
+        return True
+
+
+class BinaryCanvas(canvas.Canvas):
+    """
+    A canvas that embeds photos and page content as raw binary streams
+    instead of ASCII85 text.
+
+    reportlab ASCII85-encodes every stream by default, in pure Python
+    unless its optional C accelerator is installed; for photo-heavy
+    documents that encoding costs more than all the drawing. Binary
+    streams are standard PDF and a quarter smaller. reportlab only offers
+    this as the process-wide rl_config.useA85, so the canvas builds its
+    own streams instead and leaves the setting alone for every other
+    document (another job's thread, a caller's own PDFs).
+    """
+
+    def drawImage(self, image, x, y, width=None, height=None, mask=None, **kwargs):
+        # Register a photo file under the name reportlab gives it, so
+        # drawImage reuses the binary copy instead of building its own.
+        # Image objects and masks are left to reportlab.
+        if isinstance(image, str) and mask is None:
+            name = _digester(f"{image}{mask}".encode("utf-8"))
+            reg_name = self._doc.getXObjectName(name)
+            if reg_name not in self._doc.idToObject:
+                image_obj = _BinaryImage(name, image)
+                self._setXObjects(image_obj)
+                self._doc.Reference(image_obj, reg_name)
+                self._doc.addForm(name, image_obj)
+        return super().drawImage(image, x, y, width, height, mask, **kwargs)
+
+    def showPage(self):
+        super().showPage()
+        # The page's content stream, made now: left to save(), reportlab
+        # would pick its filters from rl_config.useA85
+        page = self._doc.Pages.pages[-1]
+        page.Contents = _content_stream(page.stream, page.compression, "page stream")
+
+    def endForm(self, **extra_attributes):
+        name = self._formData[0]
+        super().endForm(**extra_attributes)
+        # Forms likewise, and they re-pick their filters on every format
+        # while their compression flag is set
+        form = self._doc.idToObject[self._doc.getXObjectName(name)]
+        form.Contents = _content_stream(form.stream, form.compression, "xobject form stream")
+        form.compression = 0
+
+
+def _content_stream(content, compression, comment):
+    stream = pdfdoc.PDFStream(content=content)
+    if compression:
+        stream.filters = [pdfdoc.PDFZCompress]
+    stream.__Comment__ = comment
+    return stream
+
+
+def fit_text(text, font, size, width):
+    """
+    text, cut short with "..." so it fits in width points.
+    """
+    text = str(text)
+    if stringWidth(text, font, size) <= width:
+        return text
+
+    ellipsis = "..."
+    room = width - stringWidth(ellipsis, font, size)
+    while text and stringWidth(text, font, size) > room:
+        text = text[:-1]
+    return text + ellipsis
+
+
+def draw_footer(canvas, text, page, pages):
+    """
+    Small grey footer line: text on the left, "Page n of N" on the right.
+    """
+    canvas.setFont(FONT, 7)
+    canvas.setFillColorRGB(*GRID_GREY)
+    canvas.drawString(MARGIN, MARGIN / 2, text)
+    canvas.drawRightString(PAGE_WIDTH - MARGIN, MARGIN / 2, f"Page {page} of {pages}")
+    canvas.setFillColorRGB(0, 0, 0)
@@ -0,0 +1,91 @@
+# output/photo_cache.py
+"""
+Pre-scaled student photos for PDF embedding.
+
+Photos are printed at 25 × 30 mm, but the originals are often camera-size
+JPEGs. Each photo is downsampled once to the print size at a target DPI
+and stored in a cache folder; every PDF generator then embeds the small
+thumbnail instead of decoding and embedding the original again.
+
+Cache entries are named by a hash of the source path, its size and mtime
+and the target pixel size, so a replaced photo gets a new entry and old
+entries are simply never read again.
+
+A PhotoCache lives for one run and remembers every lookup: the original
+(often on a network mount) is stat'ed once per run, not once per roll in
+every generator of every session.
+"""
+
+import copy
+import hashlib
+import os
+
+from PIL import Image
+
+
+PHOTO_SIZE_MM = (25, 30)
+DEFAULT_DPI = 150
+
+MM_PER_INCH = 25.4
+
+
+class PhotoCache:
+    def __init__(self, cache_dir, dpi=DEFAULT_DPI, size_mm=PHOTO_SIZE_MM):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.size_px = tuple(round(s / MM_PER_INCH * dpi) for s in size_mm)
+        self._thumbnails = {}  # photo path -> thumbnail path or None
+
+    def _key(self, photo_path, stat):
+        h = hashlib.sha1()
+        h.update(os.path.realpath(photo_path).encode())
+        h.update(f"|{stat.st_size}|{stat.st_mtime_ns}|{self.size_px}".encode())
+        return h.hexdigest()
+
+    def thumbnail(self, photo_path):
+        """
+        Path of the cached thumbnail for photo_path, creating it on first
+        use. Returns None if the photo is missing or cannot be decoded.
+        """
+        try:
+            return self._thumbnails[photo_path]
+        except KeyError:
+            thumb_path = self._thumbnails[photo_path] = self._lookup(photo_path)
+            return thumb_path
+
+    def subset(self, photo_paths):
+        """
+        A PhotoCache remembering only the lookups of photo_paths, small
+        enough to ship to a render worker with its room.
+        """
+        known = self._thumbnails
+        cache = copy.copy(self)
+        cache._thumbnails = {p: known[p] for p in photo_paths if p in known}
+        return cache
+
+    def _lookup(self, photo_path):
+        try:
+            stat = os.stat(photo_path)
+        except OSError:
+            return None
+
+        thumb_path = os.path.join(self.cache_dir, f"{self._key(photo_path, stat)}.jpg")
+        if os.path.exists(thumb_path):
+            return thumb_path
+
+        try:
+            with Image.open(photo_path) as img:
+                # Let the JPEG decoder skip detail we are about to throw away
+                img.draft("RGB", self.size_px)
+                thumb = img.convert("RGB").resize(self.size_px, Image.LANCZOS)
+        except Exception:
+            return None
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Several workers may build the same thumbnail; last rename wins
+        tmp_path = f"{thumb_path}.{os.getpid()}.tmp"
+        thumb.save(tmp_path, "JPEG", quality=85, optimize=True, dpi=(self.dpi, self.dpi))
+        os.replace(tmp_path, thumb_path)
+
+        return thumb_path
@@ -0,0 +1,77 @@
+# output/photo_index.py
+"""
+One directory listing of the photos folder, shared by every PDF generator.
+
+Looking a photo up used to cost an os.path.exists() per roll, per room,
+per session. On a network mount with thousands of photos that is minutes
+of stat calls; a single os.scandir() reads the whole folder in a few
+round trips and every later lookup is a dict hit.
+"""
+
+import os
+
+
+# Accepted photo extensions, most preferred first
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+class PhotoIndex:
+    """
+    Maps roll -> photo path for the files directly inside photos_folder.
+
+    File names are matched case-insensitively (2201CS01.JPG, 2201cs01.jpeg
+    and 2201CS01.png all belong to roll 2201CS01). When a roll has several
+    photos the extension earliest in PHOTO_EXTENSIONS wins.
+    """
+
+    def __init__(self, photos_folder):
+        self.photos_folder = photos_folder
+        self.paths = {}
+
+        if not photos_folder or not os.path.isdir(photos_folder):
+            return
+
+        rank = {}
+        with os.scandir(photos_folder) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                if ext not in PHOTO_EXTENSIONS:
+                    continue
+
+                key = stem.casefold()
+                order = PHOTO_EXTENSIONS.index(ext)
+                if key in rank and rank[key] <= order:
+                    continue
+                if not entry.is_file():
+                    continue
+
+                rank[key] = order
+                self.paths[key] = entry.path
+
+    def __len__(self):
+        return len(self.paths)
+
+    def get(self, roll):
+        """
+        Path of the photo for roll, or None.
+        """
+        return self.paths.get(str(roll).casefold())
+
+    def subset(self, rolls):
+        """
+        { roll: path } for the rolls that have a photo. Small enough to
+        ship to a render worker with its room.
+        """
+        found = {}
+        for roll in rolls:
+            path = self.get(roll)
+            if path is not None:
+                found[roll] = path
+        return found
+
+    def missing(self, rolls):
+        """
+        Rolls among `rolls` without a photo, in input order, no repeats.
+        """
+        return [roll for roll in dict.fromkeys(rolls) if self.get(roll) is None]
@@ -0,0 +1,152 @@
+# output/room_pdf.py
+import math
+import os
+
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas as pdf_canvas
+
+from output.parallel_render import render_documents
+from output.pdf_canvas import (
+    BOLD_FONT, FONT, GRID_GREY, HEADER_FILL, MARGIN, PAGE_HEIGHT, PAGE_WIDTH,
+    draw_footer, fit_text,
+)
+
+
+# S.No | Seat | Roll Number | Student Name | Subject
+COLUMNS = [("S.No", 12 * mm), ("Seat", 20 * mm), ("Roll Number", 35 * mm),
+           ("Student Name", 75 * mm), ("Subject", 38 * mm)]
+
+ROW_HEIGHT = 7 * mm
+TITLE_HEIGHT = 22 * mm
+FONT_SIZE = 9
+
+
+def _rows_per_page(first):
+    usable = PAGE_HEIGHT - 2 * MARGIN - ROW_HEIGHT    # minus the header row
+    if first:
+        usable -= TITLE_HEIGHT
+    return int(usable // ROW_HEIGHT)
+
+
+def _page_count(rows):
+    first = _rows_per_page(True)
+    if rows <= first:
+        return 1
+    return 1 + math.ceil((rows - first) / _rows_per_page(False))
+
+
+def _draw_rows(c, top, rows, font, fill=None):
+    """
+    Table rows (lists of cell values) starting with a top edge at y = top.
+    Each column is one text object stepping down a row per line, rather
+    than a positioned string per cell.
+    """
+    x = MARGIN
+    if fill is not None:
+        width = sum(w for _, w in COLUMNS)
+        c.setFillColorRGB(*fill)
+        c.rect(x, top - ROW_HEIGHT * len(rows), width, ROW_HEIGHT * len(rows), stroke=0, fill=1)
+        c.setFillColorRGB(0, 0, 0)
+
+    baseline = top - ROW_HEIGHT + (ROW_HEIGHT - FONT_SIZE) / 2 + 1.5
+    for i, (_, w) in enumerate(COLUMNS):
+        text = c.beginText(x + 1.5 * mm, baseline)
+        text.setFont(font, FONT_SIZE, ROW_HEIGHT)
+        text.textLines([fit_text(row[i], font, FONT_SIZE, w - 3 * mm) for row in rows])
+        c.drawText(text)
+        x += w
+
+
+def _draw_grid(c, top, rows):
+    """
+    Grid lines of a header row plus `rows` body rows below y = top.
+    """
+    c.setStrokeColorRGB(*GRID_GREY)
+    c.setLineWidth(0.6)
+
+    xs = [MARGIN]
+    for _, w in COLUMNS:
+        xs.append(xs[-1] + w)
+    ys = [top - i * ROW_HEIGHT for i in range(rows + 2)]
+
+    c.grid(xs, ys)
+    c.setStrokeColorRGB(0, 0, 0)
+
+
+def render_room_pdf(out_path, room, entries, roll_name_map, date, session):
+    """
+    Draws the seating list of one room and returns its path.
+
+    entries are (subject, roll, seat) in seat order. The first page
+    carries the title and a head count per subject; every page repeats
+    the column header.
+    """
+    c = pdf_canvas.Canvas(out_path, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    c.setTitle(f"Room {room} - {date} {session}")
+    draw_room_pages(c, room, entries, roll_name_map, date, session)
+    c.save()
+    return out_path
+
+
+def draw_room_pages(c, room, entries, roll_name_map, date, session):
+    """
+    Draws the room's seating list onto canvas c, ending each page with
+    showPage(). Shared by the per-room files and the session booklet.
+    """
+    counts = {}
+    for subject, _, _ in entries:
+        counts[subject] = counts.get(subject, 0) + 1
+
+    pages = _page_count(len(entries))
+    footer = f"Room {room} - {date} - {session}"
+    header = [name for name, _ in COLUMNS]
+
+    index = 0
+    for page in range(1, pages + 1):
+        top = PAGE_HEIGHT - MARGIN
+
+        if page == 1:
+            c.setFont(BOLD_FONT, 14)
+            c.drawString(MARGIN, top - 14, f"Seating Plan – Room {room}")
+            c.setFont(FONT, 10)
+            c.drawString(MARGIN, top - 30, f"{date} — {session}   ·   {len(entries)} students")
+            c.setFont(FONT, 8)
+            summary = ", ".join(f"{subject}: {n}" for subject, n in counts.items())
+            c.drawString(MARGIN, top - 44,
+                         fit_text(summary, FONT, 8, PAGE_WIDTH - 2 * MARGIN))
+            top -= TITLE_HEIGHT
+
+        chunk = entries[index:index + _rows_per_page(page == 1)]
+
+        _draw_rows(c, top, [header], BOLD_FONT, fill=HEADER_FILL)
+        _draw_rows(c, top - ROW_HEIGHT, [
+            [n, seat, roll, roll_name_map.get(roll, ""), subject]
+            for n, (subject, roll, seat) in enumerate(chunk, start=index + 1)
+        ], FONT)
+        _draw_grid(c, top, len(chunk))
+
+        index += len(chunk)
+        draw_footer(c, footer, page, pages)
+        c.showPage()
+
+
+def generate_room_pdfs(session_folder, room_map, roll_name_map, date, session, workers=1):
+    """
+    Generates room_<room>.pdf for every room in room_map.
+
+    room_map entries are (subject, roll, seat) in seat order. With
+    workers > 1 rooms are rendered in parallel; paths are returned in
+    room_map order either way.
+    """
+    os.makedirs(session_folder, exist_ok=True)
+
+    jobs = []
+    for room, entries in room_map.items():
+        out_path = os.path.join(session_folder, f"room_{room}.pdf")
+
+        # Ship each worker only the names it needs
+        names = {roll: roll_name_map[roll] for _, roll, _ in entries if roll in roll_name_map}
+
+        jobs.append((out_path, room, entries, names, date, session))
+
+    return render_documents(render_room_pdf, jobs, workers)
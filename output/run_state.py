@@ -0,0 +1,100 @@
+# output/run_state.py
+"""
+What the last run produced, kept in the output folder for --incremental.
+
+For every session the state records a fingerprint of its inputs, the
+allocations, seat map and seats left, and a digest per room of what its
+PDFs show. The next run compares fingerprints to skip untouched sessions
+and compares room digests to redraw only the rooms that changed.
+"""
+
+import hashlib
+import os
+import pickle
+
+
+# Bump whenever a session record changes shape
+STATE_VERSION = 3
+
+STATE_FILE = ".seating_state.pkl"
+
+
+def session_keys(timetable):
+    """
+    A key per timetable entry: (date, session, n), n counting earlier
+    entries with the same date and session, since a day name can come
+    round twice in one timetable.
+    """
+    seen = {}
+    keys = []
+    for date, session, _ in timetable:
+        n = seen.get((date, session), 0)
+        seen[(date, session)] = n + 1
+        keys.append((date, session, n))
+    return keys
+
+
+def _digest(obj):
+    return hashlib.sha1(pickle.dumps(obj, protocol=4)).hexdigest()
+
+
+def session_fingerprint(subject_rolls, room_signature, names, params):
+    """
+    Changes whenever anything the session's outputs depend on changes:
+    the rolls per subject, any room, a seated student's name, or the
+    allocation settings.
+    """
+    return _digest((params, list(subject_rolls.items()), room_signature, names))
+
+
+def room_digests(seat_map, roll_name_map):
+    """
+    { room: digest of its seating and the names printed on its PDFs }
+    """
+    return {
+        room: _digest([(subject, roll, seat, roll_name_map.get(roll, ""))
+                       for subject, roll, seat in entries])
+        for room, entries in seat_map.items()
+    }
+
+
+class RunState:
+    """
+    One pickle of session records under output_folder, keyed by
+    session_keys(). Missing, unreadable or outdated state loads as empty,
+    which simply makes every session run in full.
+    """
+
+    def __init__(self, output_folder, logger=None):
+        self.path = os.path.join(output_folder, STATE_FILE)
+        self.logger = logger
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, "rb") as fh:
+                payload = pickle.load(fh)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Ignoring unreadable run state {self.path}: {e}")
+            return {}
+
+        if payload.get("version") != STATE_VERSION:
+            return {}
+
+        return payload["sessions"]
+
+    def save(self, sessions):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        payload = {"version": STATE_VERSION, "sessions": sessions}
+
+        # Write to a temp file first so a crash never leaves half a state
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+        return self.path
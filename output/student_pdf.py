@@ -0,0 +1,180 @@
+# output/student_pdf.py
+import os
+from itertools import islice
+
+from reportlab.lib.units import mm
+
+from output.pdf_canvas import (
+    BOLD_FONT, FONT, GRID_GREY, MARGIN, PAGE_HEIGHT, PAGE_WIDTH, BinaryCanvas, draw_footer,
+    fit_text,
+)
+from output.photo_index import PhotoIndex
+
+
+SLIPS_PDF = "student_slips.pdf"
+
+# Slips per page as (columns, rows): eight 90 × 66 mm slips on A4
+SLIP_LAYOUT = (2, 4)
+
+PHOTO_WIDTH, PHOTO_HEIGHT = 25 * mm, 30 * mm
+PAD = 4 * mm
+
+LABELS = ["Name", "Roll No.", "Subject", "Room", "Seat", "Date", "Session"]
+LABEL_WIDTH = 16 * mm
+LINE_HEIGHT = 11
+
+
+class _SlipGeometry:
+    """
+    Positions inside one w × h slip, relative to its bottom-left corner.
+    """
+
+    def __init__(self, w, h):
+        self.w, self.h = w, h
+        self.top = h - PAD
+
+        # Photo box, shrunk to fit shorter slips
+        self.photo_h = min(PHOTO_HEIGHT, h - 2 * PAD - 14)
+        self.photo_w = self.photo_h * PHOTO_WIDTH / PHOTO_HEIGHT
+        self.photo_x = w - PAD - self.photo_w
+        self.photo_y = self.top - 14 - self.photo_h
+
+        self.first_line = self.top - 26
+        self.value_x = PAD + LABEL_WIDTH
+        self.value_width = self.photo_x - 2 * PAD - LABEL_WIDTH
+
+
+def _define_slip_forms(c, g):
+    """
+    Everything every slip shares (border, title, labels, signature line)
+    and the "No Photo" box, each stored once as a form and reused.
+    """
+    if c.hasForm("slip"):
+        return
+
+    c.beginForm("slip", lowerx=0, lowery=0, upperx=g.w, uppery=g.h)
+    c.setLineWidth(0.6)
+    c.rect(0, 0, g.w, g.h)
+    c.setFont(BOLD_FONT, 10)
+    c.drawString(PAD, g.top - 10, "IIT Patna – Examination Slip")
+
+    labels = c.beginText(PAD, g.first_line)
+    labels.setFont(BOLD_FONT, 8, LINE_HEIGHT)
+    labels.textLines(LABELS)
+    c.drawText(labels)
+
+    c.setFont(FONT, 7)
+    c.line(g.w - PAD - 40 * mm, PAD + 8, g.w - PAD, PAD + 8)
+    c.drawRightString(g.w - PAD, PAD, "Invigilator's signature")
+    c.endForm()
+
+    c.beginForm("no_photo", lowerx=0, lowery=0, upperx=g.w, uppery=g.h)
+    c.setLineWidth(0.6)
+    c.setStrokeColorRGB(*GRID_GREY)
+    c.rect(g.photo_x, g.photo_y, g.photo_w, g.photo_h)
+    c.setFont(FONT, 7)
+    c.drawCentredString(g.photo_x + g.photo_w / 2, g.photo_y + g.photo_h / 2, "No Photo")
+    c.endForm()
+
+
+def _draw_slip(c, x, y, g, values, photo_path):
+    """
+    One slip with its bottom-left corner at (x, y): the shared form, the
+    student's values next to the labels and the photo (or a placeholder)
+    at the top right.
+    """
+    c.saveState()
+    c.translate(x, y)
+    c.doForm("slip")
+
+    text = c.beginText(g.value_x, g.first_line)
+    text.setFont(FONT, 9, LINE_HEIGHT)
+    text.textLines([fit_text(v, FONT, 9, g.value_width) for v in values])
+    c.drawText(text)
+
+    drawn = False
+    if photo_path:
+        try:
+            c.drawImage(photo_path, g.photo_x, g.photo_y, g.photo_w, g.photo_h)
+            drawn = True
+        except Exception:
+            pass
+    if not drawn:
+        c.doForm("no_photo")
+    c.restoreState()
+
+
+def generate_student_slips_pdf(
+    session_folder: str,
+    room_map: dict,
+    roll_name_map: dict,
+    date: str,
+    session: str,
+    photos_folder: str = None,
+    photo_cache=None,
+    photo_index=None,
+    layout: tuple = SLIP_LAYOUT
+) -> str:
+    """
+    Writes student_slips.pdf: one slip per seated student, several to an
+    A4 page (layout = (columns, rows)), in room and seat order so a cut
+    stack stays sorted by room.
+
+    room_map entries are (subject, roll, seat). Photos are optional;
+    missing photos do NOT break. With a PhotoCache, pre-scaled thumbnails
+    are embedded instead of the original photos. Each photo file is
+    embedded once however many times it is drawn.
+    """
+    os.makedirs(session_folder, exist_ok=True)
+    out_path = os.path.join(session_folder, SLIPS_PDF)
+
+    if photo_index is None:
+        photo_index = PhotoIndex(photos_folder)
+
+    c = BinaryCanvas(out_path, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    c.setTitle(f"Student slips - {date} {session}")
+    draw_slip_pages(c, room_map, roll_name_map, date, session, photo_index, photo_cache,
+                    layout)
+    c.save()
+    return out_path
+
+
+def draw_slip_pages(c, room_map, roll_name_map, date, session, photo_index, photo_cache=None,
+                    layout=SLIP_LAYOUT):
+    """
+    Draws the slips of every student in room_map onto canvas c, ending
+    each page with showPage(). Shared by student_slips.pdf and the
+    session booklet; the slip forms are defined once per canvas, so use
+    one layout per canvas.
+    """
+    columns, rows = layout
+    # Drawn straight from room_map, one page's worth at a time
+    slips = ((room, subject, roll, seat)
+             for room, entries in room_map.items()
+             for subject, roll, seat in entries)
+    total = sum(len(entries) for entries in room_map.values())
+
+    per_page = columns * rows
+    slip_w = (PAGE_WIDTH - 2 * MARGIN) / columns
+    slip_h = (PAGE_HEIGHT - 2 * MARGIN) / rows
+    pages = max(1, -(-total // per_page))
+
+    geometry = _SlipGeometry(slip_w, slip_h)
+    _define_slip_forms(c, geometry)
+
+    for page in range(pages):
+        for n, (room, subject, roll, seat) in enumerate(islice(slips, per_page)):
+            col, row = n % columns, n // columns
+            x = MARGIN + col * slip_w
+            y = PAGE_HEIGHT - MARGIN - (row + 1) * slip_h
+
+            photo_path = photo_index.get(roll)
+            if photo_path and photo_cache is not None:
+                photo_path = photo_cache.thumbnail(photo_path)
+
+            # In LABELS order
+            values = [roll_name_map.get(roll, ""), roll, subject, room, seat, date, session]
+            _draw_slip(c, x, y, geometry, values, photo_path)
+
+        draw_footer(c, f"Student slips - {date} - {session}", page + 1, pages)
+        c.showPage()
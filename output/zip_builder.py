@@ -1,14 +1,77 @@
 # output/zip_builder.py
 import os
+import shutil
 import zipfile
+import zlib
 
 
-def build_zip(output_folder: str, prefix: str = "seating") -> str:
+# Already compressed: deflating them again costs time and saves nothing
+STORED_EXTENSIONS = {
+    ".pdf", ".xlsx", ".zip", ".jpg", ".jpeg", ".png", ".parquet", ".gz",
+}
+
+CHUNK_SIZE = 1 << 20
+
+
+def _compress_type(path):
+    ext = os.path.splitext(path)[1].lower()
+    return zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def _collect_members(output_folder):
+    """
+    { arcname: full_path } for every file under output_folder, except ZIP
+    files and hidden files (run state, temp files).
+    """
+    members = {}
+    for root, dirs, files in os.walk(output_folder):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+
+        for f in sorted(files):
+            if f.lower().endswith(".zip") or f.startswith("."):
+                continue
+
+            full_path = os.path.join(root, f)
+
+            # Relative path inside ZIP — preserves folder hierarchy
+            arcname = os.path.relpath(full_path, start=output_folder).replace(os.sep, "/")
+            members[arcname] = full_path
+    return members
+
+
+def _file_crc(path):
+    crc = 0
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _unchanged(info, path):
+    """
+    True if the archived member still matches the file: same size and
+    CRC. The zip timestamp has a two-second resolution, so a file
+    rewritten within it is caught only by its content.
+    """
+    if info.file_size != os.path.getsize(path):
+        return False
+    return info.CRC == _file_crc(path)
+
+
+def _add_member(zf, full_path, arcname):
+    # Stream the file in chunks instead of reading it whole
+    info = zipfile.ZipInfo.from_file(full_path, arcname)
+    info.compress_type = _compress_type(full_path)
+    with open(full_path, "rb") as src, zf.open(info, "w") as dest:
+        shutil.copyfileobj(src, dest, CHUNK_SIZE)
+
+
+def build_zip(output_folder: str, prefix: str = "seating", update: bool = False) -> str:
     """
     Recursively zip the ENTIRE output folder while preserving the directory tree.
 
     Example final ZIP structure:
-        seating_Sunday_morning_20251203.zip
+        seating_Sunday_morning.zip
             Sunday/
                 Morning/
                     Overall/
@@ -16,35 +79,54 @@ def build_zip(output_folder: str, prefix: str = "seating") -> str:
                     Slips/
                     remaining_seats.xlsx
                     ...
-    """
 
-    os.makedirs(output_folder, exist_ok=True)
+    The archive is <prefix>.zip, so a rerun replaces it instead of adding
+    another. PDFs, xlsx and images are stored, everything else deflated.
 
-    # Timestamp for unique ZIP filename
-    try:
-        from datetime import datetime
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    except Exception:
-        ts = "now"
+    With update=True an existing archive is reused: left alone when no
+    file changed, appended to when files were only added, and rebuilt
+    only when a member changed or disappeared.
+    """
 
-    zip_name = f"{prefix}_{ts}.zip"
-    zip_path = os.path.join(output_folder, zip_name)
+    os.makedirs(output_folder, exist_ok=True)
 
-    # Write ZIP
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+    zip_path = os.path.join(output_folder, f"{prefix}.zip")
+    members = _collect_members(output_folder)
 
-        # Walk through entire output folder
-        for root, dirs, files in os.walk(output_folder):
+    if update and os.path.exists(zip_path):
+        try:
+            with zipfile.ZipFile(zip_path) as zf:
+                archived = {info.filename: info for info in zf.infolist()}
+        except zipfile.BadZipFile:
+            archived = None
 
-            # Skip adding the ZIP file itself
-            files = [f for f in files if not f.lower().endswith(".zip")]
+        if archived is not None:
+            stale = any(
+                name not in members or not _unchanged(info, members[name])
+                for name, info in archived.items()
+            )
+            if not stale:
+                added = [name for name in members if name not in archived]
+                if added:
+                    with zipfile.ZipFile(zip_path, "a") as zf:
+                        for arcname in added:
+                            _add_member(zf, members[arcname], arcname)
+                return zip_path
 
-            for f in files:
-                full_path = os.path.join(root, f)
+    # Write to a hidden temp file first so a crash never leaves a broken
+    # ZIP, and a leftover one is never archived
+    tmp_path = os.path.join(output_folder, f".{prefix}.zip.{os.getpid()}.tmp")
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for arcname, full_path in members.items():
+            _add_member(zf, full_path, arcname)
+    os.replace(tmp_path, zip_path)
 
-                # Relative path inside ZIP — preserves folder hierarchy
-                arcname = os.path.relpath(full_path, start=output_folder)
+    return zip_path
 
-                zf.write(full_path, arcname)
 
-    return zip_path
+def build_run_zip(output_root: str, prefix: str = "seating_all_sessions", update: bool = False) -> str:
+    """
+    One archive of every date and session under output_root, built in a
+    single walk. Per-session ZIPs inside the tree are left out.
+    """
+    return build_zip(output_root, prefix=prefix, update=update)
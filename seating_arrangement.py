@@ -5,43 +5,73 @@ seating_arrangement.py
 Main driver for seating allocation -> output pipeline.
 
 This script:
-  - reads timetable, roll map, room capacities
-  - performs clash checks
+  - loads the input workbook once (timetable, roll map, room capacities)
+  - performs clash checks (and reports every clash in the timetable up front)
   - calls allocator
-  - normalizes allocator output to subject -> (room -> [rolls])
+  - normalizes allocator output to an Allocation, subject -> (room -> [rolls])
   - exports results (Excel + PDFs + organized folders) using output.exporter
 """
 
 import argparse
+import cProfile
 import os
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, List
 
+from input.workbook_loader import load_workbook
+from input.input_cache import DEFAULT_CACHE_DIR
 from input.timetable_reader import TimetableReader
-from input.roll_reader import read_subject_rolls, read_roll_name_map
-from input.room_capacity_reader import read_room_capacity
-
-from allocation.clash_checker import check_clashes
-from allocation.allocator import allocate_students_to_rooms
-
-from output.excel_writer import write_overall_output, write_seats_left
+from input.roll_reader import READER_MODES, read_roll_name_map
+from input.room_capacity_reader import read_room_capacity, read_room_layouts
+
+from allocation.clash_checker import check_clashes, find_all_clashes, summarize_clashes
+from allocation.engine import ALLOCATORS, get_allocator
+from allocation.incremental import reallocate
+from allocation.model import Allocation
+from allocation.seating_grid import assign_seats, build_room_layouts
+
+from output.clash_report import write_clash_report
+from output.excel_writer import (
+    EXCEL_ENGINES, HAS_PARQUET, OUTPUT_FORMATS, ConsolidatedWorkbook,
+    write_seats_left, write_session_output,
+)
+from output.photo_cache import PhotoCache
+from output.photo_index import PhotoIndex
+from output.run_state import RunState, room_digests, session_fingerprint, session_keys
+from output.zip_builder import build_run_zip
 from utils.logger import get_logger
+from utils.profiler import NULL_PROFILER, PROFILE_FILE, Profiler
 
 # Optional exporter (Excel + PDF + folder generation)
 try:
-    from output.exporter import export_all  # type: ignore
+    from output.exporter import PDF_MODES, export_all  # type: ignore
     HAS_EXPORTER = True
 except Exception:
+    PDF_MODES = ("separate", "booklet")
     HAS_EXPORTER = False
 
 
 # ---------------------------------------------------------------
-# NORMALIZER (unchanged, fully preserved)
+# NORMALIZER
 # ---------------------------------------------------------------
-def normalize_allocations(raw: Any, logger: logging.Logger) -> Dict[str, Dict[str, List[str]]]:
+def normalize_allocations(raw: Any, logger: logging.Logger) -> Allocation:
     """
-    Ensure output shape:
+    Ensure output shape: an Allocation, reading as
         { subject: { room: [rolls] } }
+
+    The built-in allocators already return one, which is passed through
+    without another walk over every roll.
+    """
+    if isinstance(raw, Allocation):
+        return raw
+    return Allocation.from_nested(_normalize_nested(raw, logger))
+
+
+def _normalize_nested(raw: Any, logger: logging.Logger) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Other allocator output shapes as { subject: { room: [rolls] } }.
     """
     if isinstance(raw, dict):
         sample_value = None
@@ -123,10 +153,356 @@ def normalize_allocations(raw: Any, logger: logging.Logger) -> Dict[str, Dict[st
     raise TypeError(f"Unsupported allocations type: {type(raw)}")
 
 
+# ---------------------------------------------------------------
+# PER-SESSION PIPELINE
+# ---------------------------------------------------------------
+class PipelineContext:
+    """
+    Everything a session needs once the inputs are loaded. Sessions only
+    read from it, so one copy can be shared by every worker process.
+    """
+
+    def __init__(self, workbook, roll_name_map, room_caps, room_layouts, args):
+        self.workbook = workbook
+        self.roll_name_map = roll_name_map
+        self.room_caps = room_caps
+        self.room_layouts = room_layouts
+        self.output = args.output
+        self.photos = args.photos
+        self.buffer = args.buffer
+        self.mode = args.mode
+        self.allocator = args.allocator
+        self.pdf_workers = args.pdf_workers
+        self.excel_engine = args.excel_engine
+        self.output_format = args.output_format
+        self.profile = args.profile or args.profile_memory
+        self.profile_memory = args.profile_memory
+        self.pdf_mode = args.pdf_mode
+
+        # Anything that changes every session's result when it changes
+        self.params = (args.buffer, args.mode, args.allocator, args.photos, args.output_format,
+                       args.pdf_mode)
+        self.room_signature = {
+            room: (cap, room_layouts[room].rows, room_layouts[room].columns)
+            for room, cap in room_caps.items()
+        }
+
+        # Scanned once here; lookups never touch the photos folder again
+        self.photo_index = PhotoIndex(args.photos) if args.photos else None
+
+        # Thumbnails live next to the input cache and follow --no-cache
+        self.photo_cache = None
+        if args.photos and not args.no_cache:
+            self.photo_cache = PhotoCache(os.path.join(args.cache_dir, "photos"))
+
+
+# Console line printed for each session that does not export cleanly
+STATUS_MESSAGES = {
+    "clash": "\n❌ Clash detected — see log.\n",
+    "allocator_failed": "Allocator failed — check log.",
+    "export_failed": "Export failed — see log.",
+}
+
+
+def _outputs_exist(record):
+    # Every file the session wrote, so a lost room PDF is redrawn too
+    return all(os.path.exists(path) for path in record["outputs"] + record["files"])
+
+
+def _result_files(results):
+    """
+    Flat list of the file paths in an export_all result.
+    """
+    files = []
+    for value in results.values():
+        if isinstance(value, (list, tuple)):
+            files.extend(value)
+        elif value:
+            files.append(value)
+    return files
+
+
+def _no_progress(stage, date=None, session=None, message="", count=None):
+    pass
+
+
+def process_session(date, session, subjects, context, logger, previous=None, progress=None,
+                    profiler=None):
+    """
+    Clash check → allocation → normalization → seating → export for one
+    (date, session). Sessions are independent once inputs are loaded.
+
+    progress(stage, date, session, message, count), if given, is called as
+    the session passes the "clash", "allocate" and "export" stages; count
+    is the students allocated or files exported.
+    profiler, if given, times each stage of the session (--profile).
+
+    previous is this session's record from the last run (--incremental).
+    An unchanged session is skipped; a changed one keeps its students in
+    their rooms where possible and redraws only the rooms that changed.
+
+    Returns {"status": ..., "seats_left": ..., "missing_photos": [...],
+    "files": [...], "state": record or None} where status is "exported", "unchanged",
+    "clash", "allocator_failed" or "export_failed". Without the exporter
+    the caller writes seats_left, since that file is shared by all sessions.
+    """
+    logger.info(f"=== Processing {date} / {session} ===")
+    progress = progress or _no_progress
+    profiler = profiler or NULL_PROFILER
+
+    # Rolls with their ids from the workbook's RollIndex: the clash check
+    # and allocation work on the ids, strings come back at export
+    with profiler.stage("read_rolls", date, session):
+        subject_rolls = context.workbook.roll_index.session(subjects)
+
+    names = {
+        roll: context.roll_name_map.get(roll, "")
+        for rolls in subject_rolls.values() for roll in rolls
+    }
+    fingerprint = session_fingerprint(subject_rolls, context.room_signature, names, context.params)
+
+    if previous is not None and previous["fingerprint"] == fingerprint and _outputs_exist(previous):
+        logger.info("Unchanged since the last run — outputs kept.")
+        return {"status": "unchanged", "seats_left": previous["seats_left"],
+                "missing_photos": previous["missing_photos"], "files": previous["files"],
+                "state": previous}
+
+    # Clash check
+    with profiler.stage("clash", date, session):
+        clash = check_clashes(subjects, subject_rolls)
+    progress("clash", date, session, f"{clash['subject1']} / {clash['subject2']}" if clash else "none")
+    if clash:
+        logger.error(f"❌ CLASH DETECTED: {clash}")
+        return {"status": "clash", "seats_left": None, "missing_photos": [], "files": [],
+                "state": None}
+
+    # Incremental: keep last run's rooms where the inputs still allow it
+    changed_rooms = None
+    if previous is not None and previous["params"] == context.params:
+        with profiler.stage("allocate", date, session):
+            result = reallocate(previous["allocations"], subject_rolls, context.room_caps,
+                                context.buffer, context.mode, logger)
+        if result is not None:
+            allocations_raw, seats_left, changed_rooms = result
+            logger.info(f"Incremental: {len(changed_rooms)} rooms changed since the last run")
+        else:
+            logger.info("Incremental: previous seating cannot absorb the changes, reallocating")
+
+    # Allocation
+    if changed_rooms is None:
+        allocate_students_to_rooms = get_allocator(context.allocator)
+        try:
+            with profiler.stage("allocate", date, session):
+                allocations_raw, seats_left = allocate_students_to_rooms(
+                    subject_rolls=subject_rolls,
+                    room_caps=context.room_caps,
+                    buffer=context.buffer,
+                    mode=context.mode,
+                    logger=logger
+                )
+        except Exception as e:
+            logger.exception("Allocator crashed: %s", e)
+            return {"status": "allocator_failed", "seats_left": None, "missing_photos": [],
+                    "files": [], "state": None}
+
+    # Normalize
+    try:
+        with profiler.stage("normalize", date, session):
+            allocations = normalize_allocations(allocations_raw, logger)
+    except Exception as e:
+        logger.exception("Normalization failure: %s", e)
+        raise
+
+    assigned_total = allocations.size
+    logger.info(f"Total assigned = {assigned_total}")
+    progress("allocate", date, session, f"{assigned_total} students", assigned_total)
+
+    # Seat-level placement: no same-subject neighbours where possible.
+    # Rooms whose roster and grid are as before keep their seating.
+    keep = None
+    if changed_rooms is not None:
+        keep = {
+            room: entries for room, entries in previous["seat_map"].items()
+            if room not in changed_rooms
+            and previous["room_signature"].get(room) == context.room_signature.get(room)
+        }
+    with profiler.stage("seating", date, session):
+        seat_map = assign_seats(allocations, context.room_layouts, logger, keep=keep)
+
+    # Room digests only cover what a room shows; other settings (photos,
+    # PDF mode, output format, ...) change every room's files
+    digests = room_digests(seat_map, context.roll_name_map)
+    only_rooms = None
+    if (previous is not None and previous["params"] == context.params
+            and _outputs_exist(previous)):
+        only_rooms = {room for room, d in digests.items() if previous["rooms"].get(room) != d}
+
+    missing_photos = []
+    if context.photo_index is not None:
+        missing_photos = context.photo_index.missing(allocations.all_rolls())
+        if missing_photos:
+            logger.info(f"{len(missing_photos)} students without a photo")
+
+    # -------------------------------------------------------
+    # EXPORT (Excel + PDFs + folder structure)
+    # -------------------------------------------------------
+    try:
+        if HAS_EXPORTER:
+            logger.info("Using exporter...")
+            results = export_all(
+                context.output,      # ✅ FIXED
+                date,
+                session,
+                allocations,
+                seats_left,
+                context.roll_name_map,
+                context.photos,
+                seat_map,
+                pdf_workers=context.pdf_workers,
+                photo_cache=context.photo_cache,
+                photo_index=context.photo_index,
+                only_rooms=only_rooms,
+                excel_engine=context.excel_engine,
+                output_format=context.output_format,
+                profiler=profiler,
+                pdf_mode=context.pdf_mode
+            )
+            outputs = [results["overall_excel"], results["zip"]]
+            files = _result_files(results)
+
+            # Rooms not redrawn keep last run's PDFs
+            if only_rooms is not None:
+                kept = [p for p in previous["files"] if p not in files and os.path.exists(p)]
+                files = kept + files
+        else:
+            logger.info("Exporter missing — Excel only.")
+            with profiler.stage("excel", date, session):
+                outputs = [write_session_output(context.output, date, session, allocations,
+                                                seat_map, context.roll_name_map,
+                                                context.output_format,
+                                                engine=context.excel_engine)]
+            files = list(outputs)
+
+    except Exception as e:
+        logger.exception("Export failed: %s", e)
+        return {"status": "export_failed", "seats_left": seats_left,
+                "missing_photos": missing_photos, "files": [], "state": None}
+
+    progress("export", date, session, f"{len(files)} files", len(files))
+
+    state = {
+        "fingerprint": fingerprint,
+        "params": context.params,
+        "room_signature": context.room_signature,
+        "allocations": allocations,
+        "seats_left": seats_left,
+        "seat_map": seat_map,
+        "rooms": digests,
+        "missing_photos": missing_photos,
+        "outputs": outputs,
+        "files": files,
+    }
+    return {"status": "exported", "seats_left": seats_left, "missing_photos": missing_photos,
+            "files": files, "state": state}
+
+
+# ---------------------------------------------------------------
+# PROCESS POOL
+# ---------------------------------------------------------------
+_WORKER_CONTEXT = None
+
+
+class _RecordCollector(logging.Handler):
+    """
+    Keeps a worker's log lines so the parent can replay them in
+    timetable order, whatever order the sessions finish in.
+    """
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.setFormatter(logging.Formatter("%(message)s"))
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.levelno, self.format(record)))
+
+
+def _timed_session(date, session, subjects, context, logger, previous, progress=None,
+                   profiler=None):
+    start = time.perf_counter()
+    with (profiler or NULL_PROFILER).stage("session", date, session):
+        result = process_session(date, session, subjects, context, logger, previous, progress,
+                                 profiler)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _init_worker(context):
+    global _WORKER_CONTEXT
+    _WORKER_CONTEXT = context
+
+
+def _run_session_in_worker(task):
+    date, session, subjects, previous = task
+
+    collector = _RecordCollector()
+    logger = logging.getLogger(f"seating_logger.worker.{os.getpid()}")
+    logger.handlers[:] = [collector]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    # Progress events and stage timings travel back with the result, like
+    # the log lines
+    events = []
+    profiler = Profiler(enabled=_WORKER_CONTEXT.profile,
+                        track_memory=_WORKER_CONTEXT.profile_memory)
+    profiler.start()
+    result = _timed_session(date, session, subjects, _WORKER_CONTEXT, logger, previous,
+                            lambda *event: events.append(event), profiler)
+    profiler.stop()
+    return result, collector.records, events, profiler.records
+
+
+def run_sessions(timetable, context, logger, workers=1, previous=None, progress=None,
+                 profiler=None):
+    """
+    Yields ((date, session, subjects), result) in timetable order,
+    fanning sessions out to `workers` processes when workers > 1.
+    previous, if given, holds last run's record for each timetable entry.
+    progress receives each session's stage events (see process_session);
+    profiler gets the stage timings, from worker processes too.
+    """
+    if previous is None:
+        previous = [None] * len(timetable)
+    progress = progress or _no_progress
+    profiler = profiler or NULL_PROFILER
+
+    if workers <= 1 or len(timetable) <= 1:
+        for task, prev in zip(timetable, previous):
+            yield task, _timed_session(*task, context, logger, prev, progress, profiler)
+        return
+
+    # Each task carries only its own session's previous record
+    tasks = [(*task, prev) for task, prev in zip(timetable, previous)]
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(context,)) as pool:
+        # map() returns results in submission order
+        outcomes = pool.map(_run_session_in_worker, tasks)
+        for task, (result, records, events, stages) in zip(timetable, outcomes):
+            for level, message in records:
+                logger.log(level, message)
+            for event in events:
+                progress(*event)
+            profiler.extend(stages)
+            yield task, result
+
+
 # ---------------------------------------------------------------
 # MAIN PIPELINE
 # ---------------------------------------------------------------
-def main():
+def build_parser():
     parser = argparse.ArgumentParser(description="IITP Seating Arrangement Generator")
     parser.add_argument("--input", required=True, help="Input Excel file")
     parser.add_argument("--photos", required=False, default=None,
@@ -135,94 +511,280 @@ def main():
     parser.add_argument("--buffer", type=int, default=0, help="Seat buffer per room")
     parser.add_argument("--mode", choices=["dense", "sparse"], default="dense",
                         help="Seating mode")
+    parser.add_argument("--allocator", choices=list(ALLOCATORS), default="greedy",
+                        help="Allocation strategy")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Sessions processed in parallel (processes)")
+    parser.add_argument("--pdf-workers", type=int, default=1,
+                        help="Room PDFs rendered in parallel per session (processes)")
     parser.add_argument("--log", default="errors.txt", help="Error log file")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Folder for the parsed-input cache and photo thumbnails")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-parse the input workbook and embed full-size photos")
+    parser.add_argument("--reader", choices=READER_MODES, default="pandas",
+                        help="Workbook reader: pandas, or streaming for very large roll sheets")
+    parser.add_argument("--excel-engine", choices=EXCEL_ENGINES, default="pandas",
+                        help="Excel writer: pandas, or streaming (openpyxl write-only, constant memory)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default="xlsx",
+                        help="Session reports as xlsx (per room), or csv/parquet/jsonl "
+                             "with one row per student")
+    parser.add_argument("--consolidated-excel", action="store_true",
+                        help="Also write all_sessions.xlsx: every session's allocation and "
+                             "seats left in one workbook")
+    parser.add_argument("--pdf-mode", choices=PDF_MODES, default="separate",
+                        help="PDFs per room and a slips file (separate), or one bookmarked "
+                             "booklet per session with every room's seating list, attendance "
+                             "sheet and slips (booklet)")
+    parser.add_argument("--run-zip", action="store_true",
+                        help="Also bundle every date and session into seating_all_sessions.zip")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Redo only sessions and rooms whose inputs changed since the last run")
+    parser.add_argument("--clash-report", default=None,
+                        help="Where to write the clash report, .csv or .json "
+                             "(default <output>/clash_report.csv)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Time every stage; writes <output>/{PROFILE_FILE} and prints "
+                             f"a summary")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Like --profile, and also track each stage's peak memory "
+                             "(tracemalloc; makes the run several times slower)")
+    parser.add_argument("--cprofile", default=None, metavar="PATH",
+                        help="Also dump cProfile stats of the main process to PATH "
+                             "(open with pstats or snakeviz)")
+    return parser
+
+
+def pipeline_options(output, **options):
+    """
+    The options main() would parse, as a Namespace, with the CLI defaults
+    for everything not given. Keys are the option names with underscores
+    (photos, buffer, mode, allocator, workers, no_cache, ...).
+    """
+    args = build_parser().parse_args(["--input", "-", "--output", output])
+    for name, value in options.items():
+        if not hasattr(args, name) or name in ("input", "output"):
+            raise TypeError(f"Unknown pipeline option: {name}")
+        setattr(args, name, value)
+    return args
 
-    args = parser.parse_args()
-    logger = get_logger(args.log)
 
-    os.makedirs(args.output, exist_ok=True)
+def run_pipeline(source, output, logger=None, workbook=None, progress=None, **options):
+    """
+    Runs the whole pipeline in this process and returns its results.
+
+    source: path, bytes or binary file object of the input workbook.
+    workbook: an already loaded WorkbookData, used instead of parsing
+              source (lets a caller cache parsed uploads).
+    progress: progress(stage, date, session, message, count) is called
+              with "read" and "clash" for the whole run, then per session
+              with "clash", "allocate", "export" and finally "session"
+              (its status), in timetable order. message is for people;
+              count is the number behind it where there is one (sessions
+              for "read", findings for the run's "clash", students for
+              "allocate", files for "export"), else None.
+    options: see pipeline_options().
+
+    RETURNS
+    {
+        "summary": { status: sessions },
+        "sessions": [
+            {"date", "session", "status", "allocations", "seat_map",
+             "seats_left", "files", "seconds"},    # in timetable order;
+                                                   # allocations is an Allocation
+            ...
+        ],
+        "clashes": [Clash],
+        "files": { "clash_report": path, "consolidated_excel": path, "run_zip": path,
+                   "run_profile": path },
+        "missing_photos": [rolls],
+        "timings": { "load": s, "clashes": s, "sessions": s, "total": s },
+        "profile": Profiler.report() with profile or profile_memory, else None,
+    }
+    """
+    args = pipeline_options(output, **options)
+    if logger is None:
+        logger = logging.getLogger("seating_logger")
+    return _run(source, args, logger, workbook, progress)
+
 
-    logger.info("Reading timetable...")
-    timetable = TimetableReader(args.input).read()
+def _run(source, args, logger, workbook=None, progress=None):
+    start = time.perf_counter()
+    timings = {}
+    progress = progress or _no_progress
+    profiler = NULL_PROFILER
+    if args.profile or args.profile_memory:
+        profiler = Profiler(track_memory=args.profile_memory)
+    profiler.start()
 
-    logger.info("Reading roll-name map...")
-    roll_name_map = read_roll_name_map(args.input)
+    os.makedirs(args.output, exist_ok=True)
 
-    logger.info("Reading room capacities...")
-    room_caps = read_room_capacity(args.input)
+    # Parse the workbook once; every reader below answers from memory
+    if workbook is None:
+        logger.info("Loading input workbook...")
+        cache_dir = None if args.no_cache else args.cache_dir
+        with profiler.stage("load"):
+            workbook = load_workbook(source, logger, cache_dir=cache_dir, mode=args.reader)
+
+    with profiler.stage("read"):
+        logger.info("Reading timetable...")
+        timetable = TimetableReader(workbook).read()
+
+        logger.info("Reading roll-name map...")
+        roll_name_map = read_roll_name_map(workbook)
+
+        logger.info("Reading room capacities...")
+        room_caps = read_room_capacity(workbook)
+        room_layouts = build_room_layouts(room_caps, read_room_layouts(workbook))
+    timings["load"] = time.perf_counter() - start
+    progress("read", None, None, f"{len(timetable)} sessions, {len(room_caps)} rooms",
+             len(timetable))
+
+    # Every clash, back-to-back and same-day exam in one pass, before any
+    # session is skipped for clashing
+    logger.info("Checking the whole timetable for clashes...")
+    mark = time.perf_counter()
+    with profiler.stage("clash_report"):
+        clashes = find_all_clashes(timetable, workbook.course_rolls, workbook.roll_index)
+        clash_report = args.clash_report or os.path.join(args.output, "clash_report.csv")
+        write_clash_report(clash_report, clashes)
+    for kind, (count, students) in summarize_clashes(clashes).items():
+        logger.info(f"{kind}: {count} exam pairs, {students} students")
+    logger.info(f"Clash report written: {clash_report}")
+    timings["clashes"] = time.perf_counter() - mark
+    progress("clash", None, None, f"{len(clashes)} findings", len(clashes))
+
+    with profiler.stage("photo_index"):
+        context = PipelineContext(workbook, roll_name_map, room_caps, room_layouts, args)
+    if context.photo_index is not None:
+        logger.info(f"Indexed {len(context.photo_index)} photos in {args.photos}")
 
     logger.info("Starting seating allocation pipeline...")
+    if args.workers > 1:
+        logger.info(f"Processing sessions with {args.workers} worker processes")
+
+    # Every run records its results; --incremental starts from them
+    run_state = RunState(args.output, logger)
+    keys = session_keys(timetable)
+    previous = None
+    if args.incremental:
+        saved = run_state.load()
+        previous = [saved.get(key) for key in keys]
+        logger.info(f"Incremental run: {len(saved)} sessions recorded by the last run")
 
     # timetable: [(date, session, [subjects])]
-    for (date, session, subjects) in timetable:
-        logger.info(f"=== Processing {date} / {session} ===")
-
-        subject_rolls = {
-            subj: read_subject_rolls(args.input, subj)
-            for subj in subjects
-        }
-
-        # Clash check
-        clash = check_clashes(subjects, subject_rolls)
-        if clash:
-            logger.error(f"❌ CLASH DETECTED: {clash}")
-            print("\n❌ Clash detected — see log.\n")
-            continue
+    mark = time.perf_counter()
+    summary = {}
+    sessions = []
+    missing_photos = set()
+    sessions_state = {}
+    files = {"clash_report": clash_report}
+    consolidated = None
+    if args.consolidated_excel:
+        consolidated = ConsolidatedWorkbook(os.path.join(args.output, "all_sessions.xlsx"))
+
+    results = run_sessions(timetable, context, logger, args.workers, previous, progress,
+                           profiler)
+    for key, ((date, session, subjects), result) in zip(keys, results):
+        status = result["status"]
+        state = result["state"]
+        session_files = list(result["files"])
+        if state is not None:
+            sessions_state[key] = state
+            if consolidated is not None:
+                with profiler.stage("consolidated", date, session):
+                    consolidated.add_session(date, session, state["allocations"],
+                                             state["seats_left"], state["seat_map"])
+
+        # Shared by all sessions, so written here in timetable order
+        if status in ("exported", "unchanged") and not HAS_EXPORTER:
+            try:
+                with profiler.stage("excel", date, session):
+                    session_files.append(write_seats_left(
+                        args.output, result["seats_left"], date, session,
+                        engine=args.excel_engine, output_format=args.output_format
+                    ))
+            except Exception as e:
+                logger.exception("Export failed: %s", e)
+                status = "export_failed"
+
+        summary[status] = summary.get(status, 0) + 1
+        progress("session", date, session, status)
+        missing_photos.update(result["missing_photos"])
+        sessions.append({
+            "date": date,
+            "session": session,
+            "status": status,
+            "allocations": state["allocations"] if state else None,
+            "seat_map": state["seat_map"] if state else None,
+            "seats_left": result["seats_left"],
+            "files": session_files,
+            "seconds": result["seconds"],
+        })
+
+    with profiler.stage("run_state"):
+        run_state.save(sessions_state)
+    timings["sessions"] = time.perf_counter() - mark
+
+    if consolidated is not None:
+        with profiler.stage("consolidated"):
+            files["consolidated_excel"] = consolidated.close()
+        logger.info(f"Consolidated workbook written: {files['consolidated_excel']}")
+
+    if args.run_zip:
+        with profiler.stage("zip"):
+            files["run_zip"] = build_run_zip(args.output, update=True)
+        logger.info(f"Run archive written: {files['run_zip']}")
+
+    logger.info(
+        "Sessions: " + ", ".join(f"{count} {status}" for status, count in sorted(summary.items()))
+    )
+    if context.photo_index is not None:
+        logger.info(f"Students without a photo: {len(missing_photos)}")
+
+    timings["total"] = time.perf_counter() - start
+
+    profile = None
+    if profiler.enabled:
+        profiler.stop()
+        files["run_profile"] = profiler.write(os.path.join(args.output, PROFILE_FILE))
+        profile = profiler.report()
+        logger.info("Run profile:\n" + profiler.summary_table())
+        logger.info(f"Run profile written: {files['run_profile']}")
+
+    return {
+        "summary": summary,
+        "sessions": sessions,
+        "clashes": clashes,
+        "files": files,
+        "missing_photos": sorted(missing_photos),
+        "timings": timings,
+        "profile": profile,
+    }
 
-        # Allocation
-        try:
-            allocations_raw, seats_left = allocate_students_to_rooms(
-                subject_rolls=subject_rolls,
-                room_caps=room_caps,
-                buffer=args.buffer,
-                mode=args.mode,
-                logger=logger
-            )
-        except Exception as e:
-            logger.exception("Allocator crashed: %s", e)
-            print("Allocator failed — check log.")
-            continue
 
-        # Normalize
-        try:
-            allocations = normalize_allocations(allocations_raw, logger)
-        except Exception as e:
-            logger.exception("Normalization failure: %s", e)
-            raise
-
-        # Validate
-        assigned_total = 0
-        for subj, room_map in allocations.items():
-            for room, rolls in room_map.items():
-                if not isinstance(rolls, list):
-                    raise TypeError(f"Room lists must be list, found {type(rolls)}")
-                assigned_total += len(rolls)
-        logger.info(f"Total assigned = {assigned_total}")
-
-        # -------------------------------------------------------
-        # EXPORT (Excel + PDFs + folder structure)
-        # -------------------------------------------------------
-        try:
-            if HAS_EXPORTER:
-                logger.info("Using exporter...")
-                export_all(
-                    args.output,         # ✅ FIXED
-                    date,
-                    session,
-                    allocations,
-                    seats_left,
-                    roll_name_map,
-                    args.photos
-                )
-            else:
-                logger.info("Exporter missing — Excel only.")
-                write_overall_output(args.output, date, session, allocations)
-                write_seats_left(args.output, seats_left)
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.output_format == "parquet" and not HAS_PARQUET:
+        parser.error("--output-format parquet needs pyarrow or fastparquet installed")
+    logger = get_logger(args.log)
 
-        except Exception as e:
-            logger.exception("Export failed: %s", e)
-            print("Export failed — see log.")
-            continue
+    if args.cprofile:
+        # Worker processes (--workers, --pdf-workers) are not included
+        stats = cProfile.Profile()
+        result = stats.runcall(_run, args.input, args, logger)
+        stats.dump_stats(args.cprofile)
+        logger.info(f"cProfile stats written: {args.cprofile}")
+    else:
+        result = _run(args.input, args, logger)
+
+    for entry in result["sessions"]:
+        if entry["status"] in STATUS_MESSAGES:
+            print(STATUS_MESSAGES[entry["status"]])
+
+    if result["missing_photos"]:
+        print(f" {len(result['missing_photos'])} students have no photo — see log.")
 
     print("\n Seating arrangement completed!")
     print(" Outputs stored in:", args.output)
@@ -1,10 +1,38 @@
-import streamlit as st
-import tempfile
-import subprocess
+import hashlib
 import os
+import time
+
+import streamlit as st
+
+from input.workbook_loader import load_workbook
+from utils.job_queue import JobQueue
 
 st.set_page_config(page_title="IITP Seating Arrangement Generator", layout="centered")
 
+# Seconds between status refreshes while a job is running
+POLL_INTERVAL = 2
+
+
+@st.cache_data(show_spinner=False)
+def parse_upload(upload_hash, _data):
+    """
+    Parsed workbook for an upload, cached by content hash so re-clicking
+    with the same file skips parsing. _data is not hashed by Streamlit.
+    """
+    return load_workbook(_data)
+
+
+@st.cache_resource
+def job_queue():
+    # One queue per server process, shared by every browser session
+    return JobQueue(workers=int(os.environ.get("SEATING_JOB_WORKERS", "2")))
+
+
+def _rerun():
+    # st.rerun replaced st.experimental_rerun in newer Streamlit releases
+    getattr(st, "rerun", None) or st.experimental_rerun()
+
+
 st.title("📚 IIT Patna – Seating Arrangement Generator")
 st.write("Upload your exam files and generate seating PDFs + Excel reports.")
 
@@ -14,90 +42,96 @@ output_folder = st.text_input("Output Folder", value="output")
 buffer = st.number_input("Buffer", min_value=0, max_value=25, value=5)
 mode = st.selectbox("Seating Mode", ["dense", "sparse"])
 
+queue = job_queue()
+my_jobs = st.session_state.setdefault("jobs", [])
+
 if st.button("Generate Seating Arrangement"):
     if not uploaded_excel:
         st.error("❌ Please upload an Excel file.")
         st.stop()
 
-    # Save Excel temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-        tmp.write(uploaded_excel.read())
-        tmp_path = tmp.name
-
-    cmd = [
-        "python", "seating_arrangement.py",
-        "--input", tmp_path,
-        "--photos", photos_folder,
-        "--output", output_folder,
-        "--buffer", str(buffer),
-        "--mode", mode
-    ]
-
-    st.info("⚙️ Running backend… This may take a minute.")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    data = uploaded_excel.getvalue()
+    upload_hash = hashlib.sha256(data).hexdigest()
 
-    # ---------------------------
-    # CLEAN OUTPUT UI
-    # ---------------------------
+    try:
+        workbook = parse_upload(upload_hash, data)
+    except Exception as e:
+        st.error(f"⚠️ Could not read the workbook: {e}")
+        st.stop()
 
-    if "completed" in result.stdout.lower():
-        st.success("✅ Seating arrangement completed successfully!\nOutputs stored in the output folder.")
+    # Each job gets its own folder under the output folder
+    job_id = queue.submit(
+        data,
+        name=uploaded_excel.name,
+        output_root=output_folder,
+        workbook=workbook,
+        photos=photos_folder,
+        buffer=int(buffer),
+        mode=mode,
+        run_zip=True,
+    )
+    my_jobs.insert(0, job_id)
+    st.info(f"⚙️ Job {job_id} queued — progress below.")
+
+# ---------------------------
+# JOB STATUS
+# ---------------------------
+
+active = False
+for job_id in my_jobs:
+    job = queue.status(job_id)
+    if job is None:
+        continue
+
+    st.subheader(f"🗂 {job['name'] or job_id}  ·  {job['status']}")
+
+    total = job["sessions_total"] or 0
+    done = job["sessions_done"]
+    if job["status"] in ("queued", "running"):
+        active = True
+        st.progress(done / total if total else 0.0, text=f"{done} of {total or '?'} sessions")
+    elif job["status"] == "failed":
+        st.error(f"⚠️ Job failed: {job['error']}")
     else:
-        st.error("⚠️ Something went wrong. Expand logs for details.")
-
-    # Collapsible logs (hidden by default)
-    with st.expander("📄 Backend Logs (click to expand)", expanded=False):
-        st.text(result.stdout)
-        if result.stderr:
-            st.text("\n[ERROR STREAM]\n" + result.stderr)
+        failed = {s: n for s, n in job["summary"].items() if s not in ("exported", "unchanged")}
+        if failed:
+            st.warning("⚠️ Some sessions were not exported: "
+                       + ", ".join(f"{n} {s}" for s, n in failed.items()))
+        else:
+            st.success(f"✅ Completed in {job['finished'] - job['started']:.1f} s. "
+                       f"Outputs stored in {job['output']}.")
+
+    # Collapsible progress log (hidden by default)
+    with st.expander("📄 Progress (click to expand)", expanded=False):
+        st.text("\n".join(
+            f"{e['stage']:<9} {e['date'] or ''} {e['session'] or ''} {e['message']}"
+            for e in queue.events(job_id)
+        ))
+        log_path = os.path.join(job["output"], "pipeline.log")
+        if os.path.exists(log_path):
+            with open(log_path, encoding="utf-8", errors="replace") as fh:
+                st.text(fh.read())
 
     # ---------------------------
-    # SHOW DOWNLOADABLE FILES
+    # DOWNLOAD
     # ---------------------------
 
-    if os.path.exists(output_folder):
-        st.subheader("📥 Download Generated Files")
-
-        files = os.listdir(output_folder)
-        excel_files = [f for f in files if f.endswith(".xlsx")]
-        pdf_files = [f for f in files if f.endswith(".pdf")]
-        zip_files = [f for f in files if f.endswith(".zip")]
-
-        # Excel Downloads
-        if excel_files:
-            st.write("### 📊 Excel Reports")
-            for f in excel_files:
-                full_path = os.path.join(output_folder, f)
-                with open(full_path, "rb") as fp:
-                    st.download_button(
-                        label=f"⬇️ Download {f}",
-                        data=fp,
-                        file_name=f,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
-
-        # PDF Downloads
-        if pdf_files:
-            st.write("### 📘 Room-wise PDFs")
-            for f in pdf_files:
-                full_path = os.path.join(output_folder, f)
-                with open(full_path, "rb") as fp:
-                    st.download_button(
-                        label=f"⬇️ Download {f}",
-                        data=fp,
-                        file_name=f,
-                        mime="application/pdf"
-                    )
-
-        # ZIP Files
-        if zip_files:
-            st.write("### 📦 All Files (ZIP)")
-            for f in zip_files:
-                full_path = os.path.join(output_folder, f)
-                with open(full_path, "rb") as fp:
-                    st.download_button(
-                        label=f"⬇️ Download {f}",
-                        data=fp,
-                        file_name=f,
-                        mime="application/zip"
-                    )
+    # One archive of every date and session, opened only once the job is
+    # done: each poll reruns this page, and a button per PDF would read
+    # them all every time
+    archive = job["archive"]
+    if job["status"] == "done" and archive and os.path.exists(archive):
+        st.write(f"Individual files are in {job['output']}.")
+        with open(archive, "rb") as fp:
+            st.download_button(
+                label=f"📦 Download all files ({os.path.basename(archive)})",
+                data=fp,
+                file_name=f"{job_id}_{os.path.basename(archive)}",
+                key=f"{job_id}:archive",
+                mime="application/zip"
+            )
+
+# Poll while any of this browser's jobs is still going
+if active:
+    time.sleep(POLL_INTERVAL)
+    _rerun()
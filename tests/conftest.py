@@ -0,0 +1,66 @@
+import base64
+import copy
+import os
+import re
+import zlib
+
+import pytest
+from PIL import Image
+
+from input.workbook_loader import load_workbook
+
+
+SAMPLE_WORKBOOK = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input_data_tt.xlsx")
+
+
+@pytest.fixture(scope="session")
+def sample():
+    """
+    The sample workbook shipped with the repo, parsed once.
+    """
+    return load_workbook(SAMPLE_WORKBOOK)
+
+
+@pytest.fixture
+def one_session(sample):
+    """
+    The sample with only its first timetable entry, for whole pipeline
+    runs that need not take every session.
+    """
+    workbook = copy.copy(sample)
+    workbook.timetable = sample.timetable[:1]
+    return workbook
+
+
+def make_photos(folder, rolls):
+    """
+    A small JPEG named after each roll in folder; returns folder.
+    """
+    os.makedirs(folder, exist_ok=True)
+    for roll in rolls:
+        Image.new("RGB", (60, 80), (120, 80, 40)).save(os.path.join(folder, f"{roll}.jpg"))
+    return str(folder)
+
+
+def pdf_page_count(path):
+    with open(path, "rb") as fh:
+        return len(re.findall(rb"/Type /Page\b", fh.read()))
+
+
+def pdf_text(path):
+    """
+    Every content stream of the PDF at path, inflated and joined, for
+    checking which strings were drawn.
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    chunks = []
+    for head, stream in re.findall(rb"<<(.*?)>>\s*stream\r?\n(.*?)endstream", data, re.S):
+        if b"/Subtype /Image" in head:
+            continue
+        if b"/ASCII85Decode" in head:
+            stream = base64.a85decode(stream.strip().removesuffix(b"~>"))
+        if b"/FlateDecode" in head:
+            stream = zlib.decompress(stream)
+        chunks.append(stream)
+    return b"\n".join(chunks).decode("latin-1")
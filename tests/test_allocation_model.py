@@ -0,0 +1,98 @@
+import pickle
+
+import pytest
+
+from allocation.allocator import allocate_students_to_rooms
+from allocation.model import Allocation
+from allocation.seating_grid import assign_seats, build_room_layouts
+
+
+NESTED = {
+    "CS101": {"R2": ["2101CS01", "2101CS02"], "R1": ["2101CS03"]},
+    "MA102": {},
+    "EE103": {"R1": ["2102EE01", "2102EE02", "2102EE03"]},
+}
+
+
+def test_from_nested_round_trips_in_order():
+    allocation = Allocation.from_nested(NESTED)
+
+    assert allocation.to_nested() == NESTED
+    assert list(allocation) == list(NESTED)
+    for subject, room_data in NESTED.items():
+        assert list(allocation[subject]) == list(room_data)
+    assert allocation.size == 6
+    assert list(allocation.all_rolls()) == [
+        roll for room_data in NESTED.values() for rolls in room_data.values() for roll in rolls
+    ]
+
+
+def test_views_read_like_the_nested_dict():
+    allocation = Allocation.from_nested(NESTED)
+
+    assert allocation == NESTED
+    assert allocation["CS101"]["R2"] == ["2101CS01", "2101CS02"]
+    assert allocation["CS101"]["R2"][1:] == ["2101CS02"]
+    assert len(allocation["EE103"]["R1"]) == 3
+    assert dict(allocation["MA102"]) == {}
+    with pytest.raises(KeyError):
+        allocation["XX999"]
+    with pytest.raises(KeyError):
+        allocation["EE103"]["R2"]
+
+
+def test_allocator_output_round_trips(sample):
+    for _, _, subjects in sample.timetable:
+        subject_rolls = sample.roll_index.session(subjects)
+        allocation, _ = allocate_students_to_rooms(subject_rolls, sample.room_capacity)
+        nested = allocation.to_nested()
+
+        assert Allocation.from_nested(nested).to_nested() == nested
+        assert Allocation.from_nested(nested) == allocation
+        for subject, rolls in subject_rolls.items():
+            seated = [r for room_rolls in nested[subject].values() for r in room_rolls]
+            assert seated == rolls
+
+
+def test_seat_map_matches_the_allocation(sample):
+    layouts = build_room_layouts(sample.room_capacity, sample.room_layouts)
+    _, _, subjects = sample.timetable[0]
+    allocation, _ = allocate_students_to_rooms(sample.roll_index.session(subjects),
+                                               sample.room_capacity)
+    seat_map = assign_seats(allocation, layouts)
+
+    assert list(seat_map) == list(allocation.rooms)
+    for room, entries in seat_map.items():
+        entries = list(entries)
+        assert entries == list(allocation.room(room))
+        seats = [seat for _, _, seat in entries]
+        assert len(set(seats)) == len(seats) and all(seats)
+
+        expected = sorted((subject, roll) for subject, room_data in allocation.items()
+                          for r, rolls in room_data.items() if r == room for roll in rolls)
+        assert sorted((subject, roll) for subject, roll, _ in entries) == expected
+
+    # Each roll's seat reads the same through the subject view
+    by_roll = {roll: seat for entries in seat_map.values() for _, roll, seat in entries}
+    for room_data in allocation.values():
+        for rolls in room_data.values():
+            assert rolls.seats() == [by_roll[roll] for roll in rolls]
+
+
+def test_pickle_keeps_only_the_sessions_rolls(sample):
+    layouts = build_room_layouts(sample.room_capacity, sample.room_layouts)
+    _, _, subjects = sample.timetable[0]
+    allocation, _ = allocate_students_to_rooms(sample.roll_index.session(subjects),
+                                               sample.room_capacity)
+    seat_map = assign_seats(allocation, layouts)
+
+    restored = pickle.loads(pickle.dumps(allocation))
+
+    assert len(restored.roll_table) == allocation.size < len(allocation.roll_table)
+    assert restored.to_nested() == allocation.to_nested()
+    assert {room: list(e) for room, e in restored.seat_map().items()} == \
+        {room: list(e) for room, e in seat_map.items()}
+    # A single view travels as a plain list
+    rolls = next(rolls for room_data in allocation.values() for rolls in room_data.values())
+    assert pickle.loads(pickle.dumps(rolls)) == list(rolls)
+    assert type(pickle.loads(pickle.dumps(rolls))) is list
@@ -0,0 +1,155 @@
+import csv
+import json
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from output.excel_writer import (
+    HAS_PARQUET, SEATS_LEFT_COLUMNS, STUDENT_COLUMNS, ConsolidatedWorkbook, write_seats_left,
+    write_session_output,
+)
+from seating_arrangement import run_pipeline
+from tests.conftest import SAMPLE_WORKBOOK
+
+ALLOCATIONS = {
+    "CS101": {"R1": ["A1", "A2"], "R2": ["A3"]},
+    "MA102": {"R1": ["B1"]},
+}
+SEAT_MAP = {
+    "R1": [("CS101", "A1", "1"), ("CS101", "A2", "3"), ("MA102", "B1", "2")],
+    "R2": [("CS101", "A3", "1")],
+}
+
+
+NAMES = {"A1": "Asha", "A2": "Bela", "A3": "Chen", "B1": "Dev"}
+
+FORMATS = [
+    "csv",
+    "jsonl",
+    pytest.param("parquet", marks=pytest.mark.skipif(not HAS_PARQUET,
+                                                     reason="no parquet engine")),
+]
+
+
+def read_table(path, output_format):
+    """(columns, rows) of a csv, jsonl or parquet file, values as strings."""
+    if output_format == "csv":
+        with open(path, encoding="utf-8", newline="") as fh:
+            columns, *rows = list(csv.reader(fh))
+        return columns, rows
+    if output_format == "jsonl":
+        with open(path, encoding="utf-8") as fh:
+            records = [json.loads(line) for line in fh]
+        columns = list(records[0])
+        assert all(list(record) == columns for record in records)
+        return columns, [[str(v) for v in record.values()] for record in records]
+    df = pd.read_parquet(path)
+    return list(df.columns), df.astype(str).values.tolist()
+
+
+def sheet_rows(path):
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return {name: [list(row) for row in wb[name].iter_rows(values_only=True)]
+                for name in wb.sheetnames}
+    finally:
+        wb.close()
+
+
+def test_consolidated_workbook_sheets(tmp_path):
+    path = str(tmp_path / "all_sessions.xlsx")
+    with ConsolidatedWorkbook(path) as book:
+        book.add_session("Monday", "morning", ALLOCATIONS, {"R1": 5, "R2": 0}, SEAT_MAP)
+        book.add_session("Monday", "evening", {"CS101": {"R2": ["A4"]}}, {"R2": 7})
+
+    sheets = sheet_rows(path)
+
+    assert list(sheets) == ["Overall", "Left Monday morning", "Left Monday evening"]
+    assert sheets["Overall"] == [
+        ["Date", "Session", "Subject", "Room", "Count", "Roll_Numbers", "Seats"],
+        ["Monday", "morning", "CS101", "R1", 2, "A1;A2", "1;3"],
+        ["Monday", "morning", "CS101", "R2", 1, "A3", "1"],
+        ["Monday", "morning", "MA102", "R1", 1, "B1", "2"],
+        ["Monday", "evening", "CS101", "R2", 1, "A4", None],
+    ]
+    assert sheets["Left Monday morning"] == [["Room", "Seats_Left"], ["R1", 5], ["R2", 0]]
+    assert sheets["Left Monday evening"] == [["Room", "Seats_Left"], ["R2", 7]]
+
+
+def test_consolidated_sheet_names_are_valid_and_unique(tmp_path):
+    path = str(tmp_path / "all_sessions.xlsx")
+    long_date = "Wednesday 2024/05/15 [makeup]"
+    with ConsolidatedWorkbook(path) as book:
+        book.add_session(long_date, "afternoon", ALLOCATIONS, {"R1": 1})
+        book.add_session(long_date, "afternoon", ALLOCATIONS, {"R1": 2})
+
+    names = list(sheet_rows(path))[1:]
+
+    assert len(set(names)) == 2
+    assert all(len(name) <= 31 and not set(name) & set("[]:*?/\\") for name in names)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "streaming"])
+def test_pipeline_consolidates_every_session(tmp_path, one_session, engine):
+    output = str(tmp_path / "out")
+    result = run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session,
+                          consolidated_excel=True, excel_engine=engine)
+
+    sheets = sheet_rows(result["files"]["consolidated_excel"])
+    session = result["sessions"][0]
+    overall = sheets["Overall"][1:]
+
+    assert list(sheets) == ["Overall", f"Left {session['date']} {session['session']}"]
+    assert sum(row[4] for row in overall) == sum(
+        len(rolls) for rooms in session["allocations"].values() for rolls in rooms.values())
+    assert {(row[2], row[3]) for row in overall} == {
+        (subject, room) for subject, rooms in session["allocations"].items() for room in rooms}
+    assert dict(sheets[list(sheets)[1]][1:]) == dict(session["seats_left"])
+
+
+@pytest.mark.parametrize("output_format", FORMATS)
+def test_student_table_schema(tmp_path, output_format):
+    path = write_session_output(str(tmp_path), "Monday", "morning", ALLOCATIONS, SEAT_MAP,
+                                roll_name_map=NAMES, output_format=output_format)
+
+    columns, rows = read_table(path, output_format)
+
+    assert path.endswith(f"Monday_morning_students.{output_format}")
+    assert columns == STUDENT_COLUMNS
+    assert rows == [
+        ["Monday", "morning", "CS101", "R1", "1", "A1", "Asha"],
+        ["Monday", "morning", "CS101", "R1", "3", "A2", "Bela"],
+        ["Monday", "morning", "CS101", "R2", "1", "A3", "Chen"],
+        ["Monday", "morning", "MA102", "R1", "2", "B1", "Dev"],
+    ]
+
+
+@pytest.mark.parametrize("output_format", FORMATS)
+def test_seats_left_schema(tmp_path, output_format):
+    path = write_seats_left(str(tmp_path), {"R1": 5, "R2": 0}, "Monday", "morning",
+                            output_format=output_format)
+
+    columns, rows = read_table(path, output_format)
+
+    assert path.endswith(f"Monday_morning_remaining_seats.{output_format}")
+    assert columns == SEATS_LEFT_COLUMNS
+    assert rows == [["R1", "5"], ["R2", "0"]]
+
+
+def test_student_table_leaves_unknown_seats_and_names_empty(tmp_path):
+    path = write_session_output(str(tmp_path), "Monday", "morning", {"CS101": {"R2": ["Z9"]}},
+                                output_format="jsonl")
+
+    with open(path, encoding="utf-8") as fh:
+        assert [json.loads(line) for line in fh] == [
+            {"date": "Monday", "session": "morning", "subject": "CS101", "room": "R2",
+             "seat": "", "roll": "Z9", "name": ""},
+        ]
+
+
+@pytest.mark.skipif(HAS_PARQUET, reason="a parquet engine is installed")
+def test_parquet_without_an_engine_is_refused(tmp_path):
+    with pytest.raises(RuntimeError, match="pyarrow or fastparquet"):
+        write_session_output(str(tmp_path), "Monday", "morning", ALLOCATIONS,
+                             output_format="parquet")
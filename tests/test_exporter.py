@@ -0,0 +1,85 @@
+import os
+import re
+
+import pytest
+
+from output.booklet_pdf import booklet_name
+from output.exporter import export_all
+from seating_arrangement import run_pipeline
+from tests.conftest import SAMPLE_WORKBOOK
+
+
+def _session_folder(one_session, output):
+    date, session, _ = one_session.timetable[0]
+    return os.path.join(output, date, session)
+
+
+def _pdfs(folder, prefix):
+    return {name for name in os.listdir(folder) if name.startswith(prefix) and name.endswith(".pdf")}
+
+
+def _rooms(result):
+    return list(result["sessions"][0]["seat_map"])
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_booklet_then_separate_draws_every_room(one_session, tmp_path, incremental):
+    output = str(tmp_path / "out")
+    folder = _session_folder(one_session, output)
+
+    run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session, pdf_mode="booklet")
+    result = run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session, pdf_mode="separate",
+                          incremental=incremental)
+
+    rooms = _rooms(result)
+    assert _pdfs(folder, "room_") == {f"room_{room}.pdf" for room in rooms}
+    assert _pdfs(folder, "attendance_") == {f"attendance_{room}.pdf" for room in rooms}
+    assert _pdfs(folder, "student_slips")
+    assert not _pdfs(folder, "booklet_")
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_separate_then_booklet_replaces_the_room_pdfs(one_session, tmp_path, incremental):
+    output = str(tmp_path / "out")
+    folder = _session_folder(one_session, output)
+    date, session, _ = one_session.timetable[0]
+
+    run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session)
+    run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session, pdf_mode="booklet",
+                 incremental=incremental)
+
+    assert _pdfs(folder, "") == {booklet_name(date, session)}
+
+
+def test_booklet_holds_every_room_with_its_sections(one_session, tmp_path):
+    output = str(tmp_path / "out")
+    date, session, _ = one_session.timetable[0]
+    result = run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session, pdf_mode="booklet")
+
+    with open(os.path.join(_session_folder(one_session, output), booklet_name(date, session)),
+              "rb") as fh:
+        pdf = fh.read()
+
+    titles = [t.replace(b"\\", b"").decode() for t in re.findall(rb"/Title \(((?:[^)\\]|\\.)*)\)", pdf)]
+    seat_map = result["sessions"][0]["seat_map"]
+    expected = [f"Session booklet - {date} {session}"]
+    for room, entries in seat_map.items():
+        expected += [f"Room {room} ({len(entries)} students)",
+                     "Seating list", "Attendance sheet", "Student slips"]
+    assert titles == expected
+    assert len(re.findall(rb"/Type /Page\b", pdf)) >= 3 * len(seat_map)
+
+
+def test_separate_export_replacing_a_booklet_ignores_only_rooms(one_session, tmp_path):
+    output = str(tmp_path / "out")
+    folder = _session_folder(one_session, output)
+    date, session, _ = one_session.timetable[0]
+    result = run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session, pdf_mode="booklet")
+    record = result["sessions"][0]
+
+    files = export_all(output, date, session, record["allocations"], record["seats_left"],
+                       one_session.roll_name_map, seat_map=record["seat_map"],
+                       only_rooms=set(), pdf_mode="separate")
+
+    assert len(files["attendance_pdfs"]) == len(record["seat_map"])
+    assert not _pdfs(folder, "booklet_")
@@ -0,0 +1,129 @@
+import copy
+import os
+import time
+
+import pytest
+
+from allocation.allocator import allocate_students_to_rooms, apply_buffer
+from allocation.incremental import reallocate
+from seating_arrangement import run_pipeline
+from tests.conftest import SAMPLE_WORKBOOK, make_photos
+
+
+@pytest.mark.parametrize("mode", ["dense", "sparse"])
+def test_reallocate_keeps_an_unchanged_session(sample, mode):
+    for _, _, subjects in sample.timetable:
+        subject_rolls = sample.roll_index.session(subjects)
+        full, full_left = allocate_students_to_rooms(subject_rolls, sample.room_capacity, 2, mode)
+
+        allocations, seats_left, changed = reallocate(full, subject_rolls, sample.room_capacity,
+                                                      2, mode)
+
+        assert allocations == full.to_nested()
+        assert seats_left == full_left
+        assert changed == set()
+
+
+@pytest.mark.parametrize("mode", ["dense", "sparse"])
+def test_reallocate_seats_newcomers_like_a_full_run(sample, mode):
+    caps = apply_buffer(sample.room_capacity, 2)
+    for _, _, subjects in sample.timetable:
+        subject_rolls = sample.roll_index.session(subjects)
+        previous, _ = allocate_students_to_rooms(subject_rolls, sample.room_capacity, 2, mode)
+
+        # Every other subject loses a tenth of its students and gains as many
+        changed_rolls = {}
+        for i, (subject, rolls) in enumerate(subject_rolls.items()):
+            rolls = list(rolls)
+            if i % 2 == 0:
+                cut = len(rolls) // 10
+                rolls = rolls[cut:] + [f"NEW{subject}{n}" for n in range(cut)]
+            changed_rolls[subject] = rolls
+
+        allocations, seats_left, _ = reallocate(previous, changed_rolls, sample.room_capacity,
+                                                2, mode)
+        _, full_left = allocate_students_to_rooms(changed_rolls, sample.room_capacity, 2, mode)
+
+        for subject, rolls in changed_rolls.items():
+            seated = [r for room_rolls in allocations[subject].values() for r in room_rolls]
+            assert sorted(seated) == sorted(rolls)
+        assert all(seats_left[room] >= 0 for room in caps)
+        assert sum(seats_left.values()) == sum(full_left.values())
+
+
+def test_reallocate_fills_a_room_as_far_as_the_allocator_does():
+    # Sparse mode lets the allocator fill a room in several takes; the
+    # newcomers belong in the room their subject already sits in
+    previous = {"A": {"R1": ["a1", "a2", "a3", "a4", "a5"]}}
+    subject_rolls = {"A": ["a1", "a2", "a3", "a4", "a5", "a6", "a7", "a8"]}
+
+    full, _ = allocate_students_to_rooms(subject_rolls, {"R1": 10}, mode="sparse")
+    allocations, seats_left, changed = reallocate(previous, subject_rolls, {"R1": 10},
+                                                  mode="sparse")
+
+    assert allocations == full.to_nested() == {"A": {"R1": subject_rolls["A"]}}
+    assert seats_left == {"R1": 2}
+    assert changed == {"R1"}
+
+
+def test_incremental_run_matches_a_clean_run(sample, tmp_path):
+    # A renamed student redoes the sessions they sit without moving anyone
+    renamed = copy.copy(sample)
+    renamed.roll_name_map = dict(sample.roll_name_map)
+    first_subject = sample.timetable[0][2][0]
+    renamed.roll_name_map[sample.course_rolls[first_subject][0]] = "Renamed Student"
+
+    clean = run_pipeline(SAMPLE_WORKBOOK, str(tmp_path / "clean"), workbook=renamed)
+    run_pipeline(SAMPLE_WORKBOOK, str(tmp_path / "incremental"), workbook=sample)
+    incremental = run_pipeline(SAMPLE_WORKBOOK, str(tmp_path / "incremental"),
+                               workbook=renamed, incremental=True)
+
+    statuses = {s["status"] for s in incremental["sessions"]}
+    assert statuses == {"exported", "unchanged"}
+    for a, b in zip(clean["sessions"], incremental["sessions"]):
+        assert (a["date"], a["session"]) == (b["date"], b["session"])
+        assert a["allocations"] == b["allocations"]
+        assert a["seat_map"] == b["seat_map"]
+        assert a["seats_left"] == b["seats_left"]
+
+
+def _session_pdfs(output, prefix):
+    found = {}
+    for root, _, names in os.walk(output):
+        for name in names:
+            if name.startswith(prefix) and name.endswith(".pdf"):
+                path = os.path.join(root, name)
+                found[path] = os.stat(path).st_mtime_ns
+    return found
+
+
+def test_incremental_run_redraws_rooms_when_photos_are_added(one_session, tmp_path):
+    output = str(tmp_path / "out")
+    subjects = one_session.timetable[0][2]
+    rolls = [roll for subject in subjects for roll in one_session.course_rolls[subject]]
+    photos = make_photos(tmp_path / "photos", rolls)
+
+    run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session)
+    before = _session_pdfs(output, "attendance_")
+    time.sleep(0.01)
+    run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session, incremental=True, photos=photos)
+    after = _session_pdfs(output, "attendance_")
+
+    assert before and set(after) == set(before)
+    for path, mtime in after.items():
+        assert mtime != before[path]
+        with open(path, "rb") as fh:
+            assert b"/Subtype /Image" in fh.read()
+
+
+@pytest.mark.parametrize("prefix", ["attendance_", "room_"])
+def test_incremental_run_restores_a_lost_room_file(one_session, tmp_path, prefix):
+    output = str(tmp_path / "out")
+    run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session)
+    lost = sorted(_session_pdfs(output, prefix))[0]
+    os.remove(lost)
+
+    result = run_pipeline(SAMPLE_WORKBOOK, output, workbook=one_session, incremental=True)
+
+    assert os.path.exists(lost)
+    assert lost in result["sessions"][0]["files"]
@@ -0,0 +1,71 @@
+import os
+import shutil
+
+import openpyxl
+import pytest
+
+from input.workbook_loader import WorkbookLoader, load_workbook
+from tests.conftest import SAMPLE_WORKBOOK
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Counts how often the workbook is actually parsed."""
+    calls = []
+    parse = WorkbookLoader.parse
+
+    def counting(self):
+        calls.append(self.filepath)
+        return parse(self)
+
+    monkeypatch.setattr(WorkbookLoader, "parse", counting)
+    return calls
+
+
+def entries(cache_dir):
+    return sorted(f for f in os.listdir(cache_dir) if f.endswith(".pkl"))
+
+
+def test_second_load_is_a_cache_hit(tmp_path, parses, sample):
+    cache_dir = str(tmp_path / "cache")
+
+    first = load_workbook(SAMPLE_WORKBOOK, cache_dir=cache_dir)
+    second = load_workbook(SAMPLE_WORKBOOK, cache_dir=cache_dir, mode="streaming")
+
+    assert len(parses) == 1
+    assert len(entries(cache_dir)) == 1
+    for workbook in (first, second):
+        assert workbook.timetable == sample.timetable
+        assert workbook.course_rolls == sample.course_rolls
+        assert workbook.room_capacity == sample.room_capacity
+
+
+def test_changed_workbook_misses_the_cache(tmp_path, parses):
+    cache_dir = str(tmp_path / "cache")
+    path = str(tmp_path / "input.xlsx")
+    shutil.copy(SAMPLE_WORKBOOK, path)
+    load_workbook(path, cache_dir=cache_dir)
+
+    wb = openpyxl.load_workbook(path)
+    sheet = wb["in_room_capacity"]
+    sheet.cell(row=2, column=2).value = 99
+    room = sheet.cell(row=2, column=1).value
+    wb.save(path)
+    workbook = load_workbook(path, cache_dir=cache_dir)
+
+    assert len(parses) == 2
+    assert len(entries(cache_dir)) == 2
+    assert workbook.room_capacity[str(room)] == 99
+
+
+def test_unreadable_entry_is_a_miss(tmp_path, parses):
+    cache_dir = str(tmp_path / "cache")
+    load_workbook(SAMPLE_WORKBOOK, cache_dir=cache_dir)
+    entry = os.path.join(cache_dir, entries(cache_dir)[0])
+    with open(entry, "wb") as fh:
+        fh.write(b"not a pickle")
+
+    workbook = load_workbook(SAMPLE_WORKBOOK, cache_dir=cache_dir)
+
+    assert len(parses) == 2
+    assert workbook.timetable
@@ -0,0 +1,156 @@
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from tests.conftest import SAMPLE_WORKBOOK
+from utils.job_queue import JobQueue, _JobProgress, _db, _process_owner
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(db_path=str(tmp_path / "jobs.sqlite"), output_root=str(tmp_path / "out"),
+                     workers=1)
+    yield queue
+    queue.shutdown()
+
+
+def insert_job(queue, job_id, status, owner):
+    with _db(queue.db_path) as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, status, output, created, owner) VALUES (?, ?, '', ?, ?)",
+            (job_id, status, time.time(), owner),
+        )
+
+
+def wait_for(queue, job_id, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.status(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.2)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+def test_session_total_comes_from_the_event_count(queue):
+    insert_job(queue, "j1", "running", queue.owner)
+    progress = _JobProgress(queue.db_path, "j1")
+
+    progress("read", None, None, "Loaded: thirteen sessions", 13)
+    progress("session", "Monday", "morning", "exported")
+
+    job = queue.status("j1")
+    assert (job["sessions_total"], job["sessions_done"]) == (13, 1)
+    assert [e["count"] for e in queue.events("j1")] == [13, None]
+
+
+def test_start_up_only_fails_jobs_of_exited_servers(queue, tmp_path):
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    host = _process_owner().rpartition(":")[0]
+
+    insert_job(queue, "mine", "running", queue.owner)
+    insert_job(queue, "other-host", "queued", "elsewhere:1")
+    insert_job(queue, "orphan", "running", f"{host}:{exited.pid}")
+
+    JobQueue(db_path=queue.db_path, workers=1).shutdown()
+
+    assert queue.status("mine")["status"] == "running"
+    assert queue.status("other-host")["status"] == "queued"
+    assert queue.status("orphan")["status"] == "failed"
+
+
+def test_crashed_worker_fails_the_job(queue):
+    insert_job(queue, "crashed", "running", queue.owner)
+    future = Future()
+    future.set_exception(BrokenProcessPool("worker died"))
+
+    queue._job_ended("crashed", future)
+
+    job = queue.status("crashed")
+    assert job["status"] == "failed"
+    assert "BrokenProcessPool" in job["error"]
+
+
+def break_pool(queue):
+    pool = queue.pool
+    pool.submit(os.getpid).result()
+    for process in list(pool._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+    deadline = time.time() + 30
+    while not pool._broken and time.time() < deadline:
+        time.sleep(0.05)
+    assert pool._broken
+    return pool
+
+
+def test_crashed_worker_renews_the_pool(queue):
+    broken = break_pool(queue)
+    future = Future()
+    future.set_exception(BrokenProcessPool("worker died"))
+
+    queue._job_ended("crashed", future, broken)
+    queue._job_ended("crashed", future, broken)
+
+    assert queue.pool is not broken
+    assert queue.pool.submit(os.getpid).result() > 0
+
+
+def test_jobs_submitted_after_a_crash_still_run(queue, tmp_path):
+    broken = break_pool(queue)
+
+    job = wait_for(queue, queue.submit(str(tmp_path / "missing.xlsx")))
+
+    assert queue.pool is not broken
+    assert job["status"] == "failed"
+    assert "BrokenProcessPool" not in job["error"]
+
+
+def test_job_the_pool_refuses_is_failed_not_left_queued(queue):
+    queue.pool.shutdown()
+
+    job = queue.status(queue.submit(SAMPLE_WORKBOOK))
+
+    assert job["status"] == "failed"
+    assert "RuntimeError" in job["error"]
+
+
+def test_old_databases_gain_the_new_columns(tmp_path):
+    db_path = str(tmp_path / "old.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, name TEXT, status TEXT NOT NULL, "
+        "output TEXT NOT NULL, created REAL NOT NULL, started REAL, finished REAL, "
+        "sessions_total INTEGER, sessions_done INTEGER NOT NULL DEFAULT 0, summary TEXT, "
+        "files TEXT, error TEXT);"
+        "CREATE TABLE events (job_id TEXT NOT NULL, seq INTEGER NOT NULL, time REAL NOT NULL, "
+        "stage TEXT NOT NULL, date TEXT, session TEXT, message TEXT, "
+        "PRIMARY KEY (job_id, seq));"
+        "INSERT INTO jobs (id, status, output, created) VALUES ('old', 'running', '', 0);"
+    )
+    conn.commit()
+    conn.close()
+
+    queue = JobQueue(db_path=db_path, workers=1)
+    queue.shutdown()
+
+    job = queue.status("old")
+    assert job["status"] == "failed"
+    assert "owner" in job and "archive" in job
+
+
+def test_job_runs_the_sample_and_offers_its_archive(queue):
+    job_id = queue.submit(SAMPLE_WORKBOOK, name="sample", run_zip=True, no_cache=True)
+    job = wait_for(queue, job_id)
+
+    assert job["status"] == "done", job["error"]
+    assert job["sessions_total"] == job["sessions_done"] == 13
+    assert job["archive"] and os.path.exists(job["archive"])
+    assert queue.events(job_id)[0]["stage"] == "read"
@@ -0,0 +1,37 @@
+import pytest
+
+from allocation.allocator import allocate_students_to_rooms
+from allocation.packing import _PlanSearch, allocate_ffd, allocate_optimal
+
+
+def _cost(allocations):
+    rooms = {room for room_data in allocations.values() for room in room_data}
+    return len(rooms), sum(len(room_data) for room_data in allocations.values())
+
+
+@pytest.mark.parametrize("mode", ["dense", "sparse"])
+def test_optimal_never_worse_than_heuristics_on_sample(sample, mode):
+    for _, _, subjects in sample.timetable:
+        subject_rolls = sample.roll_index.session(subjects)
+        optimal, _ = allocate_optimal(subject_rolls, sample.room_capacity, mode=mode)
+        ffd, _ = allocate_ffd(subject_rolls, sample.room_capacity, mode=mode)
+        greedy, _ = allocate_students_to_rooms(subject_rolls, sample.room_capacity, mode=mode,
+                                               mix=False)
+
+        assert _cost(optimal) <= min(_cost(ffd), _cost(greedy))
+        assert sorted(optimal.all_rolls()) == sorted(greedy.all_rolls())
+
+
+def test_search_keeps_both_subjects_whole():
+    # ffd puts 40 into the 50-seat room and has to split 50 over two
+    # rooms; swapping them fits both whole in the two largest rooms
+    caps = {"A": 50, "B": 45, "C": 10}
+    incumbent = {"X": [("A", 40)], "Y": [("B", 45), ("C", 5)]}
+    search = _PlanSearch([("Y", 50), ("X", 40)], caps, "dense", incumbent, node_limit=1_000)
+
+    plan, exact = search.run()
+
+    assert exact
+    assert plan == {"Y": [("A", 50)], "X": [("B", 40)]}
+    # Once a plan meets the lower bound every other branch is pruned
+    assert search.nodes < 10
@@ -0,0 +1,45 @@
+import os
+
+from PIL import Image
+from reportlab import rl_config
+from reportlab.pdfgen import canvas
+
+from output.pdf_canvas import BinaryCanvas
+
+
+def make_photo(folder, roll, suffix):
+    path = os.path.join(folder, f"{roll}{suffix}")
+    Image.new("RGB", (60, 80), (120, 80, 40)).save(path)
+    return path
+
+
+def draw(c, photos):
+    c.beginForm("frame")
+    c.rect(10, 10, 100, 50)
+    c.endForm()
+    for i, photo in enumerate(photos * 2):
+        c.doForm("frame")
+        c.drawImage(photo, 20 + 70 * i, 700, 60, 80)
+    c.drawString(20, 650, "Roll 2101CS01")
+    c.showPage()
+    c.save()
+
+
+def test_binary_canvas_leaves_the_global_setting_alone(tmp_path):
+    photos = [make_photo(tmp_path, "A1", ".jpg"), make_photo(tmp_path, "A2", ".png")]
+    assert rl_config.useA85
+
+    binary = BinaryCanvas(str(tmp_path / "binary.pdf"))
+    # A plain canvas in use at the same time (another thread's job, say)
+    plain = canvas.Canvas(str(tmp_path / "plain.pdf"))
+    draw(binary, photos)
+    draw(plain, photos)
+
+    assert rl_config.useA85
+    binary_pdf = (tmp_path / "binary.pdf").read_bytes()
+    plain_pdf = (tmp_path / "plain.pdf").read_bytes()
+    assert b"ASCII85Decode" not in binary_pdf
+    assert b"ASCII85Decode" in plain_pdf
+    assert len(binary_pdf) < len(plain_pdf)
+    # Each photo file is embedded once however often it is drawn
+    assert binary_pdf.count(b"/Subtype /Image") == 2
@@ -0,0 +1,47 @@
+import os
+
+from PIL import Image
+
+from output import photo_cache as photo_cache_module
+from output.photo_cache import PhotoCache
+
+
+def make_photo(folder, roll):
+    path = os.path.join(folder, f"{roll}.jpg")
+    Image.new("RGB", (300, 400), (120, 80, 40)).save(path)
+    return path
+
+
+def test_each_photo_is_looked_up_once_per_run(tmp_path, monkeypatch):
+    photos = [make_photo(tmp_path, roll) for roll in ("A1", "A2")]
+    cache = PhotoCache(str(tmp_path / "thumbs"))
+
+    stats = []
+    real_stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        if str(path) in photos:
+            stats.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(photo_cache_module.os, "stat", counting_stat)
+
+    # Every generator of every session asks again
+    thumbs = [cache.thumbnail(path) for _ in range(5) for path in photos]
+
+    assert sorted(stats) == sorted(photos)
+    assert all(thumb and os.path.exists(thumb) for thumb in thumbs)
+    assert cache.thumbnail(str(tmp_path / "missing.jpg")) is None
+
+
+def test_subset_carries_only_the_given_lookups(tmp_path):
+    photos = [make_photo(tmp_path, roll) for roll in ("B1", "B2")]
+    cache = PhotoCache(str(tmp_path / "thumbs"))
+    first = cache.thumbnail(photos[0])
+    cache.thumbnail(photos[1])
+
+    worker = cache.subset([photos[0]])
+
+    assert worker.size_px == cache.size_px
+    assert worker._thumbnails == {photos[0]: first}
+    assert len(cache._thumbnails) == 2
@@ -0,0 +1,30 @@
+import tracemalloc
+
+from utils.profiler import Profiler
+
+
+def test_profile_times_stages_without_tracing_memory():
+    profiler = Profiler()
+    profiler.start()
+    with profiler.stage("allocate", "Monday", "morning"):
+        assert not tracemalloc.is_tracing()
+    profiler.stop()
+
+    report = profiler.report()
+    assert report["track_memory"] is False
+    assert report["peak_kib"] is None
+    assert [(r["stage"], r["peak_kib"]) for r in report["stages"]] == [("allocate", None)]
+
+
+def test_profile_memory_records_stage_peaks():
+    profiler = Profiler(track_memory=True)
+    profiler.start()
+    with profiler.stage("read"):
+        block = bytearray(2**20)
+    profiler.stop()
+    del block
+
+    report = profiler.report()
+    assert report["track_memory"] is True
+    assert report["stages"][0]["peak_kib"] >= 1024
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,74 @@
+import openpyxl
+import pytest
+
+from input.workbook_loader import load_workbook
+from tests.conftest import SAMPLE_WORKBOOK
+
+
+def _awkward_workbook(path):
+    """
+    The sample's timetable and rooms with roll sheets that trip up a naive
+    reader: numeric rolls in a column with blanks, blank rows, padding.
+    """
+    source = openpyxl.load_workbook(SAMPLE_WORKBOOK, read_only=True)
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name in ("in_timetable", "in_room_capacity"):
+        sheet = wb.create_sheet(name)
+        for row in source[name].iter_rows(values_only=True):
+            sheet.append(row)
+    source.close()
+
+    rolls = wb.create_sheet("in_course_roll_mapping")
+    rolls.append(["rollno", "register_sem", "schedule_sem", "course_code"])
+    rolls.append([1234, 1, 1, "CS101"])
+    rolls.append([1235.0, 1, 1, "CS101"])
+    rolls.append(["  2101CS01 ", 1, 1, "CS101"])
+    rolls.append([None, None, None, None])
+    rolls.append([None, 1, 1, "CS102"])
+    rolls.append([5678, 1, 1, 1001])
+    rolls.append([12.5, 1, 1, "CS102"])
+
+    names = wb.create_sheet("in_roll_name_mapping")
+    names.append(["Roll", "Name"])
+    for row in ([1234, "A"], [None, None], [1235, None], ["2101CS01", 42], [5678, True]):
+        names.append(row)
+
+    wb.save(path)
+    return path
+
+
+def _assert_same(a, b):
+    assert a.course_rolls == b.course_rolls
+    assert a.roll_name_map == b.roll_name_map
+    assert a.room_capacity == b.room_capacity
+    assert a.timetable == b.timetable
+
+
+def test_readers_agree_on_sample():
+    _assert_same(
+        load_workbook(SAMPLE_WORKBOOK, mode="pandas"),
+        load_workbook(SAMPLE_WORKBOOK, mode="streaming"),
+    )
+
+
+def test_readers_agree_on_awkward_cells(tmp_path):
+    path = _awkward_workbook(tmp_path / "awkward.xlsx")
+    pandas_wb = load_workbook(path, mode="pandas")
+    streaming_wb = load_workbook(path, mode="streaming")
+
+    _assert_same(pandas_wb, streaming_wb)
+    assert pandas_wb.course_rolls["CS101"] == ["1234", "1235", "2101CS01"]
+    assert pandas_wb.roll_name_map["1234"] == "A"
+
+
+@pytest.mark.parametrize("first, second", [("pandas", "streaming"), ("streaming", "pandas")])
+def test_cache_entry_serves_either_mode(tmp_path, first, second):
+    path = _awkward_workbook(tmp_path / "awkward.xlsx")
+    cache_dir = tmp_path / "cache"
+
+    written = load_workbook(path, cache_dir=cache_dir, mode=first)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    _assert_same(load_workbook(path, cache_dir=cache_dir, mode=second), written)
+    _assert_same(written, load_workbook(path, mode=second))
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from allocation.clash_checker import check_clashes, find_all_clashes
+from allocation.engine import ALLOCATORS
+from input.roll_index import RollIndex
+
+
+def random_term(rng):
+    """
+    (timetable, course_rolls) with small roll pools, so courses share
+    students and sessions clash often; some timetabled courses have no
+    rolls at all.
+    """
+    pool = [f"R{i:03d}" for i in range(rng.randint(1, 40))]
+    timetable, course_rolls = [], {}
+    for _ in range(rng.randint(0, 6)):
+        codes = [rng.choice("ABCDEFG") + str(rng.randint(0, 3)) for _ in range(rng.randint(0, 4))]
+        for code in codes:
+            if rng.random() < 0.85 and code not in course_rolls:
+                course_rolls[code] = sorted(rng.choice(pool) for _ in range(rng.randint(0, 12)))
+        timetable.append((rng.choice(["D1", "D2", "D3"]), rng.choice(["Morning", "Evening"]), codes))
+    return timetable, course_rolls
+
+
+def test_encode_decode_round_trip(sample):
+    index = sample.roll_index
+    for code, rolls in sample.course_rolls.items():
+        ids = index.course(code)
+        assert index.decode(ids) == rolls
+        assert index.encode(rolls).tolist() == ids.tolist()
+    assert list(index.rolls) == sorted(index.rolls)
+
+
+def test_clash_checks_agree_on_strings_and_ids():
+    rng = random.Random(1)
+    for _ in range(300):
+        timetable, course_rolls = random_term(rng)
+        index = RollIndex(course_rolls)
+
+        assert find_all_clashes(timetable, course_rolls) == \
+            find_all_clashes(timetable, course_rolls, index)
+
+        for _, _, codes in timetable:
+            by_string = check_clashes(codes, {c: list(course_rolls.get(c, [])) for c in codes})
+            by_id = check_clashes(codes, index.session(codes))
+            if by_string is not None:
+                by_string["roll_numbers"] = sorted(by_string["roll_numbers"])
+            assert by_string == by_id
+
+
+def test_sample_clashes_agree_on_strings_and_ids(sample):
+    assert find_all_clashes(sample.timetable, sample.course_rolls) == \
+        find_all_clashes(sample.timetable, sample.course_rolls, sample.roll_index)
+
+
+@pytest.mark.parametrize("name", list(ALLOCATORS))
+@pytest.mark.parametrize("mode", ["dense", "sparse", "mixed"])
+def test_allocators_agree_on_strings_and_ids(sample, name, mode):
+    allocate = ALLOCATORS[name]
+    for _, _, subjects in sample.timetable:
+        by_id = sample.roll_index.session(subjects)
+        by_string = {subject: list(rolls) for subject, rolls in by_id.items()}
+
+        id_allocations, id_left = allocate(by_id, sample.room_capacity, 2, mode)
+        string_allocations, string_left = allocate(by_string, sample.room_capacity, 2, mode)
+
+        assert id_allocations.to_nested() == string_allocations.to_nested()
+        assert list(id_allocations.to_nested()) == list(string_allocations.to_nested())
+        assert id_left == string_left
+
+
+@pytest.mark.parametrize("name", list(ALLOCATORS))
+def test_allocators_agree_when_rooms_run_short(name):
+    allocate = ALLOCATORS[name]
+    rng = random.Random(7)
+    for _ in range(100):
+        timetable, course_rolls = random_term(rng)
+        index = RollIndex(course_rolls)
+        rooms = {f"X{i}": rng.randint(1, 15) for i in range(rng.randint(1, 6))}
+        for _, _, codes in timetable:
+            codes = list(dict.fromkeys(codes))
+            by_id = index.session(codes)
+            by_string = {code: list(rolls) for code, rolls in by_id.items()}
+            mode = rng.choice(["dense", "sparse"])
+
+            id_allocations, id_left = allocate(by_id, rooms, 0, mode)
+            string_allocations, string_left = allocate(by_string, rooms, 0, mode)
+
+            assert id_allocations.to_nested() == string_allocations.to_nested()
+            assert id_left == string_left
@@ -0,0 +1,54 @@
+import os
+import re
+
+import pytest
+
+from output.room_pdf import _rows_per_page, generate_room_pdfs, render_room_pdf
+from tests.conftest import pdf_page_count, pdf_text
+
+FIRST, REST = _rows_per_page(True), _rows_per_page(False)
+
+
+def entries(n, subjects=("CS101", "MA102")):
+    return [(subjects[i % len(subjects)], f"R{i:03d}", str(i + 1)) for i in range(n)]
+
+
+@pytest.mark.parametrize("rows, pages", [
+    (0, 1), (1, 1), (FIRST, 1), (FIRST + 1, 2), (FIRST + REST, 2), (FIRST + REST + 1, 3),
+])
+def test_room_pdf_pages(tmp_path, rows, pages):
+    path = render_room_pdf(str(tmp_path / "room.pdf"), "6101", entries(rows), {}, "Monday",
+                           "morning")
+
+    text = pdf_text(path)
+
+    assert pdf_page_count(path) == pages
+    assert text.count("Roll Number") == pages
+    assert f"(Page {pages} of {pages})" in text
+
+
+def test_room_pdf_lists_every_student_in_seat_order(tmp_path):
+    students = entries(FIRST + 5)
+    names = {"R000": "Asha", "R038": "Bela"}
+    path = render_room_pdf(str(tmp_path / "room.pdf"), "6101", students, names, "Monday",
+                           "morning")
+
+    text = pdf_text(path)
+    drawn = re.findall(r"\((R\d{3})\)", text)
+
+    assert drawn == [roll for _, roll, _ in students]
+    assert "(Asha)" in text and "(Bela)" in text
+    assert f"{len(students)} students" in text
+    assert f"CS101: {(len(students) + 1) // 2}, MA102: {len(students) // 2}" in text
+    assert b"/Title (Room 6101 - Monday morning)" in (tmp_path / "room.pdf").read_bytes()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_room_pdfs_come_back_in_room_order(tmp_path, workers):
+    room_map = {"6103": entries(3), "6101": entries(FIRST + 1), "6102": entries(1)}
+
+    paths = generate_room_pdfs(str(tmp_path), room_map, {}, "Monday", "morning", workers)
+
+    assert [os.path.basename(p) for p in paths] == ["room_6103.pdf", "room_6101.pdf",
+                                                    "room_6102.pdf"]
+    assert [pdf_page_count(p) for p in paths] == [1, 2, 1]
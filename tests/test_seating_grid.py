@@ -0,0 +1,73 @@
+import re
+
+import pytest
+
+from allocation.allocator import allocate_students_to_rooms
+from allocation.kernels import spread_runs
+from allocation.seating_grid import RoomLayout, assign_seats, build_room_layouts, place_room
+
+
+def same_subject_pairs(seat_map):
+    """
+    Adjacent (left/right, front/back) seats holding the same subject.
+    """
+    pairs = 0
+    for entries in seat_map.values():
+        grid = {}
+        for subject, _, seat in entries:
+            row, col = map(int, re.fullmatch(r"R(\d+)C(\d+)", seat).groups())
+            grid[row, col] = subject
+        for (row, col), subject in grid.items():
+            pairs += grid.get((row, col + 1)) == subject
+            pairs += grid.get((row + 1, col)) == subject
+    return pairs
+
+
+def test_place_room_keeps_half_full_subject_apart():
+    entries = [("A", f"a{i}") for i in range(15)] + [("B", f"b{i}") for i in range(15)]
+    placed, conflicts = place_room(entries, RoomLayout(room="R", rows=5, columns=6))
+
+    assert conflicts == 0
+    assert sorted(roll for _, roll, _, _ in placed) == sorted(roll for _, roll in entries)
+
+
+def test_spread_runs_keeps_room_totals_and_subject_sizes():
+    subjects, rooms, counts = spread_runs([50, 30, 20], [60, 40])
+
+    table = {(s, r): c for s, r, c in zip(subjects.tolist(), rooms.tolist(), counts.tolist())}
+    assert table == {(0, 0): 30, (0, 1): 20, (1, 0): 18, (1, 1): 12, (2, 0): 12, (2, 1): 8}
+    # Subject order, each subject's rooms in order
+    assert list(zip(subjects.tolist(), rooms.tolist())) == sorted(table)
+
+
+@pytest.mark.parametrize("mode", ["dense", "sparse"])
+def test_mixing_keeps_who_sits_and_how_full_rooms_are(sample, mode):
+    for _, _, subjects in sample.timetable:
+        subject_rolls = sample.roll_index.session(subjects)
+        mixed, mixed_left = allocate_students_to_rooms(subject_rolls, sample.room_capacity,
+                                                       mode=mode)
+        grouped, grouped_left = allocate_students_to_rooms(subject_rolls, sample.room_capacity,
+                                                           mode=mode, mix=False)
+
+        assert mixed_left == grouped_left
+        assert sorted(mixed.all_rolls()) == sorted(grouped.all_rolls())
+        for subject in subjects:
+            assert sum(map(len, mixed[subject].values())) == len(subject_rolls[subject])
+
+
+def test_mixing_removes_same_subject_neighbours_on_sample(sample):
+    layouts = build_room_layouts(sample.room_capacity, sample.room_layouts)
+    grouped_pairs = mixed_pairs = 0
+
+    for _, _, subjects in sample.timetable:
+        subject_rolls = sample.roll_index.session(subjects)
+        grouped, _ = allocate_students_to_rooms(subject_rolls, sample.room_capacity, mix=False)
+        mixed, _ = allocate_students_to_rooms(subject_rolls, sample.room_capacity)
+
+        grouped_pairs += same_subject_pairs(assign_seats(grouped, layouts))
+        mixed_pairs += same_subject_pairs(assign_seats(mixed, layouts))
+
+    # No subject holds half of any session, so mixed rooms can keep
+    # every subject apart
+    assert grouped_pairs > 0
+    assert mixed_pairs == 0
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from output.photo_cache import PhotoCache
+from output.student_pdf import generate_student_slips_pdf
+from tests.conftest import make_photos, pdf_page_count, pdf_text
+
+ROOM_MAP = {
+    "6101": [("CS101", f"A{i:02d}", str(i + 1)) for i in range(11)],
+    "6102": [("MA102", f"B{i:02d}", str(i + 1)) for i in range(6)],
+}
+ROLLS = [roll for entries in ROOM_MAP.values() for _, roll, _ in entries]
+
+
+@pytest.mark.parametrize("layout, pages", [((2, 4), 3), ((3, 5), 2), ((1, 1), 17)])
+def test_slips_are_laid_out_n_up(tmp_path, layout, pages):
+    path = generate_student_slips_pdf(str(tmp_path), ROOM_MAP, {}, "Monday", "morning",
+                                      layout=layout)
+
+    text = pdf_text(path)
+
+    assert pdf_page_count(path) == pages
+    assert f"(Page {pages} of {pages})" in text
+    # Room and seat order, so a cut stack stays sorted by room
+    assert re.findall(r"\(([AB]\d{2})\)", text) == ROLLS
+
+
+def test_empty_session_still_gets_a_page(tmp_path):
+    path = generate_student_slips_pdf(str(tmp_path), {}, {}, "Monday", "morning")
+
+    assert pdf_page_count(path) == 1
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_slip_photos_are_embedded_once(tmp_path, cached):
+    photos = make_photos(tmp_path / "photos", ROLLS[:5])
+    room_map = dict(ROOM_MAP, **{"6103": ROOM_MAP["6101"][:3]})
+    photo_cache = PhotoCache(str(tmp_path / "thumbs")) if cached else None
+
+    path = generate_student_slips_pdf(str(tmp_path / "out"), room_map,
+                                      {"A00": "Asha"}, "Monday", "morning",
+                                      photos_folder=photos, photo_cache=photo_cache)
+
+    data = (tmp_path / "out" / "student_slips.pdf").read_bytes()
+    text = pdf_text(path)
+    # The shared slip and "No Photo" forms are stored once and reused
+    assert data.count(b"/Subtype /Image") == 5
+    assert data.count(b"/Subtype /Form") == 2
+    assert text.count("(No Photo)") == 1
+    assert text.count("(Asha)") == 2
@@ -0,0 +1,71 @@
+import os
+import zipfile
+
+from output.zip_builder import build_zip
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fh:
+        fh.write(data)
+
+
+def archived(zip_path):
+    with zipfile.ZipFile(zip_path) as zf:
+        return {name: zf.read(name).decode() for name in zf.namelist()}
+
+
+def test_update_adds_replaces_and_removes_members(tmp_path):
+    folder = str(tmp_path)
+    write(os.path.join(folder, "Sunday", "keep.csv"), "a,b\n")
+    write(os.path.join(folder, "Sunday", "change.csv"), "old\n")
+    write(os.path.join(folder, "Sunday", "drop.csv"), "gone\n")
+    zip_path = build_zip(folder, prefix="run")
+
+    write(os.path.join(folder, "Monday", "new.csv"), "new\n")
+    write(os.path.join(folder, "Sunday", "change.csv"), "newer\n")
+    os.remove(os.path.join(folder, "Sunday", "drop.csv"))
+    build_zip(folder, prefix="run", update=True)
+
+    assert archived(zip_path) == {
+        "Sunday/keep.csv": "a,b\n",
+        "Sunday/change.csv": "newer\n",
+        "Monday/new.csv": "new\n",
+    }
+
+
+def test_update_appends_files_that_were_only_added(tmp_path):
+    folder = str(tmp_path)
+    write(os.path.join(folder, "keep.csv"), "a\n")
+    zip_path = build_zip(folder, prefix="run")
+
+    write(os.path.join(folder, "new.csv"), "b\n")
+    build_zip(folder, prefix="run", update=True)
+
+    assert archived(zip_path) == {"keep.csv": "a\n", "new.csv": "b\n"}
+
+
+def test_update_catches_a_same_size_rewrite_within_the_timestamp(tmp_path):
+    folder = str(tmp_path)
+    path = os.path.join(folder, "seats.csv")
+    write(path, "AAAA\n")
+    stat = os.stat(path)
+    zip_path = build_zip(folder, prefix="run")
+
+    # Same size and mtime, so only the content tells them apart
+    write(path, "BBBB\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    build_zip(folder, prefix="run", update=True)
+
+    assert archived(zip_path) == {"seats.csv": "BBBB\n"}
+
+
+def test_update_leaves_an_unchanged_archive_alone(tmp_path):
+    folder = str(tmp_path)
+    write(os.path.join(folder, "keep.csv"), "a\n")
+    zip_path = build_zip(folder, prefix="run")
+    mtime = os.stat(zip_path).st_mtime_ns
+
+    build_zip(folder, prefix="run", update=True)
+
+    assert os.stat(zip_path).st_mtime_ns == mtime
@@ -0,0 +1,341 @@
+"""
+Background seating jobs for the web frontend.
+
+Jobs run run_pipeline in a pool of worker processes, so a long export
+never blocks the page and several users can submit at once. Everything a
+page needs to poll lives in one SQLite file:
+
+    jobs    one row per job: status, progress counters, summary, files
+    events  the job's progress events in order (read, clash, allocate,
+            export, session), as run_pipeline reports them
+
+Each job writes into its own folder, <output_root>/<job id>, so
+concurrent jobs never share files.
+
+Several server processes may share one database. Each job records the
+process that queued it (owner), and a starting server only fails the
+unfinished jobs of owners that are gone.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+
+DEFAULT_JOBS_DB = os.path.join(".seating_jobs", "jobs.sqlite")
+
+# queued -> running -> done | failed
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id              TEXT PRIMARY KEY,
+    name            TEXT,
+    status          TEXT NOT NULL,
+    output          TEXT NOT NULL,
+    created         REAL NOT NULL,
+    started         REAL,
+    finished        REAL,
+    sessions_total  INTEGER,
+    sessions_done   INTEGER NOT NULL DEFAULT 0,
+    summary         TEXT,
+    files           TEXT,
+    error           TEXT,
+    owner           TEXT,
+    archive         TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    job_id   TEXT NOT NULL,
+    seq      INTEGER NOT NULL,
+    time     REAL NOT NULL,
+    stage    TEXT NOT NULL,
+    date     TEXT,
+    session  TEXT,
+    message  TEXT,
+    count    INTEGER,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+# Columns added since the first schema: (table, column, type)
+ADDED_COLUMNS = [
+    ("jobs", "owner", "TEXT"),
+    ("jobs", "archive", "TEXT"),
+    ("events", "count", "INTEGER"),
+]
+
+
+@contextmanager
+def _db(db_path):
+    """
+    A short-lived connection that commits on success and always closes.
+    WAL lets pages read while jobs write.
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _migrate(conn):
+    # Databases created by an older version lack the newer columns
+    for table, column, kind in ADDED_COLUMNS:
+        columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+
+
+def _process_owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_gone(owner):
+    """
+    Whether the server process that queued a job has exited. Jobs of
+    other hosts, and of any process on Windows (no harmless liveness
+    check there), count as alive.
+    """
+    if owner is None:
+        return True  # queued by a version that did not record owners
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or os.name == "nt":
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except (PermissionError, ValueError):
+        return False
+    return False
+
+
+def _mark_failed(db_path, job_id, error):
+    # Only a job that has not finished yet
+    with _db(db_path) as conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', finished = ?, error = ? "
+            "WHERE id = ? AND status IN ('queued', 'running')",
+            (time.time(), error, job_id),
+        )
+
+
+class _JobProgress:
+    """
+    progress callback of one job: stores every event and keeps the job's
+    counters current.
+    """
+
+    def __init__(self, db_path, job_id):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.seq = 0
+
+    def __call__(self, stage, date=None, session=None, message="", count=None):
+        self.seq += 1
+        with _db(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO events (job_id, seq, time, stage, date, session, message, count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.job_id, self.seq, time.time(), stage, date, session, message, count),
+            )
+            if stage == "read":
+                # count is the number of sessions
+                conn.execute("UPDATE jobs SET sessions_total = ? WHERE id = ?",
+                             (count, self.job_id))
+            elif stage == "session":
+                conn.execute("UPDATE jobs SET sessions_done = sessions_done + 1 WHERE id = ?",
+                             (self.job_id,))
+
+
+def _run_job(db_path, job_id, source, output, workbook, options):
+    """
+    Body of one job, in a worker process.
+    """
+    logger = logging.getLogger(f"seating_logger.job.{job_id}")
+    logger.handlers.clear()
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    # Anything failing from here on fails the job rather than leaving it
+    # "running"
+    try:
+        # Imported here so the web process does not pay for it per request
+        from seating_arrangement import run_pipeline
+
+        with _db(db_path) as conn:
+            conn.execute("UPDATE jobs SET status = 'running', started = ? WHERE id = ?",
+                         (time.time(), job_id))
+
+        os.makedirs(output, exist_ok=True)
+        handler = logging.FileHandler(os.path.join(output, "pipeline.log"))
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s",
+                                               datefmt="%Y-%m-%d %H:%M:%S"))
+        logger.addHandler(handler)
+
+        result = run_pipeline(source, output, logger=logger, workbook=workbook,
+                              progress=_JobProgress(db_path, job_id), **options)
+    except Exception as e:
+        logger.exception("Job failed: %s", e)
+        status, summary, files, archive = "failed", None, None, None
+        error = f"{type(e).__name__}: {e}"
+    else:
+        status, error = "done", None
+        summary = json.dumps(result["summary"])
+        files = [f for s in result["sessions"] for f in s["files"]]
+        files += list(result["files"].values())
+        files = json.dumps(list(dict.fromkeys(files)))
+        archive = result["files"].get("run_zip")
+    finally:
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+
+    with _db(db_path) as conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished = ?, summary = ?, files = ?, error = ?, "
+            "archive = ? WHERE id = ?",
+            (status, time.time(), summary, files, error, archive, job_id),
+        )
+    return status
+
+
+class JobQueue:
+    """
+    Submits seating jobs to `workers` background processes and answers
+    status queries from the job table. Create one per server process;
+    any number of pages can share it.
+    """
+
+    def __init__(self, db_path=DEFAULT_JOBS_DB, output_root="output", workers=2):
+        self.db_path = db_path
+        self.output_root = output_root
+        self.owner = _process_owner()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with _db(db_path) as conn:
+            conn.executescript(SCHEMA)
+            _migrate(conn)
+
+            # Jobs of a server process that has exited can no longer finish;
+            # those of servers still running are theirs to finish
+            unfinished = conn.execute(
+                "SELECT id, owner FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            for row in unfinished:
+                if _owner_gone(row["owner"]):
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = 'Interrupted by a restart' "
+                        "WHERE id = ?",
+                        (row["id"],),
+                    )
+
+        self.workers = workers
+        self._pool_lock = threading.Lock()
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    def _renew_pool(self, broken):
+        """
+        Replaces `broken` with a fresh pool, once however many jobs report it.
+        """
+        with self._pool_lock:
+            if self.pool is broken:
+                broken.shutdown(wait=False)
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit(self, source, name=None, output_root=None, workbook=None, **options):
+        """
+        Queues run_pipeline(source, **options) and returns the job id at
+        once. source is a path or the workbook's bytes; workbook, if
+        given, is an already parsed WorkbookData.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        output = os.path.join(output_root or self.output_root, job_id)
+
+        with _db(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, name, status, output, created, owner) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, name, output, time.time(), self.owner),
+            )
+
+        # A worker that crashed (out of memory, a native library fault)
+        # breaks the whole pool; the job goes to a fresh one instead
+        args = (_run_job, self.db_path, job_id, source, output, workbook, options)
+        try:
+            try:
+                future = self.pool.submit(*args)
+            except BrokenProcessPool:
+                self._renew_pool(self.pool)
+                future = self.pool.submit(*args)
+        except Exception as e:
+            _mark_failed(self.db_path, job_id, f"{type(e).__name__}: {e}")
+            return job_id
+
+        pool = self.pool
+        future.add_done_callback(lambda f: self._job_ended(job_id, f, pool))
+        return job_id
+
+    def _job_ended(self, job_id, future, pool=None):
+        # _run_job records its own outcome; an exception here means the
+        # worker died or could not reach the database
+        if future.cancelled():
+            _mark_failed(self.db_path, job_id, "Cancelled")
+            return
+        error = future.exception()
+        if error is not None:
+            _mark_failed(self.db_path, job_id, f"{type(error).__name__}: {error}")
+        if isinstance(error, BrokenProcessPool) and pool is not None:
+            self._renew_pool(pool)
+
+    def status(self, job_id):
+        """
+        The job's row as a dict (summary and files decoded), or None.
+        """
+        with _db(self.db_path) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["summary"] = json.loads(job["summary"]) if job["summary"] else None
+        job["files"] = json.loads(job["files"]) if job["files"] else []
+        return job
+
+    def events(self, job_id, after=0):
+        """
+        The job's progress events with seq > after, oldest first.
+        """
+        with _db(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT seq, time, stage, date, session, message, count FROM events "
+                "WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def jobs(self, limit=50):
+        """
+        Most recent jobs first, without their events.
+        """
+        with _db(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT id, name, status, created, sessions_total, sessions_done "
+                "FROM jobs ORDER BY created DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
@@ -0,0 +1,194 @@
+"""
+Stage timing and memory instrumentation for --profile.
+
+    profiler = Profiler()
+    profiler.start()
+    with profiler.stage("allocate", date, session):
+        ...
+    profiler.stop()
+    profiler.write("output/run_profile.json")
+    print(profiler.summary_table())
+
+Every stage records wall time and CPU time. With track_memory
+(--profile-memory) it also records the tracemalloc peak above the memory
+in use when it started; stages nest, so an outer stage's peak covers its
+inner stages. Tracing every allocation slows a run down several times, so
+it is off by default and timings of traced runs are only comparable with
+each other. A disabled profiler (NULL_PROFILER) records nothing and costs
+next to nothing, so code can always go through one.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+
+PROFILE_FILE = "run_profile.json"
+
+# Bump whenever the JSON layout changes
+PROFILE_VERSION = 2
+
+
+class _Frame:
+    __slots__ = ("start_current", "peak")
+
+    def __init__(self, start_current):
+        self.start_current = start_current
+        self.peak = start_current
+
+
+class Profiler:
+    """
+    Collects one record per stage run:
+
+        {"stage", "date", "session", "seconds", "cpu_seconds", "peak_kib"}
+
+    date and session are None for run-wide stages. peak_kib is None when
+    memory tracking is off.
+    """
+
+    def __init__(self, enabled=True, track_memory=False):
+        self.enabled = enabled
+        self.track_memory = enabled and track_memory
+        self.records = []
+        self.started = None
+        self.seconds = None
+        self.peak_kib = None
+        self._stack = []
+        self._owns_tracing = False
+        self._start_time = None
+        self._max_peak = 0
+
+    # ---------------- RUN ----------------
+    def start(self):
+        if not self.enabled:
+            return
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self._start_time = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def stop(self):
+        if not self.enabled or self._start_time is None:
+            return
+        self.seconds = time.perf_counter() - self._start_time
+        if self.track_memory and tracemalloc.is_tracing():
+            # Highest traced memory of the whole run, stages included
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_kib = max(self._max_peak, peak) / 1024
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    # ---------------- STAGES ----------------
+    def stage(self, name, date=None, session=None):
+        """
+        Context manager timing one stage.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name, date, session)
+
+    @contextmanager
+    def _stage(self, name, date, session):
+        frame = None
+        if self.track_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # What the enclosing stage reached so far must survive the reset
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            frame = _Frame(current)
+            self._stack.append(frame)
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - wall
+            cpu_seconds = time.process_time() - cpu
+
+            peak_kib = None
+            if frame is not None:
+                _, peak = tracemalloc.get_traced_memory()
+                frame.peak = max(frame.peak, peak)
+                self._stack.pop()
+                if self._stack:
+                    self._stack[-1].peak = max(self._stack[-1].peak, frame.peak)
+                self._max_peak = max(self._max_peak, frame.peak)
+                tracemalloc.reset_peak()
+                peak_kib = (frame.peak - frame.start_current) / 1024
+
+            self.records.append({
+                "stage": name,
+                "date": date,
+                "session": session,
+                "seconds": seconds,
+                "cpu_seconds": cpu_seconds,
+                "peak_kib": peak_kib,
+            })
+
+    def extend(self, records):
+        """
+        Adds records collected by another profiler, e.g. in a worker process.
+        """
+        if self.enabled:
+            self.records.extend(records)
+
+    # ---------------- REPORT ----------------
+    def summary(self):
+        """
+        { stage: {"count", "seconds", "cpu_seconds", "max_peak_kib"} },
+        stages in the order they first ran.
+        """
+        totals = {}
+        for record in self.records:
+            entry = totals.setdefault(record["stage"], {
+                "count": 0, "seconds": 0.0, "cpu_seconds": 0.0, "max_peak_kib": None,
+            })
+            entry["count"] += 1
+            entry["seconds"] += record["seconds"]
+            entry["cpu_seconds"] += record["cpu_seconds"]
+            if record["peak_kib"] is not None:
+                entry["max_peak_kib"] = max(entry["max_peak_kib"] or 0, record["peak_kib"])
+        return totals
+
+    def report(self):
+        return {
+            "version": PROFILE_VERSION,
+            "started": self.started,
+            "track_memory": self.track_memory,
+            "seconds": self.seconds,
+            "peak_kib": self.peak_kib,
+            "summary": self.summary(),
+            "stages": self.records,
+        }
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.report(), fh, indent=2)
+        return path
+
+    def summary_table(self):
+        """
+        The summary as a fixed-width text table, slowest stage first.
+        """
+        rows = sorted(self.summary().items(), key=lambda item: -item[1]["seconds"])
+        lines = [f"{'Stage':<14} {'Count':>6} {'Wall s':>9} {'CPU s':>9} {'Peak MiB':>9}"]
+        for name, entry in rows:
+            peak = entry["max_peak_kib"]
+            peak = f"{peak / 1024:9.2f}" if peak is not None else f"{'-':>9}"
+            lines.append(f"{name:<14} {entry['count']:>6} {entry['seconds']:>9.3f} "
+                         f"{entry['cpu_seconds']:>9.3f} {peak}")
+        if self.seconds is not None:
+            lines.append(f"{'total':<14} {'':>6} {self.seconds:>9.3f}")
+        return "\n".join(lines)
+
+
+NULL_PROFILER = Profiler(enabled=False)